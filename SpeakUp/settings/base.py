@@ -24,20 +24,27 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'apps.core.middleware.AllowedHostsMiddleware',  # Обробка ALLOWED_HOSTS ПЕРЕД SecurityMiddleware
+    # Server-Timing та семпли часу по фазах (apps.core.instrumentation)
+    'apps.core.middleware.InstrumentationMiddleware',
+    # Розробка: попередження про N+1 запити (NPLUSONE_DETECTION)
+    'apps.core.middleware.NPlusOneMiddleware',
+    # Класифікація запиту: healthcheck, Host policy, WordPress 410, статичні 301, Google Ads боти
+    'apps.core.middleware.FrontDoorMiddleware',
+    # gzip/brotli на льоту для великих некешованих відповідей (кеш сторінок віддає готові варіанти)
+    'apps.core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Обслуговування статичних файлів
-    'apps.core.middleware.HealthCheckMiddleware',  # Healthcheck ДО перевірки ALLOWED_HOSTS
-    'apps.core.middleware.GoogleAdsBotMiddleware',  # Обробка Google Ads ботів ДО SessionMiddleware
+    'apps.core.middleware.PageCacheMiddleware',  # Кеш сторінок для анонімних GET (до sessions)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
-    'apps.core.middleware.NewsRedirectMiddleware',
-    'apps.core.middleware.WordPressBlockMiddleware',  # НОВИЙ: блокує WP шляхи з 410 Gone
+    'apps.core.middleware.NewsRedirectMiddleware',  # Старі news URL (запит до БД)
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Останній: час view (для InstrumentationMiddleware)
+    'apps.core.middleware.ViewTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'SpeakUp.urls'
@@ -93,6 +100,65 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Зібрані бандли (python manage.py build_assets → static/dist/manifest.json)
+# Без manifest шаблони підключають окремі файли, тому збірка не обов'язкова локально
+ASSET_BUNDLES_ENABLED = os.getenv('ASSET_BUNDLES_ENABLED', 'True') == 'True'
+
+# 404: negative cache для статичних catch-all маршрутів та top-N трекер (logs/not_found.log)
+NOT_FOUND_CACHE_SIZE = 2048
+NOT_FOUND_CACHE_TTL = 600  # секунд
+NOT_FOUND_SAMPLE_RATE = float(os.getenv('NOT_FOUND_SAMPLE_RATE', '1.0'))
+NOT_FOUND_FLUSH_INTERVAL = 300  # секунд
+
+# Повносторінковий кеш для анонімних GET (apps.core.page_cache)
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'True') == 'True'
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', '600'))
+PAGE_CACHE_ALIAS = 'pages'
+# Версії тегів інвалідації - окремо від сторінок, щоб cull кешу сторінок їх не видаляв
+PAGE_CACHE_TAGS_ALIAS = 'page_tags'
+
+# Пре-рендерені сторінки (python manage.py prerender_pages → PRERENDER_DIR)
+PRERENDER_ENABLED = os.getenv('PRERENDER_ENABLED', 'True') == 'True'
+PRERENDER_DIR = BASE_DIR / 'prerendered'
+
+# Інструментування запитів (apps.core.instrumentation): Server-Timing лише за потреби,
+# у лог apps.core.instrumentation - частка запитів та всі повільні
+INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'True') == 'True'
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'False') == 'True'
+INSTRUMENTATION_SAMPLE_RATE = float(os.getenv('INSTRUMENTATION_SAMPLE_RATE', '0.01'))
+INSTRUMENTATION_SLOW_MS = int(os.getenv('INSTRUMENTATION_SLOW_MS', '1000'))
+if INSTRUMENTATION_ENABLED:
+    # Час шаблонів та context processors - бекенд з вимірюванням замість monkeypatch Django
+    TEMPLATES[0]['BACKEND'] = 'apps.core.instrumentation.InstrumentedDjangoTemplates'
+
+# Пошук N+1 (apps.core.query_budget): форма SQL, повторена NPLUSONE_THRESHOLD+ разів за запит
+NPLUSONE_DETECTION = os.getenv('NPLUSONE_DETECTION', 'False') == 'True'
+NPLUSONE_THRESHOLD = int(os.getenv('NPLUSONE_THRESHOLD', '5'))
+
+# Метрики Prometheus на /metrics (apps.core.metrics): без токена endpoint вимкнений.
+# METRICS_DIR - спільна директорія знімків workers (gunicorn.conf.py задає її сам)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+
+# Стиснення HTML (apps.core.compression): менші відповіді віддаються як є
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+    'page_tags': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'page-tags',
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -162,11 +228,22 @@ LOGGING = {
             'filename': logs_dir / 'django.log',
             'encoding': 'utf-8',
         },
+        'performance': {
+            'level': 'INFO',
+            'class': 'logging.FileHandler',
+            'filename': logs_dir / 'performance.log',
+            'encoding': 'utf-8',
+        },
     },
     'loggers': {
         'apps.core.utils.redirect_logger': {
             'handlers': ['file'],
             'level': 'ERROR',
         },
+        'apps.core.instrumentation': {
+            'handlers': ['performance'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -2,19 +2,30 @@
 Development settings for SpeakUp project.
 """
 from .base import *
+import dj_database_url
 
 DEBUG = True
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1,testserver').split(',')
 
-# Database
+# Database: SQLite за замовчуванням, DATABASE_URL - локальний PostgreSQL або окрема БД бенчмарків
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': dj_database_url.config(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
 }
 
+# Бандли в розробці застарівають після кожної правки CSS - за замовчуванням вимкнені
+ASSET_BUNDLES_ENABLED = os.getenv('ASSET_BUNDLES_ENABLED', 'False') == 'True'
+
+# Кеш сторінок та пре-рендер у розробці приховують зміни шаблонів - за замовчуванням вимкнені
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'False') == 'True'
+PRERENDER_ENABLED = os.getenv('PRERENDER_ENABLED', 'False') == 'True'
+
+# Server-Timing у DevTools → Network → Timing
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'True') == 'True'
+
+# Попередження про N+1 запити в консолі runserver
+NPLUSONE_DETECTION = os.getenv('NPLUSONE_DETECTION', 'True') == 'True'
+
 # Email backend for development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -1,6 +1,8 @@
 """
 Production settings for SpeakUp project.
 """
+from urllib.parse import urlsplit
+
 from .base import *
 import dj_database_url
 
@@ -8,13 +10,17 @@ DEBUG = False
 
 # Allowed hosts - filter out empty strings
 # Fallback to ['*'] if not set (for Render healthcheck and initial deployment)
-# '*' не працює як wildcard в Django, тому middleware обробляє це автоматично
+# Перевірку робить apps.core.hosts.HostPolicy (set/suffix), healthcheck проходить з будь-яким Host
 allowed_hosts_env = os.getenv('ALLOWED_HOSTS', '').strip()
 if allowed_hosts_env:
     ALLOWED_HOSTS = [host.strip() for host in allowed_hosts_env.split(',') if host.strip()]
+    # Render задає свій *.onrender.com домен
+    render_hostname = os.getenv('RENDER_EXTERNAL_HOSTNAME', '').strip()
+    if render_hostname and render_hostname not in ALLOWED_HOSTS:
+        ALLOWED_HOSTS.append(render_hostname)
 else:
-    # Якщо не встановлено, дозволяємо всі хости через middleware
-    ALLOWED_HOSTS = ['*']  # Middleware обробляє '*' як "дозволити всі"
+    # Якщо не встановлено, дозволяємо всі коректні хости
+    ALLOWED_HOSTS = ['*']
 
 # CSRF trusted origins - filter out empty strings
 CSRF_TRUSTED_ORIGINS = [
@@ -27,10 +33,22 @@ CSRF_TRUSTED_ORIGINS = [
 ]
 
 # Database
+# Persistent connections: без CONN_MAX_AGE кожен запит відкриває нове з'єднання
+# з PostgreSQL (разом з TLS handshake). Health checks перевіряють з'єднання
+# перед повторним використанням, тому "мертві" з'єднання після рестарту БД не ламають запит.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+# Зовнішній pooler (PgBouncer у transaction mode) не підтримує server-side cursors
+DB_POOLER = os.getenv('DB_POOLER', '').strip().lower()
+
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL)
+        'default': dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        )
     }
 else:
     DATABASES = {
@@ -41,11 +59,29 @@ else:
             'PASSWORD': os.getenv('DB_PASSWORD', ''),
             'HOST': os.getenv('DB_HOST', 'localhost'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
         }
     }
 
+if DB_POOLER:
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Кеш сторінок спільний для всіх gunicorn workers інстансу: інвалідація
+# після збереження моделі в одному worker діє в усіх
+CACHES['pages'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.getenv('PAGE_CACHE_DIR', '/tmp/speakup-page-cache'),
+    'OPTIONS': {'MAX_ENTRIES': 5000},
+}
+# Версії тегів (кілька десятків ключів) - окрема директорія, до MAX_ENTRIES не доходить
+CACHES['page_tags'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.getenv('PAGE_CACHE_TAGS_DIR', '/tmp/speakup-page-tags'),
+}
+
 # Security settings for production
-# SECURE_SSL_REDIRECT enabled - healthcheck обробляється через HealthCheckMiddleware
+# SECURE_SSL_REDIRECT enabled - healthcheck обробляється через FrontDoorMiddleware
 SECURE_SSL_REDIRECT = True
 SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
@@ -69,6 +105,11 @@ CANONICAL_DOMAIN = os.getenv('CANONICAL_DOMAIN', '')
 if not CANONICAL_DOMAIN and ALLOWED_HOSTS and ALLOWED_HOSTS[0] != '*':
     CANONICAL_DOMAIN = f"https://{ALLOWED_HOSTS[0]}"
 
+# Домен CANONICAL_DOMAIN обслуговується завжди: HostPolicy і Django get_host() читають лише ALLOWED_HOSTS
+_canonical_host = urlsplit(CANONICAL_DOMAIN if '//' in CANONICAL_DOMAIN else f'//{CANONICAL_DOMAIN}').hostname
+if _canonical_host and '*' not in ALLOWED_HOSTS and _canonical_host not in ALLOWED_HOSTS:
+    ALLOWED_HOSTS.append(_canonical_host)
+
 # WhiteNoise configuration for static files (БЕЗ кешування)
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 WHITENOISE_BROTLI_ENABLED = True
@@ -90,11 +131,21 @@ LOGGING = {
             'level': 'ERROR',
             'class': 'logging.StreamHandler',
         },
+        'performance': {
+            'level': 'INFO',
+            'class': 'logging.StreamHandler',
+        },
     },
     'loggers': {
         'apps.core.utils.redirect_logger': {
             'handlers': ['console'],
             'level': 'ERROR',
         },
+        # JSON семпли часу запитів (INSTRUMENTATION_SAMPLE_RATE, INSTRUMENTATION_SLOW_MS)
+        'apps.core.instrumentation': {
+            'handlers': ['performance'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -16,3 +16,13 @@ PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
 
+
+# Кеш сторінок переживає rollback транзакцій між тестами - вмикається лише в test_page_cache
+PAGE_CACHE_ENABLED = False
+PRERENDER_ENABLED = False
+
+# Семпли часу запитів не потрібні в тестах (вмикаються в test_instrumentation)
+INSTRUMENTATION_SAMPLE_RATE = 0
+INSTRUMENTATION_SLOW_MS = 10 ** 9
+# Прогін тестів не пише в logs/performance.log (test_instrumentation перевіряє через assertLogs)
+LOGGING['handlers']['performance'] = {'class': 'logging.NullHandler'}
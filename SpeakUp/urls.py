@@ -7,9 +7,9 @@ from django.conf.urls.i18n import i18n_patterns
 from django.views.generic import TemplateView
 from django.contrib.sitemaps.views import sitemap
 from apps.core.sitemaps import SpeakUpSitemap, NewsSitemap
+from apps.core.views import metrics_endpoint
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import HttpResponse
 
 # Sitemap config
 sitemaps = {
@@ -17,14 +17,9 @@ sitemaps = {
     'news': NewsSitemap,
 }
 
-# Healthcheck endpoint (before i18n patterns to avoid language prefix)
-def healthcheck(request):
-    """Simple healthcheck endpoint for Render deployment."""
-    return HttpResponse('OK', content_type='text/plain', status=200)
-
 # Non-i18n URLs (без мовного префіксу)
+# /healthz відповідає FrontDoorMiddleware до URL routing
 urlpatterns = [
-    path('healthz', healthcheck, name='healthcheck'),
     path('admin/', admin.site.urls),
     path('robots.txt', TemplateView.as_view(
         template_name='robots.txt',
@@ -36,6 +31,8 @@ urlpatterns = [
         content_type='text/html'
     ), name='google_verification'),
     path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='sitemap'),
+    # Prometheus (Authorization: Bearer METRICS_TOKEN)
+    path('metrics', metrics_endpoint, name='metrics'),
 ]
 
 # i18n URLs (UK без префіксу, RU з /ru/)
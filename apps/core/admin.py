@@ -1,18 +1,30 @@
 from django.contrib import admin
 from django.utils import timezone
 from django.contrib import messages
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from . import news_search
 from .models import (
     NewsArticle, Achievement, CourseCategory, Course,
     Testimonial, FAQ, ContactInfo, RunningLineText
 )
 
 
+class NewsSearchChangeList(ChangeList):
+    """Під час пошуку - сортування за релевантністю (якщо не обрано колонку)."""
+
+    def get_ordering(self, request, queryset):
+        if self.query.strip() and ORDER_VAR not in self.params:
+            return ['search_rank', '-pk']
+        return super().get_ordering(request, queryset)
+
+
 @admin.register(NewsArticle)
 class NewsArticleAdmin(admin.ModelAdmin):
     """Admin для управління news статтями."""
     list_display = ['title_uk', 'slug_uk', 'slug_ru', 'published_at', 'is_published']
     list_filter = ['is_published', 'published_at', 'created_at']
-    search_fields = ['title_uk', 'title_ru', 'slug_uk', 'slug_ru']
+    # Заголовки, описи та контент - через повнотекстовий індекс (get_search_results)
+    search_fields = ['slug_uk', 'slug_ru']
     prepopulated_fields = {'slug_uk': ('title_uk',), 'slug_ru': ('title_ru',)}
     date_hierarchy = 'published_at'
     readonly_fields = ['created_at', 'updated_at']
@@ -40,6 +52,21 @@ class NewsArticleAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Статті з індексу news_search (обидві мови, з чернетками) + збіги slug."""
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        # Без ліміту: admin має знаходити всі статті; за релевантністю впорядковуються перші MAX_RESULTS
+        ids = news_search.search(search_term, published_only=False, limit=None)
+        slug_matches, _ = super().get_search_results(request, queryset, search_term)
+        queryset = (queryset.filter(pk__in=ids) | slug_matches).annotate(
+            search_rank=news_search.rank_annotation(ids[:news_search.MAX_RESULTS]),
+        )
+        return queryset, False
+
+    def get_changelist(self, request, **kwargs):
+        return NewsSearchChangeList
+
 
 # ============================================================================
 # Homepage Content Admins
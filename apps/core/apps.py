@@ -6,6 +6,16 @@ class CoreConfig(AppConfig):
     name = 'apps.core'
     verbose_name = 'Core'
 
+    def ready(self):
+        # Інвалідація повносторінкового кешу при зміні моделей
+        from .page_cache import connect_signals
+        connect_signals()
+
+        # Повнотекстовий індекс новин та індекс схожих статей
+        from . import news_search, related_news
+        news_search.connect_signals()
+        related_news.connect_signals()
+
 
 
 
@@ -0,0 +1,238 @@
+"""
+Збірка статичних ресурсів: CSS бандли, critical CSS, граф JS модулів, htmx.
+
+Визначення бандлів живуть тут, а не в шаблонах, щоб `build_assets` та
+template tags (`apps.core.templatetags.assets`) працювали з одним джерелом правди.
+Результат збірки - `static/dist/manifest.json`, який читають template tags.
+"""
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+# ===== CSS БАНДЛИ =====
+# Порядок файлів = порядок каскаду, тому він має збігатися з порядком <link> у шаблонах.
+CSS_BUNDLES: Dict[str, List[str]] = {
+    # base.html - підключається на кожній сторінці
+    'base': [
+        'css/normalize.css',
+        'css/components/ios-safe.css',
+        'css/base.css',
+        'css/components/header-base.css',
+        'css/components/navigation.css',
+        'css/components/burger-menu.css',
+        'css/components/header-dynamic-form.css',
+        'css/components/tab-slider.css',
+        'css/components/button.css',
+        'css/components/form.css',
+        'css/components/modal.css',
+        'css/components/trial-form.css',
+        'css/components/message.css',
+        'css/components/footer.css',
+        'css/components/running-line.css',
+        'css/utilities/carousel.css',
+        'css/utilities/glassmorphism.css',
+        'css/utilities/counter-animation.css',
+    ],
+    # Головна (pricing/courses accordion підключаються окремо за feature flag)
+    'index': [
+        'css/components/parallax.css',
+        'css/components/hero-section.css',
+        'css/components/achievements.css',
+        'css/components/advantages-carousel.css',
+    ],
+    'index-bottom': [
+        'css/components/testimonials.css',
+        'css/components/consultation-form.css',
+    ],
+    'news': [
+        'css/components/news.css',
+        'css/components/parallax.css',
+    ],
+    'programs': [
+        'css/components/programs-list.css',
+        'css/components/parallax.css',
+    ],
+}
+
+# Above-the-fold CSS, що інлайниться в <head>.
+# Має бути ПРЕФІКСОМ відповідного бандла - інакше порушиться порядок каскаду.
+CRITICAL_CSS: Dict[str, List[str]] = {
+    'base': [
+        'css/normalize.css',
+        'css/components/ios-safe.css',
+        'css/base.css',
+        'css/components/header-base.css',
+    ],
+}
+
+# ===== JS МОДУЛІ =====
+# Точки входу ES modules; статичний граф імпортів віддається як modulepreload,
+# щоб браузер завантажив усі залежності паралельно, а не "водоспадом".
+JS_ENTRIES: Dict[str, List[str]] = {
+    'base': [
+        'js/app-init.js',
+        'js/modules/gtm-events.js',
+        'js/modules/trial-form-handler.js',
+        'js/modules/htmx-gtm-integration.js',
+    ],
+}
+
+# ===== HTMX =====
+HTMX_VERSION = '2.0.3'
+HTMX_CDN_URL = f'https://unpkg.com/htmx.org@{HTMX_VERSION}'
+HTMX_VENDOR_PATH = f'vendor/htmx-{HTMX_VERSION}.min.js'
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# Тільки статичні `import ... from './x.js'` / `import './x.js'` (dynamic import() - lazy chunks)
+_STATIC_IMPORT_RE = re.compile(r'^\s*import\s+(?:[^\'"]*?\s+from\s+)?[\'"](\.{1,2}/[^\'"]+)[\'"]', re.MULTILINE)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def get_source_root() -> Path:
+    """Директорія з вихідними static файлами (перша з STATICFILES_DIRS)."""
+    return Path(settings.STATICFILES_DIRS[0])
+
+
+def get_manifest_path() -> Path:
+    """Шлях до manifest.json (можна перевизначити через ASSET_MANIFEST_PATH)."""
+    custom = getattr(settings, 'ASSET_MANIFEST_PATH', None)
+    if custom:
+        return Path(custom)
+    return get_source_root() / DIST_DIR / MANIFEST_NAME
+
+
+def minify_css(css: str) -> str:
+    """
+    Консервативна мініфікація CSS.
+
+    Видаляє коментарі та зайві пробіли навколо `{ } ; , >`. Пробіли навколо
+    `+`/`-` не чіпаємо (calc()), як і пробіл перед `:` (`a :hover` != `a:hover`).
+    """
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+
+def resolve_js_graph(entry: str, source_root: Optional[Path] = None) -> List[str]:
+    """
+    Повертає статичні залежності модуля (транзитивно) у порядку обходу в глибину.
+
+    Args:
+        entry: Шлях відносно static root (наприклад 'js/app-init.js')
+        source_root: Корінь static файлів (за замовчуванням - STATICFILES_DIRS[0])
+
+    Returns:
+        Список шляхів залежностей (без самого entry)
+    """
+    root = source_root or get_source_root()
+    seen: List[str] = []
+
+    def visit(rel_path: str) -> None:
+        file_path = root / rel_path
+        if not file_path.exists():
+            return
+        source = file_path.read_text(encoding='utf-8')
+        for specifier in _STATIC_IMPORT_RE.findall(source):
+            dep = (file_path.parent / specifier).resolve().relative_to(root.resolve()).as_posix()
+            if dep not in seen and dep != entry:
+                seen.append(dep)
+                visit(dep)
+
+    visit(entry)
+    return seen
+
+
+def build_css_bundle(name: str, files: List[str], source_root: Path, out_dir: Path) -> dict:
+    """Конкатенує та мініфікує CSS бандл, записує файл з content hash."""
+    critical_files = CRITICAL_CSS.get(name, [])
+    if files[:len(critical_files)] != critical_files:
+        raise ValueError(f"Critical CSS для '{name}' має бути префіксом бандла")
+
+    def read(paths: List[str]) -> str:
+        return '\n'.join((source_root / path).read_text(encoding='utf-8') for path in paths)
+
+    critical_css = minify_css(read(critical_files)) if critical_files else ''
+    rest_css = minify_css(read(files[len(critical_files):]))
+
+    file_name = f'{name}.{_content_hash(rest_css)}.css'
+    (out_dir / file_name).write_text(rest_css, encoding='utf-8')
+
+    return {
+        'file': f'{DIST_DIR}/css/{file_name}',
+        'critical_css': critical_css,
+        'sources': files,
+    }
+
+
+def build_manifest(source_root: Optional[Path] = None, htmx_vendored: bool = False) -> dict:
+    """
+    Збирає всі бандли та повертає manifest (без запису на диск).
+
+    Args:
+        source_root: Корінь static файлів
+        htmx_vendored: Чи існує локальна копія htmx (HTMX_VENDOR_PATH)
+    """
+    root = source_root or get_source_root()
+    css_out = root / DIST_DIR / 'css'
+    css_out.mkdir(parents=True, exist_ok=True)
+
+    # Видаляємо старі бандли, щоб не накопичувати хеші попередніх збірок
+    for old_file in css_out.glob('*.css'):
+        old_file.unlink()
+
+    manifest: dict = {'css': {}, 'js': {}, 'htmx': HTMX_VENDOR_PATH if htmx_vendored else ''}
+
+    for name, files in CSS_BUNDLES.items():
+        manifest['css'][name] = build_css_bundle(name, files, root, css_out)
+
+    for name, entries in JS_ENTRIES.items():
+        preload: List[str] = []
+        for entry in entries:
+            for dep in resolve_js_graph(entry, root):
+                if dep not in preload and dep not in entries:
+                    preload.append(dep)
+        manifest['js'][name] = {'entries': entries, 'modulepreload': preload}
+
+    return manifest
+
+
+def write_manifest(manifest: dict) -> Path:
+    """Записує manifest та скидає кеш `load_manifest`."""
+    path = get_manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+    load_manifest.cache_clear()
+    return path
+
+
+@lru_cache(maxsize=1)
+def load_manifest() -> Optional[dict]:
+    """
+    Читає manifest один раз на процес.
+
+    Returns None якщо бандли вимкнені (ASSET_BUNDLES_ENABLED) або manifest не зібрано -
+    тоді template tags повертаються до окремих <link>/<script>.
+    """
+    if not getattr(settings, 'ASSET_BUNDLES_ENABLED', True):
+        return None
+    path = get_manifest_path()
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,120 @@
+"""
+Стиснення HTML відповідей: заздалегідь стиснуті варіанти для кешу сторінок
+та gzip "на льоту" лише для великих некешованих відповідей.
+
+Кешована сторінка містить плейсхолдер CSRF токена, який замінюється при віддачі,
+тож цілком стиснути її заздалегідь неможливо. Для gzip частини між плейсхолдерами
+стискаються окремими deflate блоками (як у pigz), а при віддачі між ними
+вставляється стиснутий токен (~70 байт) - CPU на запит мізерний.
+
+Щоб не втрачати ступінь стиснення, кожна частина стискається зі словником
+(попередній текст), де місце токена заповнене нульовими байтами: в HTML їх немає,
+тож посилання deflate ніколи не вказують на токен, а відстані збігаються,
+бо токен завжди однакової довжини (TOKEN_SLOT).
+Brotli потоки так не склеюються, тому brotli варіант зберігається лише для
+сторінок без CSRF токена.
+"""
+import secrets
+import struct
+import zlib
+from typing import List, Optional
+
+import brotli
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+GZIP_LEVEL = 6
+# Кешований варіант стискається один раз - можна дорожчу якість
+BROTLI_QUALITY = 8
+# На льоту (некешовані відповіді): швидше за gzip -6 і все одно менше за розміром
+BROTLI_QUALITY_ON_THE_FLY = 4
+
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+# Рандомне поле FNAME у gzip заголовку (як у django.utils.text.compress_string) проти BREACH
+MAX_RANDOM_BYTES = 100
+
+# Довжина токена між частинами (маскований CSRF токен - завжди 64 символи)
+TOKEN_SLOT = 64
+
+# Вікно deflate: далі словник не використовується
+_WINDOW_SIZE = 32 * 1024
+
+# Фінальний порожній deflate блок (BFINAL=1, fixed Huffman, end-of-block)
+_DEFLATE_FINAL_BLOCK = b'\x03\x00'
+
+
+def _deflate_segment(data: bytes, history: bytes = b'') -> bytes:
+    """Raw deflate без фінального блоку, вирівняний по байту (можна склеювати)."""
+    if history:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=history)
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+
+def _gzip_header() -> bytes:
+    # ID1 ID2 CM=deflate FLG=FNAME MTIME=0 XFL=0 OS=unknown + випадкове ім'я
+    filename = secrets.token_hex(secrets.randbelow(MAX_RANDOM_BYTES // 2) + 1).encode('ascii')
+    return b'\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff' + filename + b'\x00'
+
+
+def precompress_segments(segments: List[bytes]) -> List[bytes]:
+    """Стискає частини сторінки між плейсхолдерами (один раз, при збереженні в кеш)."""
+    deflated = []
+    history = b''
+    for index, segment in enumerate(segments):
+        if index:
+            history = (history + b'\x00' * TOKEN_SLOT)[-_WINDOW_SIZE:]
+        deflated.append(_deflate_segment(segment, history))
+        history = (history + segment)[-_WINDOW_SIZE:]
+    return deflated
+
+
+def assemble_gzip(segments: List[bytes], deflated: List[bytes], token: bytes) -> bytes:
+    """
+    Збирає gzip відповідь: стиснуті частини, між ними стиснутий токен.
+
+    Args:
+        segments: Нестиснуті частини (для CRC32 та розміру)
+        deflated: Результат precompress_segments для тих самих частин
+        token: Значення, що вставляється між частинами (рівно TOKEN_SLOT байт)
+    """
+    if len(segments) > 1 and len(token) != TOKEN_SLOT:
+        raise ValueError(f'Token must be {TOKEN_SLOT} bytes, got {len(token)}')
+    token_deflated = _deflate_segment(token) if len(segments) > 1 else b''
+    crc = 0
+    size = 0
+    parts = [_gzip_header()]
+    for index, (segment, compressed) in enumerate(zip(segments, deflated)):
+        if index:
+            parts.append(token_deflated)
+            crc = zlib.crc32(token, crc)
+            size += len(token)
+        parts.append(compressed)
+        crc = zlib.crc32(segment, crc)
+        size += len(segment)
+    parts.append(_DEFLATE_FINAL_BLOCK)
+    parts.append(struct.pack('<II', crc & 0xFFFFFFFF, size & 0xFFFFFFFF))
+    return b''.join(parts)
+
+
+def precompress_brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+
+
+def choose_encoding(accept_encoding: str, has_brotli: bool) -> Optional[str]:
+    """'br', 'gzip' або None (без стиснення) за заголовком Accept-Encoding."""
+    if has_brotli and re_accepts_brotli.search(accept_encoding):
+        return 'br'
+    if re_accepts_gzip.search(accept_encoding):
+        return 'gzip'
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Стиснення некешованої відповіді на льоту."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY_ON_THE_FLY, mode=brotli.MODE_TEXT)
+    return compress_string(body, max_random_bytes=MAX_RANDOM_BYTES)
@@ -2,6 +2,7 @@ from django.utils.translation import get_language
 from django.urls import translate_url
 from django.conf import settings
 from apps.leads.forms import TrialLessonForm
+from .utils.lazy_forms import LazyForm
 
 def seo_context(request):
     """
@@ -63,7 +64,12 @@ def feature_flags(request):
 
 
 def forms_context(request):
-    """Додає форми у всі templates (для header та інших компонентів)."""
+    """
+    Додає форми у всі templates (для header та інших компонентів).
+
+    LazyForm: форма не створюється, якщо шаблон її не використовує
+    (HTMX фрагменти, 404), а HTML полів береться з кешу процесу.
+    """
     return {
-        'trial_form': TrialLessonForm(),
+        'trial_form': LazyForm(TrialLessonForm),
     }
@@ -0,0 +1,71 @@
+"""
+Політика Host заголовків: які домени обслуговуємо.
+
+Замість динамічного дописування кожного нового Host у settings.ALLOWED_HOSTS
+(список ріс без меж у кожному worker) - незмінні set/suffix структури, побудовані
+один раз. Перевірка не має стану та блокувань: безпечна для потоків worker.
+Використовується FrontDoorMiddleware до sessions/locale/CSRF.
+"""
+from typing import List, Tuple
+
+from django.conf import settings
+from django.http.request import split_domain_port
+
+# RFC 1034: максимальна довжина доменного імені
+MAX_HOST_LENGTH = 253
+
+
+class HostPolicy:
+    """
+    Перевірка Host за O(1): точний збіг у set або суфікс '.example.com'.
+
+    Якщо ALLOWED_HOSTS порожній або містить '*', дозволяються всі коректні хости -
+    відкидається лише сміття (некоректний синтаксис, надто довгі значення).
+    """
+
+    def __init__(self, allowed_hosts: List[str]):
+        hosts = [host.strip().lower() for host in allowed_hosts if host.strip()]
+        self.allow_all = not allowed_hosts or '*' in hosts
+        # '.example.com' дозволяє example.com та всі піддомени (як у Django)
+        self.suffixes = frozenset(host for host in hosts if host.startswith('.'))
+        self.exact = frozenset(host for host in hosts if host != '*' and not host.startswith('.'))
+        self.exact |= frozenset(suffix[1:] for suffix in self.suffixes)
+
+    @classmethod
+    def from_settings(cls) -> 'HostPolicy':
+        """
+        Будує політику з ALLOWED_HOSTS.
+
+        Лише ALLOWED_HOSTS - інакше хост, пропущений тут, відхилить Django get_host()
+        глибше в стеку (домен CANONICAL_DOMAIN додається в settings/production.py).
+        """
+        return cls(settings.ALLOWED_HOSTS)
+
+    def check(self, raw_host: str) -> Tuple[str, bool]:
+        """
+        Перевіряє сирий Host заголовок (може містити порт).
+
+        Returns:
+            (домен без порту або '' для сміття, чи дозволений)
+        """
+        if not raw_host or len(raw_host) > MAX_HOST_LENGTH:
+            return '', False
+        # split_domain_port повертає ('', '') для синтаксично некоректних значень
+        domain, _port = split_domain_port(raw_host)
+        if not domain:
+            return '', False
+
+        return domain, self.allow_all or self.is_known(domain)
+
+    def is_known(self, domain: str) -> bool:
+        """Точний збіг або збіг за суфіксом (кількість перевірок = кількість міток домену)."""
+        if domain in self.exact:
+            return True
+        if not self.suffixes:
+            return False
+        index = domain.find('.')
+        while index != -1:
+            if domain[index:] in self.suffixes:
+                return True
+            index = domain.find('.', index + 1)
+        return False
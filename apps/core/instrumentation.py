@@ -0,0 +1,225 @@
+"""
+Вимірювання часу запиту по фазах: middleware, view, БД, шаблони, context processors.
+
+InstrumentationMiddleware (перший у MIDDLEWARE, apps.core.middleware) відкриває
+RequestMetrics у ContextVar, ViewTimingMiddleware (останній) міряє view разом
+з resolve та process_view.
+Запити до БД рахує execute_wrapper, встановлений на кожне з'єднання (connection_created),
+шаблони та context processors - бекенд InstrumentedDjangoTemplates (TEMPLATES у settings).
+ContextVar копіюється в sync_to_async потоки, тож async views теж враховуються.
+
+Результат:
+- заголовок Server-Timing (SERVER_TIMING_ENABLED) - видно в DevTools → Network → Timing;
+- JSON рядок у лозі apps.core.instrumentation (InstrumentationMiddleware) для частки запитів
+  (INSTRUMENTATION_SAMPLE_RATE) та всіх повільних (INSTRUMENTATION_SLOW_MS).
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import Engine, TemplateDoesNotExist
+from django.template.backends.base import BaseEngine
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.utils.functional import cached_property
+
+from . import metrics as process_metrics
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional['RequestMetrics']] = ContextVar('speakup_request_metrics', default=None)
+_install_lock = threading.Lock()
+_installed = False
+
+
+class RequestMetrics:
+    """Лічильники одного запиту (секунди)."""
+
+    __slots__ = (
+        'start', 'view_time', 'db_time', 'db_count', 'template_time', 'template_depth',
+        'context_time', 'context_processors', 'cache',
+    )
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_time = 0.0
+        self.db_time = 0.0
+        self.db_count = 0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.context_time = 0.0
+        self.context_processors: Dict[str, float] = {}
+        # назва кешу → [hits, misses]
+        self.cache: Dict[str, List[int]] = {}
+
+
+def current() -> Optional[RequestMetrics]:
+    """Метрики поточного запиту або None (поза запитом / інструментування вимкнене)."""
+    return _current.get()
+
+
+def record_cache(name: str, hit: bool) -> None:
+    """Враховує влучання/промах кешу в метриках поточного запиту та процесу (/metrics)."""
+    process_metrics.cache_lookups.inc(name, 'hit' if hit else 'miss')
+    metrics = _current.get()
+    if metrics is None:
+        return
+    counts = metrics.cache.get(name)
+    if counts is None:
+        counts = metrics.cache[name] = [0, 0]
+    counts[0 if hit else 1] += 1
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.db_count += 1
+
+
+def _install_db_wrapper(sender=None, connection=None, **kwargs):
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+def _timed_processor(processor):
+    name = getattr(processor, '__name__', repr(processor))
+
+    @wraps(processor)
+    def wrapper(request):
+        metrics = _current.get()
+        if metrics is None:
+            return processor(request)
+        start = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            duration = time.perf_counter() - start
+            metrics.context_time += duration
+            metrics.context_processors[name] = metrics.context_processors.get(name, 0.0) + duration
+    return wrapper
+
+
+class InstrumentedEngine(Engine):
+    """Engine, чиї context processors рахують свій час у метриках запиту."""
+
+    @cached_property
+    def template_context_processors(self):
+        return tuple(_timed_processor(processor) for processor in super().template_context_processors)
+
+
+class InstrumentedTemplate(Template):
+    """Шаблон бекенду, що рахує час рендеру в метриках запиту."""
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        # Вкладені render_to_string (template tags) вже враховані зовнішнім рендером
+        if metrics is None or metrics.template_depth:
+            return super().render(context, request)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            metrics.template_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    Бекенд шаблонів з вимірюванням часу (TEMPLATES BACKEND при INSTRUMENTATION_ENABLED).
+
+    Поза запитом з RequestMetrics обгортки лише передають виклик далі.
+    """
+
+    def __init__(self, params):
+        # Як DjangoTemplates.__init__, але engine - InstrumentedEngine
+        params = params.copy()
+        options = params.pop('OPTIONS').copy()
+        options.setdefault('autoescape', True)
+        options.setdefault('debug', settings.DEBUG)
+        options.setdefault('file_charset', 'utf-8')
+        options['libraries'] = self.get_templatetag_libraries(options.get('libraries', {}))
+        BaseEngine.__init__(self, params)
+        self.engine = InstrumentedEngine(self.dirs, self.app_dirs, **options)
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def install() -> None:
+    """Встановлює обгортку БД на всі з'єднання (один раз на процес)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        connection_created.connect(_install_db_wrapper, dispatch_uid='instrumentation_db_wrapper')
+        for connection in connections.all(initialized_only=True):
+            _install_db_wrapper(connection=connection)
+        _installed = True
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def server_timing(metrics: RequestMetrics, total: float) -> str:
+    """Значення заголовка Server-Timing."""
+    parts = [
+        f'total;dur={_ms(total)}',
+        f'mw;dur={_ms(total - metrics.view_time)};desc="middleware"',
+        f'view;dur={_ms(metrics.view_time)}',
+        f'db;dur={_ms(metrics.db_time)};desc="{metrics.db_count} queries"',
+        f'tpl;dur={_ms(metrics.template_time)};desc="templates"',
+        f'ctx;dur={_ms(metrics.context_time)};desc="context processors"',
+    ]
+    for name, (hits, misses) in metrics.cache.items():
+        parts.append(f'cache-{name};desc="{hits} hit, {misses} miss"')
+    return ', '.join(parts)
+
+
+def log_record(request, response, metrics: RequestMetrics, total: float) -> dict:
+    """Структурований запис для логу."""
+    match = getattr(request, 'resolver_match', None)
+    return {
+        'method': request.method,
+        'path': request.path,
+        'view': match.view_name if match else None,
+        'status': response.status_code,
+        'front_door': getattr(request, 'front_door', None),
+        'page_cache': response.get('X-Page-Cache'),
+        'total_ms': _ms(total),
+        'middleware_ms': _ms(total - metrics.view_time),
+        'view_ms': _ms(metrics.view_time),
+        'db_ms': _ms(metrics.db_time),
+        'db_queries': metrics.db_count,
+        'template_ms': _ms(metrics.template_time),
+        'context_ms': _ms(metrics.context_time),
+        'context_processors': {name: _ms(value) for name, value in metrics.context_processors.items()},
+        'cache': {name: {'hits': hits, 'misses': misses} for name, (hits, misses) in metrics.cache.items()},
+    }
+
+
+def activate(metrics: RequestMetrics):
+    """Робить metrics поточними для запиту; повертає token для deactivate()."""
+    return _current.set(metrics)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
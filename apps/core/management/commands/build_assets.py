@@ -0,0 +1,61 @@
+"""
+Management command для збірки статичних ресурсів перед collectstatic.
+
+Використання:
+    python manage.py build_assets
+    python manage.py build_assets --skip-htmx   # без завантаження htmx (офлайн)
+"""
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.assets import (
+    HTMX_CDN_URL, HTMX_VENDOR_PATH, build_manifest, get_source_root, write_manifest,
+)
+
+
+class Command(BaseCommand):
+    help = 'Збирає CSS бандли, critical CSS, граф JS модулів та вендорить htmx'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-htmx',
+            action='store_true',
+            help='Не завантажувати htmx (використати існуючу копію або CDN)',
+        )
+
+    def handle(self, *args, **options):
+        source_root = get_source_root()
+        htmx_path = source_root / HTMX_VENDOR_PATH
+
+        if not htmx_path.exists() and not options['skip_htmx']:
+            self._vendor_htmx(htmx_path)
+
+        try:
+            manifest = build_manifest(source_root, htmx_vendored=htmx_path.exists())
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Помилка збірки: {e}')
+
+        manifest_path = write_manifest(manifest)
+
+        for name, bundle in manifest['css'].items():
+            self.stdout.write(
+                f"CSS {name}: {len(bundle['sources'])} файлів → {bundle['file']}"
+                f" (critical: {len(bundle['critical_css'])} байт)"
+            )
+        for name, bundle in manifest['js'].items():
+            self.stdout.write(f"JS {name}: {len(bundle['modulepreload'])} modulepreload")
+        self.stdout.write(f"htmx: {manifest['htmx'] or 'CDN'}")
+
+        self.stdout.write(self.style.SUCCESS(f'Manifest записано: {manifest_path}'))
+
+    def _vendor_htmx(self, htmx_path):
+        """Завантажує htmx з CDN один раз; далі файл віддається як static."""
+        try:
+            response = requests.get(f'{HTMX_CDN_URL}/dist/htmx.min.js', timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.stdout.write(self.style.WARNING(f'htmx не завантажено, залишаємо CDN: {e}'))
+            return
+        htmx_path.parent.mkdir(parents=True, exist_ok=True)
+        htmx_path.write_bytes(response.content)
+        self.stdout.write(f'htmx завендорено: {htmx_path}')
@@ -0,0 +1,50 @@
+"""
+Management command: перевірка та звіт графа редиректів (REDIRECTS + URLconf + slash).
+
+Використання:
+    python manage.py compile_redirects            # звіт; помилка при циклах
+    python manage.py compile_redirects --strict   # помилка також при 404 цілях
+    python manage.py compile_redirects --json     # машиночитний звіт
+"""
+import json
+from dataclasses import asdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.redirect_graph import RedirectCycleError, compile_redirects
+
+
+class Command(BaseCommand):
+    help = 'Розгортає ланцюжки редиректів, шукає цикли та редиректи на 404'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Завершитись з помилкою, якщо є редиректи на неіснуючі сторінки або перекриті маршрути',
+        )
+        parser.add_argument('--json', action='store_true', help='Вивести звіт у JSON')
+
+    def handle(self, *args, **options):
+        try:
+            compiled = compile_redirects()
+        except RedirectCycleError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'table': compiled.table,
+                'issues': [asdict(issue) for issue in compiled.issues],
+            }, indent=2, ensure_ascii=False))
+        else:
+            for issue in compiled.issues:
+                style = self.style.NOTICE if issue.kind == 'chain' else self.style.WARNING
+                self.stdout.write(style(f'{issue.kind:<15} {issue.source}  ({issue.detail})'))
+            self.stdout.write(self.style.SUCCESS(
+                f'Правил: {len(compiled.table)}, '
+                f'ланцюжків розгорнуто: {len(compiled.issues_of("chain"))}'
+            ))
+
+        problems = compiled.issues_of('dead_target') + compiled.issues_of('shadowed_route')
+        if options['strict'] and problems:
+            raise CommandError(f'Проблемних редиректів: {len(problems)}')
@@ -0,0 +1,54 @@
+"""
+Management command: статичний пре-рендер сторінок з seo_config та заглушок.
+
+Запускається в build.sh після collectstatic та migrate (хешовані імена статики
+та бігуча стрічка з БД потрапляють у HTML). Віддача - PageCacheMiddleware.
+
+Використання:
+    python manage.py prerender_pages
+    python manage.py prerender_pages --if-stale   # лише якщо змінились seo_config/шаблони
+    python manage.py prerender_pages --check      # exit 1, якщо файли застаріли
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.prerender import build, get_prerender_dir, read_manifest, source_fingerprint
+from apps.core.warmup import default_warm_host
+
+
+class Command(BaseCommand):
+    help = 'Рендерить статичні сторінки (заглушки, програми, школи, міста) у файли для кожної мови'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Каталог (за замовчуванням PRERENDER_DIR)')
+        parser.add_argument('--host', help='Host сторінок (за замовчуванням - з CANONICAL_DOMAIN)')
+        parser.add_argument('--if-stale', action='store_true', help='Пропустити, якщо код і шаблони не змінились')
+        parser.add_argument('--check', action='store_true', help='Лише перевірити актуальність')
+
+    def handle(self, *args, **options):
+        output_dir = Path(options['output']) if options['output'] else get_prerender_dir()
+        manifest = read_manifest(output_dir)
+        up_to_date = manifest is not None and manifest['fingerprint'] == source_fingerprint()
+
+        if options['check']:
+            if not up_to_date:
+                raise CommandError(f'Пре-рендерені сторінки в {output_dir} застаріли або відсутні')
+            self.stdout.write(self.style.SUCCESS(f'Актуально: {len(manifest["pages"])} сторінок'))
+            return
+        if options['if_stale'] and up_to_date:
+            self.stdout.write(f'Без змін, {len(manifest["pages"])} сторінок актуальні')
+            return
+
+        host = options['host'] or default_warm_host()
+        secure = (getattr(settings, 'CANONICAL_DOMAIN', '') or '').startswith('https://')
+        manifest = build(output_dir, host, secure)
+
+        for path, error in manifest['errors'].items():
+            self.stderr.write(self.style.WARNING(f'{error}  {path}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Зібрано {len(manifest["pages"])} сторінок у {output_dir} (помилок: {len(manifest["errors"])})'
+        ))
+        if not manifest['pages']:
+            raise CommandError('Жодна сторінка не відрендерилась')
@@ -0,0 +1,33 @@
+"""
+Management command: повна переіндексація пошуку по новинах (apps.core.news_search).
+
+Потрібна після loaddata / bulk_create / прямих змін у БД - звичайне збереження
+статті оновлює індекс саме (post_save).
+
+Використання:
+    python manage.py rebuild_news_search
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.core import news_search
+
+
+class Command(BaseCommand):
+    help = 'Переіндексує всі статті для повнотекстового пошуку новин'
+
+    def handle(self, *args, **options):
+        backend = news_search.get_backend()
+        if backend is None:
+            self.stdout.write(f'{connection.vendor}: індекс не підтримується, пошук працює через icontains')
+            return
+        start = time.monotonic()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                backend.install(cursor)
+            count = news_search.reindex()
+        self.stdout.write(self.style.SUCCESS(
+            f'Проіндексовано {count} статей ({backend.vendor}) за {time.monotonic() - start:.1f} с'
+        ))
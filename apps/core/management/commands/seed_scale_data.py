@@ -0,0 +1,112 @@
+"""
+Management command: синтетичні дані великого обсягу для навантажувальних тестів.
+
+Генерує двомовні новини, відгуки, заявки (TrialLesson, ConsultationRequest) та
+рядки redirect логу bulk_create чанками (apps/core/scale_data.py). Лише для
+окремої БД бенчмарків чи розробки: без DEBUG потрібен --force.
+
+Redirect лог за замовчуванням пишеться в logs/redirects-scale.log, а не в
+logs/redirects.log - той відправляє в GTM process_redirect_logs.
+
+Використання:
+    DATABASE_URL=sqlite:////tmp/speakup-bench.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:////tmp/speakup-bench.sqlite3 python manage.py seed_scale_data \\
+        --news 50000 --testimonials 10000 --trial-lessons 500000 --consultations 200000
+    python manage.py seed_scale_data --news 1000 --redirect-log 100000 --clear
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import news_search, page_cache, related_news
+from apps.core.models import ConsultationRequest, NewsArticle, Testimonial
+from apps.core.scale_data import DEFAULT_CHUNK_SIZE, ScaleDataGenerator, bulk_insert, write_redirect_log
+from apps.leads.models import TrialLesson
+
+
+class Command(BaseCommand):
+    help = 'Генерує великі обсяги реалістичних даних для бенчмарків (bulk_create чанками)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=0, help='Кількість NewsArticle')
+        parser.add_argument('--testimonials', type=int, default=0, help='Кількість Testimonial')
+        parser.add_argument('--trial-lessons', type=int, default=0, help='Кількість TrialLesson')
+        parser.add_argument('--consultations', type=int, default=0, help='Кількість ConsultationRequest')
+        parser.add_argument('--redirect-log', type=int, default=0, help='Кількість рядків redirect логу')
+        parser.add_argument(
+            '--redirect-log-file',
+            default=str(Path(settings.BASE_DIR) / 'logs' / 'redirects-scale.log'),
+            help='Файл redirect логу (дописується)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Рядків на bulk_create')
+        parser.add_argument('--seed', type=int, default=0, help='Seed генератора (відтворювані дані)')
+        parser.add_argument('--clear', action='store_true', help='Спершу видалити ВСІ записи вибраних моделей')
+        parser.add_argument('--force', action='store_true', help='Дозволити запуск без DEBUG')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('seed_scale_data наповнює БД фейковими даними; без DEBUG потрібен --force')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size має бути більше 0')
+
+        plan = [
+            (NewsArticle, options['news'], 'news_article'),
+            (Testimonial, options['testimonials'], 'testimonial'),
+            (TrialLesson, options['trial_lessons'], 'trial_lesson'),
+            (ConsultationRequest, options['consultations'], 'consultation_request'),
+        ]
+        if not any(count for _, count, _ in plan) and not options['redirect_log']:
+            raise CommandError('Нічого генерувати: вкажіть --news, --testimonials, --trial-lessons, '
+                               '--consultations або --redirect-log')
+
+        if options['clear']:
+            self._clear(plan)
+
+        generator = ScaleDataGenerator(seed=options['seed'])
+        total_start = time.monotonic()
+        for model, count, builder in plan:
+            if count:
+                self._insert(model, count, getattr(generator, builder), options['chunk_size'], options['verbosity'])
+
+        if options['redirect_log']:
+            self._write_redirect_log(generator, options)
+        self._reindex(options['news'])
+        self.stdout.write(self.style.SUCCESS(f'Готово за {time.monotonic() - total_start:.1f} с'))
+
+    def _clear(self, plan):
+        for model, count, _ in plan:
+            if count:
+                deleted, _ = model.objects.all().delete()
+                self.stdout.write(f'Видалено {model._meta.label}: {deleted}')
+
+    def _write_redirect_log(self, generator, options):
+        start = time.monotonic()
+        path = Path(options['redirect_log_file'])
+        written = write_redirect_log(path, generator.redirect_log_lines(options['redirect_log']), options['chunk_size'])
+        self.stdout.write(f'{path}: {written} рядків за {time.monotonic() - start:.1f} с')
+
+    def _reindex(self, news_count):
+        """bulk_create не надсилає post_save - інвалідуємо кеш сторінок, пошук та схожі статті вручну."""
+        if news_count:
+            start = time.monotonic()
+            indexed = news_search.reindex(NewsArticle.objects.order_by('-pk')[:news_count])
+            self.stdout.write(f'Пошуковий індекс новин: {indexed} статей за {time.monotonic() - start:.1f} с')
+            start = time.monotonic()
+            counts = related_news.build()
+            summary = ', '.join(f'{lang}: {count}' for lang, count in counts.items())
+            self.stdout.write(f'Схожі статті ({summary}) за {time.monotonic() - start:.1f} с')
+        page_cache.purge_views(page_cache.ALL)
+
+    def _insert(self, model, count, build, chunk_size, verbosity):
+        label = model._meta.label
+        start = time.monotonic()
+
+        def progress(created):
+            elapsed = time.monotonic() - start
+            self.stdout.write(f'  {label}: {created}/{count} ({created / elapsed if elapsed else 0:.0f} рядків/с)')
+
+        bulk_insert(model, count, build, chunk_size, progress if verbosity > 1 else None)
+        elapsed = time.monotonic() - start
+        self.stdout.write(f'{label}: {count} рядків за {elapsed:.1f} с ({count / elapsed if elapsed else 0:.0f}/с)')
@@ -0,0 +1,81 @@
+"""
+Management command: SEO аудит усіх внутрішніх URL (замість scripts/*.mjs).
+
+Обходить сайт in-process від URL sitemap, перевіряє canonical, пари hreflang,
+meta description, title/h1, биті посилання та ланцюжки редиректів.
+Розбір сторінок кешується за хешем вмісту - повторний запуск розбирає лише змінені.
+
+Використання:
+    python manage.py seo_audit
+    python manage.py seo_audit --concurrency 8 --no-cache
+    python manage.py seo_audit --json --output seo-audit.json --fail-on warning
+"""
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.seo_audit import ERROR, WARNING, AuditCache, SeoAuditor
+from apps.core.warmup import default_warm_host, sitemap_urls
+
+DEFAULT_CACHE = Path(settings.BASE_DIR) / '.seo_audit_cache.json'
+
+
+class Command(BaseCommand):
+    help = 'SEO аудит внутрішніх сторінок: canonical, hreflang, description, посилання, редиректи'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Кількість паралельних рендерів')
+        parser.add_argument('--host', help='Host заголовок (за замовчуванням - з CANONICAL_DOMAIN)')
+        parser.add_argument('--max-pages', type=int, default=5000, help='Максимум URL в обході')
+        parser.add_argument('--cache', default=str(DEFAULT_CACHE), help='Файл кешу розбору сторінок')
+        parser.add_argument('--no-cache', action='store_true', help='Розібрати всі сторінки заново')
+        parser.add_argument('--json', action='store_true', help='Звіт у JSON')
+        parser.add_argument('--output', help='Зберегти JSON звіт у файл')
+        parser.add_argument(
+            '--fail-on', choices=[ERROR, WARNING, 'none'], default=ERROR,
+            help='Завершитись з помилкою, якщо знайдено проблеми цього рівня (за замовчуванням error)',
+        )
+
+    def handle(self, *args, **options):
+        cache = AuditCache(None if options['no_cache'] else Path(options['cache']))
+        auditor = SeoAuditor(
+            host=options['host'] or default_warm_host(),
+            concurrency=options['concurrency'],
+            cache=cache,
+            max_pages=options['max_pages'],
+        )
+        report = auditor.audit(sitemap_urls())
+        data = report.as_dict()
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        if options['json']:
+            self.stdout.write(json.dumps(data, indent=2, ensure_ascii=False))
+        else:
+            self.print_report(report)
+
+        if not data['summary']['html_pages']:
+            raise CommandError('Жодна сторінка не відрендерилась - перевірте host та БД')
+        failing = {ERROR: report.count(ERROR), WARNING: report.count(ERROR) + report.count(WARNING)}
+        if failing.get(options['fail_on']):
+            raise CommandError(f'SEO аудит: знайдено проблем рівня {options["fail_on"]} або вище')
+
+    def print_report(self, report):
+        by_code = defaultdict(list)
+        for issue in report.issues:
+            by_code[issue.code].append(issue)
+        for code, issues in sorted(by_code.items(), key=lambda item: (item[1][0].severity != ERROR, item[0])):
+            style = self.style.ERROR if issues[0].severity == ERROR else self.style.WARNING
+            self.stdout.write(style(f'{code} ({issues[0].severity}): {len(issues)}'))
+            for issue in issues[:20]:
+                self.stdout.write(f'  {issue.url}  {issue.detail}'.rstrip())
+            if len(issues) > 20:
+                self.stdout.write(f'  ... ще {len(issues) - 20}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Обійдено {len(report.pages)} URL за {report.duration:.1f} с '
+            f'(розібрано {report.parsed}, з кешу {report.cached}), '
+            f'помилок: {report.count(ERROR)}, попереджень: {report.count(WARNING)}'
+        ))
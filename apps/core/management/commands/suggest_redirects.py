@@ -0,0 +1,74 @@
+"""
+Management command: підказки 301 редиректів для найчастіших 404.
+
+Читає logs/not_found.log (NotFoundTracker), шукає найсхожіший живий URL
+через trigram індекс і виводить правила у форматі REDIRECTS.
+
+Використання:
+    python manage.py suggest_redirects
+    python manage.py suggest_redirects --min-similarity 0.5 --limit 20
+    python manage.py suggest_redirects --format json --output suggestions.json
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.redirect_graph import get_compiled_redirects
+from apps.core.redirect_suggestions import load_not_found_hits, suggest_redirects
+
+
+class Command(BaseCommand):
+    help = 'Пропонує 301 редиректи для 404 шляхів за trigram схожістю з живими URL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            action='append',
+            help='Лог 404 (JSON lines); можна кілька. За замовчуванням logs/not_found.log',
+        )
+        parser.add_argument('--min-similarity', type=float, default=0.35, help='Поріг схожості 0..1')
+        parser.add_argument('--limit', type=int, default=50, help='Максимум підказок')
+        parser.add_argument(
+            '--format',
+            choices=['python', 'json'],
+            default='python',
+            help='python - рядки для apps/core/redirects.py, json - словник для інструментів',
+        )
+        parser.add_argument('--output', help='Записати у файл замість stdout')
+
+    def handle(self, *args, **options):
+        log_files = [Path(path) for path in options['log'] or []] or [
+            Path(settings.BASE_DIR) / 'logs' / 'not_found.log'
+        ]
+        hits = load_not_found_hits(log_files)
+        if not hits:
+            raise CommandError(f'Немає 404 записів у {", ".join(str(path) for path in log_files)}')
+
+        # Шляхи, що вже мають редирект (включно з автоматичними /ru/ варіантами)
+        existing = set(get_compiled_redirects().table)
+        suggestions = suggest_redirects(hits, options['min_similarity'], skip=existing)[:options['limit']]
+
+        if options['format'] == 'json':
+            content = json.dumps(
+                {suggestion.path: suggestion.target for suggestion in suggestions},
+                indent=2,
+                ensure_ascii=False,
+            )
+        else:
+            lines = ['    # ===== ПІДКАЗКИ suggest_redirects (перевірити вручну) =====']
+            for suggestion in suggestions:
+                lines.append(
+                    f'    {suggestion.path!r}: {suggestion.target!r},'
+                    f'  # similarity={suggestion.similarity}, hits={suggestion.hits}'
+                )
+            content = '\n'.join(lines)
+
+        if options['output']:
+            Path(options['output']).write_text(content + '\n', encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Записано {len(suggestions)} підказок: {options["output"]}'))
+        else:
+            self.stdout.write(content)
+
+        self.stderr.write(f'404 шляхів: {len(hits)}, підказок: {len(suggestions)}')
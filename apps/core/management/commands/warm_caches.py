@@ -0,0 +1,58 @@
+"""
+Management command: прогрів кешів після деплою сторінками з sitemap.
+
+Рендерить усі URL з SpeakUpSitemap та NewsSitemap in-process (Django test client)
+з обмеженою паралельністю: наповнює кеш сторінок (у production - спільний
+файловий кеш для всіх workers), кеші шаблонів та lookup кеші.
+
+Використання:
+    python manage.py warm_caches
+    python manage.py warm_caches --concurrency 8 --no-news
+    python manage.py warm_caches --json > warmup.json
+"""
+import json
+import time
+from dataclasses import asdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.warmup import sitemap_urls, warm_process_caches, warm_urls
+
+
+class Command(BaseCommand):
+    help = 'Рендерить сторінки з sitemap, щоб наповнити кеші до приходу трафіку'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Кількість паралельних рендерів')
+        parser.add_argument('--host', help='Host заголовок (за замовчуванням - з CANONICAL_DOMAIN)')
+        parser.add_argument('--no-news', action='store_true', help='Без новин (NewsSitemap)')
+        parser.add_argument('--limit', type=int, help='Прогріти лише перші N URL')
+        parser.add_argument('--json', action='store_true', help='Звіт у JSON')
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        warm_process_caches()
+        urls = sitemap_urls(include_news=not options['no_news'])
+        if options['limit']:
+            urls = urls[:options['limit']]
+        results = warm_urls(urls, concurrency=options['concurrency'], host=options['host'])
+        total = time.monotonic() - start
+
+        failed = [result for result in results if result.status != 200]
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'total_seconds': round(total, 3),
+                'results': [asdict(result) for result in results],
+            }, indent=2, ensure_ascii=False))
+        else:
+            for result in sorted(results, key=lambda item: item.duration_ms, reverse=True):
+                line = f'{result.duration_ms:8.1f} ms  {result.status}  {result.page_cache or "-":<4}  {result.url}'
+                if result.error:
+                    line += f'  {result.error}'
+                self.stdout.write(self.style.ERROR(line) if result.status != 200 else line)
+            self.stdout.write(self.style.SUCCESS(
+                f'Прогріто {len(results)} URL за {total:.1f} с, помилок: {len(failed)}'
+            ))
+
+        if results and len(failed) == len(results):
+            raise CommandError('Жодна сторінка не відрендерилась - перевірте host та БД')
@@ -0,0 +1,288 @@
+"""
+Метрики процесу у форматі Prometheus (лічильники, гістограми, gauges).
+
+Запис - інкремент словника в пам'яті процесу під локом (без I/O на запиті).
+Gunicorn workers - окремі процеси, тож кожен періодично (METRICS_FLUSH_INTERVAL)
+та при виході скидає знімок у METRICS_DIR/<pid>.json, а /metrics (views.metrics)
+підсумовує файли всіх workers:
+- counters та гістограми - сума по всіх файлах (включно з workers, що вже
+  завершились після max_requests: лічильники не скидаються при рестарті worker);
+- gauges - сума по живих процесах.
+Без METRICS_DIR (розробка, тести) /metrics показує лише поточний процес.
+
+gunicorn.conf.py очищає METRICS_DIR при старті master.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Межі гістограми часу відповіді (секунди)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> List[list]:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels → [лічильники по бакетах (+Inf останній), сума]
+        self._values: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            data[0][index] += 1
+            data[1] += value
+
+    def snapshot(self) -> List[list]:
+        with self._lock:
+            return [[list(labels), list(counts), total] for labels, (counts, total) in self._values.items()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    """Значення, що читається функцією в момент знімка (глибина черги тощо)."""
+
+    def __init__(self, name: str, documentation: str, func: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = ()
+        self.func = func
+
+    def snapshot(self) -> List[list]:
+        try:
+            return [[[], float(self.func())]]
+        except Exception as e:
+            logger.error('Gauge %s failed: %s', self.name, e)
+            return []
+
+    def reset(self) -> None:
+        pass
+
+
+Metric = Union[Counter, Histogram, Gauge]
+M = TypeVar('M', Counter, Histogram, Gauge)
+# Значення після merge(): float (counter, gauge) або (лічильники бакетів, сума) для гістограми
+MergedValues = Dict[str, Dict[Labels, Any]]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+
+    def register(self, metric: M) -> M:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        return {
+            'pid': os.getpid(),
+            'metrics': {name: metric.snapshot() for name, metric in self.metrics.items()},
+        }
+
+    def reset(self) -> None:
+        """Обнуляє лічильники процесу (тести)."""
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def flush(self, directory: Optional[Path] = None) -> None:
+        """Записує знімок процесу в METRICS_DIR/<pid>.json (атомарно)."""
+        directory = directory or get_metrics_dir()
+        if directory is None:
+            return
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                target = directory / f'{os.getpid()}.json'
+                tmp = directory / f'{os.getpid()}.json.tmp'
+                tmp.write_text(json.dumps(self.snapshot()), encoding='utf-8')
+                os.replace(tmp, target)
+            except OSError as e:
+                logger.error('Metrics flush to %s failed: %s', directory, e)
+
+    def maybe_flush(self) -> None:
+        """Скидає знімок, якщо минуло METRICS_FLUSH_INTERVAL (викликається після відповіді)."""
+        if time.monotonic() - self._last_flush < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            return
+        if get_metrics_dir() is None:
+            self._last_flush = time.monotonic()
+            return
+        from .utils.background import background_tasks
+
+        # Запис файлу - у фоновій черзі; _last_flush одразу, щоб не ставити задачу двічі
+        self._last_flush = time.monotonic()
+        background_tasks.submit(self.flush)
+
+
+def get_metrics_dir() -> Optional[Path]:
+    directory = getattr(settings, 'METRICS_DIR', None)
+    return Path(directory) if directory else None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect() -> List[dict]:
+    """Знімки всіх процесів (з METRICS_DIR) або лише поточного."""
+    directory = get_metrics_dir()
+    if directory is None:
+        return [registry.snapshot()]
+    registry.flush(directory)
+    snapshots = []
+    for path in directory.glob('*.json'):
+        try:
+            snapshots.append(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            # Файл замінюється саме зараз або пошкоджений - пропускаємо цей збір
+            continue
+    return snapshots
+
+
+def merge(snapshots: List[dict]) -> MergedValues:
+    """Сума counters та гістограм по всіх знімках, gauges - по живих процесах."""
+    merged: MergedValues = {name: {} for name in registry.metrics}
+    for snapshot in snapshots:
+        alive = None
+        for name, samples in snapshot['metrics'].items():
+            metric = registry.metrics.get(name)
+            if metric is None:
+                continue
+            values = merged[name]
+            if isinstance(metric, Gauge):
+                if alive is None:
+                    alive = snapshot['pid'] == os.getpid() or _pid_alive(snapshot['pid'])
+                if not alive:
+                    continue
+            for sample in samples:
+                labels = tuple(sample[0])
+                if isinstance(metric, Histogram):
+                    counts, total = values.get(labels, ([0] * (len(metric.buckets) + 1), 0.0))
+                    values[labels] = ([a + b for a, b in zip(counts, sample[1])], total + sample[2])
+                else:
+                    values[labels] = values.get(labels, 0) + sample[1]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(merged: MergedValues) -> str:
+    """Text exposition format Prometheus 0.0.4."""
+    lines = []
+    for name, metric in registry.metrics.items():
+        kind = {Counter: 'counter', Histogram: 'histogram', Gauge: 'gauge'}[type(metric)]
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(merged.get(name, {}).items()):
+            if isinstance(metric, Histogram):
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(list(metric.buckets) + ['+Inf'], counts):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else repr(float(bound))
+                    bucket_labels = _labels(metric.labelnames, labels, f'le="{le}"')
+                    lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+                lines.append(f'{name}_sum{_labels(metric.labelnames, labels)} {repr(float(total))}')
+                lines.append(f'{name}_count{_labels(metric.labelnames, labels)} {cumulative}')
+            else:
+                lines.append(f'{name}{_labels(metric.labelnames, labels)} {_number(value)}')
+
+    # Частка влучань кешів (зручніше, ніж рахувати в кожному дашборді)
+    lines.append('# HELP speakup_cache_hit_ratio Cache hits / lookups since start')
+    lines.append('# TYPE speakup_cache_hit_ratio gauge')
+    lookups: Dict[str, List[float]] = {}
+    for (cache, result), value in merged.get(cache_lookups.name, {}).items():
+        lookups.setdefault(cache, [0, 0])[0 if result == 'hit' else 1] += value
+    for cache, (hits, misses) in sorted(lookups.items()):
+        lines.append(f'speakup_cache_hit_ratio{_labels(["cache"], [cache])} {round(hits / (hits + misses), 4)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _background_queue_depth() -> int:
+    from .utils.background import background_tasks
+
+    return background_tasks.qsize()
+
+
+# Singleton
+registry = Registry()
+
+request_latency = registry.register(Histogram(
+    'speakup_request_duration_seconds', 'Response time by URL name', ['view'],
+))
+redirects = registry.register(Counter(
+    'speakup_redirects_total', 'Legacy URL hits by type (static, news, wordpress_410)', ['type'],
+))
+leads = registry.register(Counter(
+    'speakup_leads_total', 'Form submissions by form and result (created, invalid, honeypot)', ['form', 'result'],
+))
+cache_lookups = registry.register(Counter(
+    'speakup_cache_lookups_total', 'Cache lookups by cache and result (hit, miss)', ['cache', 'result'],
+))
+background_queue_depth = registry.register(Gauge(
+    'speakup_background_queue_depth', 'Tasks waiting in background_tasks (redirect logger, emails)',
+    _background_queue_depth,
+))
@@ -1,87 +1,116 @@
 """
 Middleware для обробки 301 редиректів зі старих URL.
+
+Всі middleware підтримують і WSGI, і ASGI (sync_capable + async_capable),
+щоб під ASGI Django не перемикав контекст sync↔async на кожному шарі.
 """
+import json
+import random
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.shortcuts import redirect
 from django.http import Http404, HttpResponse, HttpResponseBadRequest
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.csrf import CsrfViewMiddleware
+from django.middleware.security import SecurityMiddleware
+from django.utils.cache import patch_vary_headers
+from . import compression, instrumentation, page_cache, query_budget
+from . import metrics as process_metrics
+from .hosts import HostPolicy
 from .models import NewsArticle
-from .redirects import REDIRECTS
+from .not_found import lite_404_response, negative_cache, not_found_tracker
+from .prerender import prerendered_pages
+from .redirect_graph import DYNAMIC_ROUTES, get_compiled_redirects
 from .utils.redirect_logger import redirect_logger
 
 
-class AllowedHostsMiddleware:
-    """
-    Middleware для обробки ALLOWED_HOSTS.
-    Автоматично дозволяє всі хости, якщо ALLOWED_HOSTS не налаштований або містить '*'.
+class HybridMiddleware:
     """
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def process_request(self, request):
-        """
-        process_request викликається ДО SecurityMiddleware.process_request,
-        що дозволяє нам модифікувати ALLOWED_HOSTS перед перевіркою.
-        """
-        allowed_hosts = getattr(settings, 'ALLOWED_HOSTS', [])
-
-        # Якщо ALLOWED_HOSTS порожній або містить '*', дозволяємо всі хости
-        allow_all = not allowed_hosts or '*' in allowed_hosts
+    Базовий клас для middleware, що працюють і в sync, і в async стеку.
 
-        if allow_all:
-            try:
-                host = request.get_host().split(':')[0]  # Без порту
-                # Додаємо хост до ALLOWED_HOSTS динамічно
-                if host not in settings.ALLOWED_HOSTS:
-                    settings.ALLOWED_HOSTS.append(host)
-            except Exception:
-                # Якщо не можемо отримати хост, не блокуємо запит
-                pass
-
-        return None  # None означає "продовжити обробку"
-
-    def __call__(self, request):
-        response = self.get_response(request)
-        return response
-
-
-class HealthCheckMiddleware:
-    """
-    Middleware для обробки healthcheck запитів від Render.
-    Обробляє запити до / та /healthz до перевірки ALLOWED_HOSTS.
+    Підкласи перевизначають intercept() (та за потреби aintercept() для запитів до БД):
+    повернення HttpResponse завершує обробку, None - передає запит далі.
+    after() бачить кожну відповідь (і власну, і від решти стеку).
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        path = request.path
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.intercept(request)
+        if response is None:
+            response = self.get_response(request)
+        return self.after(request, response)
+
+    async def __acall__(self, request):
+        response = await self.aintercept(request)
+        if response is None:
+            response = await self.get_response(request)
+        return self.after(request, response)
+
+    def intercept(self, request):
+        """Sync перевірка запиту; None - продовжити обробку."""
+        return None
+
+    async def aintercept(self, request):
+        """Async перевірка запиту; за замовчуванням - та сама логіка без I/O."""
+        return self.intercept(request)
+
+    def after(self, request, response):
+        """Обробка відповіді (без I/O); за замовчуванням - без змін."""
+        return response
 
-        # Перевірка чи це healthcheck від Render
-        is_render_healthcheck = (
-            user_agent.startswith('Render/') or
-            user_agent.startswith('Go-http-client/') or
-            request.META.get('REMOTE_ADDR', '').startswith('10.228.')
-        )
 
-        # Обробка healthcheck запитів
-        if is_render_healthcheck and (path == '/' or path == '/healthz'):
-            return HttpResponse('OK', content_type='text/plain', status=200)
+class RequestClass:
+    """Класи запитів, які визначає FrontDoorMiddleware (request.front_door)."""
+    HEALTHCHECK = 'healthcheck'
+    INVALID_HOST = 'invalid_host'
+    WORDPRESS_PROBE = 'wordpress_probe'
+    LEGACY_REDIRECT = 'legacy_redirect'
+    KNOWN_NOT_FOUND = 'known_not_found'
+    KNOWN_BOT = 'known_bot'
+    NORMAL = 'normal'
 
-        response = self.get_response(request)
-        return response
+    # Класи, на які front door відповідає сам (до sessions/locale/CSRF)
+    TERMINAL = frozenset({HEALTHCHECK, INVALID_HOST, WORDPRESS_PROBE, LEGACY_REDIRECT, KNOWN_NOT_FOUND})
 
 
-class GoogleAdsBotMiddleware:
+class FrontDoorMiddleware(HybridMiddleware):
+    """
+    Єдина "вхідна" точка: класифікує кожен запит ОДИН раз і відповідає на
+    термінальні класи до SessionMiddleware, LocaleMiddleware та CSRF.
+
+    Класи (перший збіг):
+    1. healthcheck - /healthz (будь-хто) або / від Render → 200 OK (з будь-яким Host)
+    2. invalid_host - Host не пройшов HostPolicy → 400
+    3. wordpress_probe - WordPress шляхи → 410 Gone
+    4. legacy_redirect - статичні редиректи з REDIRECTS → один 301 на кінцеву адресу
+    5. known_not_found - шлях у negative cache → легка 404 (apps.core.not_found)
+    6. known_bot - Google Ads боти (не термінальний, request._google_ads_bot = True)
+    7. normal
+
+    Кожна 404 враховується в top-N трекері; 404 від статичних catch-all маршрутів
+    (міста, програми, школи) потрапляють у negative cache.
+
+    Результат зберігається в request.front_door. Стоїть ПЕРЕД SecurityMiddleware,
+    щоб healthcheck по HTTP не отримував SSL редирект; для інших термінальних
+    відповідей SSL редирект та security заголовки застосовуються явно.
     """
-    Middleware для обробки запитів від Google Ads ботів.
 
-    Визначає запити від Google Ads ботів за User-Agent та передає їх
-    без редиректу SECURE_SSL_REDIRECT, щоб уникнути редирект-петель
-    або помилок 404.
+    HEALTHCHECK_PATH = '/healthz'
 
-    Google Ads боти можуть надсилати нестандартні заголовки, які
-    викликають конфлікти з SecurityMiddleware.
-    """
+    # Render healthcheck: User-Agent або внутрішня мережа
+    RENDER_USER_AGENT_PREFIXES: tuple[str, ...] = ('Render/', 'Go-http-client/')
+    RENDER_INTERNAL_IP_PREFIX = '10.228.'
 
     # Google Ads bot User-Agent patterns
     GOOGLE_ADS_BOT_PATTERNS: list[str] = [
@@ -91,153 +120,432 @@ class GoogleAdsBotMiddleware:
         'Googlebot-Mobile',  # Mobile crawler
     ]
 
-    def __init__(self, get_response):
-        self.get_response = get_response
+    # WordPress шляхи для блокування (410 Gone каже пошуковим системам,
+    # що ресурси назавжди видалені - це прискорює видалення з індексів)
+    WORDPRESS_PATHS: list[str] = [
+        '/wp-content/',
+        '/wp-admin/',
+        '/wp-includes/',
+        '/wp-json/',
+        '/wp-login.php',
+        '/wp-cron.php',
+        '/xmlrpc.php',
+        '/readme.html',
+        '/license.txt',
+        '/wp-config.php',
+        '/wp-trackback.php',
+        '/wp-signup.php',
+        '/wp-activate.php',
+        '/wp-mail.php',
+        '/wp-links-opml.php',
+        '/wp-comments-post.php',
+        '/wp-settings.php',
+    ]
 
-    def __call__(self, request) -> HttpResponse:
-        user_agent: str = request.META.get('HTTP_USER_AGENT', '')
+    WORDPRESS_GONE_MESSAGE = (
+        'This WordPress resource has been permanently removed. The site now runs on Django.'
+    )
 
-        # Перевіряємо чи це Google Ads бот
-        is_google_ads_bot: bool = any(
-            pattern in user_agent for pattern in self.GOOGLE_ADS_BOT_PATTERNS
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # Матчери компілюються один раз на процес, а не на кожен запит
+        self.bot_re = re.compile('|'.join(re.escape(p) for p in self.GOOGLE_ADS_BOT_PATTERNS))
+        # Префікси зі списку + загальний паттерн /wp-*.php
+        self.wordpress_re = re.compile(
+            '(?:' + '|'.join(re.escape(p) for p in self.WORDPRESS_PATHS) + r')|/wp-.*\.php$'
         )
+        # Ланцюжки вже розгорнуті до одного 301; цикли зупиняють старт процесу
+        self.redirects = get_compiled_redirects().table
+        self.host_policy = HostPolicy.from_settings()
+        # SSL редирект та security заголовки для термінальних відповідей
+        self.security = SecurityMiddleware(get_response)
+
+    def intercept(self, request):
+        request_class, target = self.classify(request)
+        request.front_door = request_class
+        request._google_ads_bot = request_class == RequestClass.KNOWN_BOT
+
+        if request_class not in RequestClass.TERMINAL:
+            return None
+
+        if request_class == RequestClass.HEALTHCHECK:
+            return HttpResponse('OK', content_type='text/plain', status=200)
+
+        if request_class == RequestClass.INVALID_HOST:
+            # Без SecurityMiddleware: get_host() для такого Host кинув би DisallowedHost
+            return HttpResponseBadRequest('Invalid host', content_type='text/plain')
+
+        # Спершу HTTPS (SECURE_SSL_REDIRECT), як і для решти сайту
+        response = self.security.process_request(request)
+        if response is not None:
+            return response
+
+        if request_class == RequestClass.WORDPRESS_PROBE:
+            process_metrics.redirects.inc('wordpress_410')
+            response = HttpResponse(self.WORDPRESS_GONE_MESSAGE, status=410, content_type='text/plain')
+        elif request_class == RequestClass.KNOWN_NOT_FOUND:
+            response = lite_404_response(request.path)
+        else:
+            process_metrics.redirects.inc('static')
+            # ✅ Логування НЕ блокує (< 1ms)
+            redirect_logger.log_redirect(
+                request=request,
+                old_url=request.path,
+                new_url=target,
+                redirect_type='static'
+            )
+            response = redirect(target, permanent=True)
+
+        return self.security.process_response(request, response)
 
-        # Встановлюємо атрибут на request для інших компонентів
-        request._google_ads_bot = is_google_ads_bot
+    def classify(self, request):
+        """
+        Визначає клас запиту.
+
+        Returns:
+            (клас з RequestClass, URL редиректу або None)
+        """
+        path = request.path
 
-        response: HttpResponse = self.get_response(request)
+        if path == self.HEALTHCHECK_PATH or (path == '/' and self.is_render_healthcheck(request)):
+            return RequestClass.HEALTHCHECK, None
+
+        _domain, host_allowed = self.host_policy.check(request._get_raw_host())
+        if not host_allowed:
+            return RequestClass.INVALID_HOST, None
+
+        if self.wordpress_re.match(path):
+            return RequestClass.WORDPRESS_PROBE, None
+
+        new_url = self.find_redirect(path)
+        if new_url is not None:
+            return RequestClass.LEGACY_REDIRECT, new_url
+
+        if path in negative_cache:
+            return RequestClass.KNOWN_NOT_FOUND, None
+
+        if self.bot_re.search(request.META.get('HTTP_USER_AGENT', '')):
+            return RequestClass.KNOWN_BOT, None
+
+        return RequestClass.NORMAL, None
+
+    def after(self, request, response):
+        if request.method == 'HEAD' and not response.streaming:
+            self.strip_head_body(response)
+        if response.status_code == 404:
+            not_found_tracker.record(request.path)
+            match = getattr(request, 'resolver_match', None)
+            # Лише маршрути з даними в коді: промах не зникне до наступного деплою
+            if match is not None and match.view_name in DYNAMIC_ROUTES:
+                negative_cache.add(request.path)
         return response
 
+    @staticmethod
+    def strip_head_body(response):
+        """
+        HEAD без тіла, але з Content-Length як у GET.
 
-class NewsRedirectMiddleware:
+        runserver прибирає тіло сам, gunicorn - ні: байти тіла після відповіді
+        на HEAD ламають наступну відповідь у keep-alive з'єднанні.
+        """
+        if not response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        response.content = b''
+
+    def is_render_healthcheck(self, request):
+        return (
+            request.META.get('HTTP_USER_AGENT', '').startswith(self.RENDER_USER_AGENT_PREFIXES) or
+            request.META.get('REMOTE_ADDR', '').startswith(self.RENDER_INTERNAL_IP_PREFIX)
+        )
+
+    def find_redirect(self, path):
+        """Статичний редирект: точне співпадіння, потім шлях без trailing slash."""
+        new_url = self.redirects.get(path)
+        if new_url is None and path != '/' and path.endswith('/'):
+            new_url = self.redirects.get(path.rstrip('/'))
+        return new_url
+
+
+class NewsRedirectMiddleware(HybridMiddleware):
     """
-    Middleware для автоматичних 301 редиректів зі старих news URL та інших старих URL.
-    Обробляє trailing slashes автоматично.
+    Middleware для автоматичних 301 редиректів зі старих news URL (old_url_uk/old_url_ru).
+    Обробляє trailing slashes автоматично. Статичні редиректи з REDIRECTS
+    обробляє FrontDoorMiddleware ще до sessions/locale.
     """
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def intercept(self, request):
         path = request.path
-        # Нормалізуємо шлях для перевірки (без trailing slash, крім кореня)
+        for check_path in self._news_paths_to_check(path):
+            article = self._find_article(check_path)
+            response = self._news_redirect(request, path, article)
+            if response is not None:
+                return response
+        return None
+
+    async def aintercept(self, request):
+        path = request.path
+        for check_path in self._news_paths_to_check(path):
+            article = await self._afind_article(check_path)
+            response = self._news_redirect(request, path, article)
+            if response is not None:
+                return response
+        return None
+
+    # old_url_ru зберігаються з мовним префіксом (fill_news_old_urls: '/ru' + old_url_uk)
+    NEWS_PREFIXES = ('/news/', '/ru/news/')
+
+    def _news_paths_to_check(self, path):
+        """Варіанти шляху для пошуку старого news URL (з trailing slash та без)."""
         path_normalized = path.rstrip('/') if path != '/' else '/'
+        candidates = [path, path_normalized] if path != path_normalized else [path]
+        return [
+            check_path for check_path in candidates
+            if check_path.startswith(self.NEWS_PREFIXES) and check_path not in self.NEWS_PREFIXES
+        ]
+
+    def _find_article(self, check_path):
+        """Шукаємо статтю за old_url_uk або old_url_ru."""
+        article = NewsArticle.objects.filter(old_url_uk=check_path).first()
+        if not article:
+            article = NewsArticle.objects.filter(old_url_ru=check_path).first()
+        return article
+
+    async def _afind_article(self, check_path):
+        article = await NewsArticle.objects.filter(old_url_uk=check_path).afirst()
+        if not article:
+            article = await NewsArticle.objects.filter(old_url_ru=check_path).afirst()
+        return article
+
+    def _news_redirect(self, request, path, article):
+        if not article:
+            return None
+
+        # 301 редирект на новий URL ТІЛЬКИ якщо URL відрізняється
+        new_url = article.get_absolute_url()
+        if new_url == path:
+            return None
+
+        process_metrics.redirects.inc('news')
+        # ✅ Логування НЕ блокує
+        redirect_logger.log_redirect(
+            request=request,
+            old_url=path,
+            new_url=new_url,
+            redirect_type='news'
+        )
 
-        # Перевірка статичних редиректів (спочатку точне співпадіння)
-        if path in REDIRECTS:
-            new_url = REDIRECTS[path]
+        return redirect(new_url, permanent=True)
 
-            # ✅ Логування НЕ блокує (< 1ms)
-            redirect_logger.log_redirect(
-                request=request,
-                old_url=path,
-                new_url=new_url,
-                redirect_type='static'
-            )
 
-            return redirect(new_url, permanent=True)
+class PageCacheMiddleware(HybridMiddleware):
+    """
+    Повносторінковий кеш для анонімних GET (apps.core.page_cache)
+    та віддача пре-рендерених сторінок (apps.core.prerender).
+
+    Стоїть ПЕРЕД SessionMiddleware: влучання в кеш не запускає sessions, locale,
+    context processors та view. Зберігає відповідь після проходження всього стеку,
+    тож security/X-Frame-Options заголовки вже в ній.
+    """
 
-        # Перевірка нормалізованого шляху (для обробки trailing slash)
-        if path_normalized in REDIRECTS and path_normalized != path:
-            new_url = REDIRECTS[path_normalized]
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, 'PAGE_CACHE_ENABLED', False)
+        # Сторінки, зібрані `prerender_pages` (apps.core.prerender)
+        self.prerendered = getattr(settings, 'PRERENDER_ENABLED', False)
+        # CSRF cookie для відповіді з кешу (CsrfViewMiddleware нижче не виконується)
+        self.csrf = CsrfViewMiddleware(get_response)
+
+    def intercept(self, request):
+        key = page_cache.cache_key_for(request) if self.enabled or self.prerendered else None
+        request._page_cache_key = key if self.enabled else None
+        if key is None:
+            return None
+        if self.prerendered:
+            entry = prerendered_pages.lookup(request)
+            if entry is not None:
+                request._page_cache_key = None
+                request._page_cache_view = entry.get('view_name')
+                response = page_cache.serve(request, entry, self.csrf)
+                response['X-Page-Cache'] = 'PRERENDERED'
+                return response
+        if request._page_cache_key is None:
+            return None
+        entry = page_cache.lookup(request._page_cache_key)
+        if entry is None:
+            request._page_cache_versions = page_cache.snapshot_versions()
+            return None
+        request._page_cache_key = None  # не перезаписувати щойно віддане
+        request._page_cache_view = entry.get('view_name')
+        return page_cache.serve(request, entry, self.csrf)
+
+    def after(self, request, response):
+        key = getattr(request, '_page_cache_key', None)
+        if key and page_cache.store(request, response, key, request._page_cache_versions):
+            response['X-Page-Cache'] = 'MISS'
+        return response
 
-            # ✅ Логування НЕ блокує (< 1ms)
-            redirect_logger.log_redirect(
-                request=request,
-                old_url=path,
-                new_url=new_url,
-                redirect_type='static'
-            )
 
-            return redirect(new_url, permanent=True)
-
-        # Перевірка чи це старий news URL
-        # Перевіряємо обидва варіанти (з trailing slash та без)
-        news_paths_to_check = [path, path_normalized] if path != path_normalized else [path]
-
-        for check_path in news_paths_to_check:
-            if check_path.startswith('/news/') and check_path != '/news/':
-                # Шукаємо статтю за old_url_uk або old_url_ru
-                article = NewsArticle.objects.filter(
-                    old_url_uk=check_path
-                ).first()
-
-                if not article:
-                    article = NewsArticle.objects.filter(
-                        old_url_ru=check_path
-                    ).first()
-
-                if article:
-                    # 301 редирект на новий URL ТІЛЬКИ якщо URL відрізняється
-                    new_url = article.get_absolute_url()
-                    if new_url != path:
-                        # ✅ Логування НЕ блокує
-                        redirect_logger.log_redirect(
-                            request=request,
-                            old_url=path,
-                            new_url=new_url,
-                            redirect_type='news'
-                        )
-
-                        return redirect(new_url, permanent=True)
-
-        response = self.get_response(request)
+class CompressionMiddleware(HybridMiddleware):
+    """
+    Стиснення на льоту для некешованих відповідей, більших за COMPRESSION_MIN_SIZE.
+
+    Відповіді з кешу сторінок вже мають Content-Encoding (заздалегідь стиснуті
+    варіанти), WhiteNoise віддає власні .gz/.br файли - їх не чіпаємо.
+    Малі відповіді (редиректи, JSON форм, 404) не стискаються: CPU дорожче за виграш.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+    def after(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < self.min_size:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), has_brotli=True)
+        if encoding is None:
+            return response
+
+        compressed = compression.compress_body(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        # Як у GZipMiddleware: сильний ETag стає слабким, бо тіло змінилось
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
         return response
 
 
-class WordPressBlockMiddleware:
+class InstrumentationMiddleware(HybridMiddleware):
     """
-    Middleware для блокування WordPress шляхів з 410 Gone.
-    410 Gone каже пошуковим системам, що ресурси назавжди видалені.
-    Це прискорює видалення старих WordPress URL з індексів.
-
-    Порядок обробки:
-    1. Якщо URL починається з WordPress префіксу → 410 Gone
-    2. Якщо URL містить *.php після /wp- → 410 Gone
-    3. Інакше → дозволити подальшу обробку
+    Зовнішній шар: відкриває метрики запиту, додає Server-Timing та пише семпл у лог.
+
+    Також час відповіді в гістограму /metrics (apps.core.metrics) за url name.
+    Вимкнене (INSTRUMENTATION_ENABLED=False) - прибирається зі стеку (MiddlewareNotUsed).
     """
-    # WordPress шляхи для блокування
-    WORDPRESS_PATHS = [
-        '/wp-content/',
-        '/wp-admin/',
-        '/wp-includes/',
-        '/wp-json/',
-        '/wp-login.php',
-        '/wp-cron.php',
-        '/xmlrpc.php',
-        '/readme.html',
-        '/license.txt',
-        '/wp-config.php',
-        '/wp-trackback.php',
-        '/wp-signup.php',
-        '/wp-activate.php',
-        '/wp-mail.php',
-        '/wp-links-opml.php',
-        '/wp-comments-post.php',
-        '/wp-settings.php',
-    ]
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        instrumentation.install()
+        self.server_timing = getattr(settings, 'SERVER_TIMING_ENABLED', False)
+        self.sample_rate = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 0.0)
+        self.slow_seconds = getattr(settings, 'INSTRUMENTATION_SLOW_MS', 1000) / 1000
 
     def __call__(self, request):
-        path = request.path
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.start
+        if self.server_timing:
+            response['Server-Timing'] = instrumentation.server_timing(metrics, total)
+        if total >= self.slow_seconds or (self.sample_rate and random.random() < self.sample_rate):
+            record = instrumentation.log_record(request, response, metrics, total)
+            instrumentation.logger.info(json.dumps(record, ensure_ascii=False))
+        process_metrics.request_latency.observe(total, self.view_label(request))
+        process_metrics.registry.maybe_flush()
+        return response
 
-        # Перевірка чи шлях починається з будь-якого WordPress префіксу
-        if any(path.startswith(wp_path) for wp_path in self.WORDPRESS_PATHS):
-            # 410 Gone - ресурс назавжди видалено
-            return HttpResponse(
-                'This WordPress resource has been permanently removed. The site now runs on Django.',
-                status=410,
-                content_type='text/plain'
-            )
+    def view_label(self, request):
+        """Url name; для відповідей кешу сторінок та front door - їхня позначка."""
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            return match.view_name
+        view_name = getattr(request, '_page_cache_view', None)
+        if view_name:
+            return view_name
+        front_door = getattr(request, 'front_door', RequestClass.NORMAL)
+        if front_door != RequestClass.NORMAL:
+            return f'front_door:{front_door}'
+        return 'unresolved'
 
-        # Також блокуємо загальний паттерн /wp-*.php
-        if path.startswith('/wp-') and path.endswith('.php'):
-            return HttpResponse(
-                'This WordPress resource has been permanently removed.',
-                status=410,
-                content_type='text/plain'
-            )
 
-        response = self.get_response(request)
+class ViewTimingMiddleware(HybridMiddleware):
+    """Внутрішній шар (останній у MIDDLEWARE): час resolve + process_view + view."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = instrumentation.current()
+        if metrics is None:
+            return self.get_response(request)
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            metrics.view_time += time.perf_counter() - start
+
+    async def __acall__(self, request):
+        metrics = instrumentation.current()
+        if metrics is None:
+            return await self.get_response(request)
+        start = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            metrics.view_time += time.perf_counter() - start
+
+
+class NPlusOneMiddleware(HybridMiddleware):
+    """
+    Розробка: попереджає про N+1 - однакову форму SQL, повторену
+    NPLUSONE_THRESHOLD+ разів за запит (apps.core.query_budget).
+
+    Кількість запитів - у заголовку X-Query-Count. Вимкнене (NPLUSONE_DETECTION=False) -
+    прибирається зі стеку.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'NPLUSONE_DETECTION', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with query_budget.record_queries() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        with query_budget.record_queries() as recorder:
+            response = await self.get_response(request)
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        response['X-Query-Count'] = str(recorder.count)
+        if recorder.repeated(self.threshold):
+            match = getattr(request, 'resolver_match', None)
+            query_budget.logger.warning(
+                'Possible N+1 in %s (%s): %s',
+                request.path, match.view_name if match else '-', query_budget.format_report(recorder, self.threshold),
+            )
         return response
@@ -9,21 +9,26 @@ class Migration(migrations.Migration):
         ('core', '0006_alter_consultationrequest_phone'),
     ]
 
+    # Таблиця leads_runninglinetext вже створена leads.0001 - переносимо лише стан моделі,
+    # інакше migrate на новій БД падає з "table already exists"
     operations = [
-        migrations.CreateModel(
-            name='RunningLineText',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('text', models.CharField(max_length=200, verbose_name='Текст')),
-                ('is_active', models.BooleanField(default=True, verbose_name='Активний')),
-                ('order', models.PositiveIntegerField(default=0, verbose_name='Порядок')),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='RunningLineText',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('text', models.CharField(max_length=200, verbose_name='Текст')),
+                        ('is_active', models.BooleanField(default=True, verbose_name='Активний')),
+                        ('order', models.PositiveIntegerField(default=0, verbose_name='Порядок')),
+                    ],
+                    options={
+                        'verbose_name': 'Текст бігучої стрічки',
+                        'verbose_name_plural': 'Тексти бігучої стрічки',
+                        'ordering': ['order', '-id'],
+                        'db_table': 'leads_runninglinetext',  # Використовуємо існуючу таблицю
+                    },
+                ),
             ],
-            options={
-                'verbose_name': 'Текст бігучої стрічки',
-                'verbose_name_plural': 'Тексти бігучої стрічки',
-                'ordering': ['order', '-id'],
-                'db_table': 'leads_runninglinetext',  # Використовуємо існуючу таблицю
-            },
         ),
     ]
-
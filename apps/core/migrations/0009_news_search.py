@@ -0,0 +1,100 @@
+# Generated manually: повнотекстовий індекс новин (apps/core/news_search.py)
+#
+# DDL та індексація заморожені тут (копія news_search на момент міграції):
+# зміни живого модуля не повинні змінювати вже застосовану міграцію.
+
+import html
+import re
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+LANGUAGES = ('uk', 'ru')
+TABLE = 'core_newsarticle'
+FTS_TABLE = 'core_newsarticle_search'
+PG_CONFIGS = {'uk': 'simple', 'ru': 'russian'}
+
+_SKIP_BLOCKS_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def html_to_text(value):
+    text = strip_tags(_SKIP_BLOCKS_RE.sub(' ', value or ''))
+    return ' '.join(html.unescape(text).split())
+
+
+def document(article, lang):
+    """Поля для індексу однієї мови (RU - з fallback на UK)."""
+    def field(name):
+        if lang == 'ru':
+            return getattr(article, f'{name}_ru') or getattr(article, f'{name}_uk')
+        return getattr(article, f'{name}_uk')
+
+    return (field('title') or '', field('meta_description') or '', html_to_text(field('content')))
+
+
+def install_postgresql(cursor, articles):
+    for lang in LANGUAGES:
+        cursor.execute(f'ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector_{lang} tsvector')
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TABLE}_search_{lang}_gin ON {TABLE} USING GIN (search_vector_{lang})'
+        )
+    assignments = ', '.join(
+        f"search_vector_{lang} = "
+        f"setweight(to_tsvector('{PG_CONFIGS[lang]}', %s), 'A') || "
+        f"setweight(to_tsvector('{PG_CONFIGS[lang]}', %s), 'B') || "
+        f"setweight(to_tsvector('{PG_CONFIGS[lang]}', %s), 'C')"
+        for lang in LANGUAGES
+    )
+    for article in articles:
+        params = [value for lang in LANGUAGES for value in document(article, lang)]
+        cursor.execute(f'UPDATE {TABLE} SET {assignments} WHERE id = %s', params + [article.pk])
+
+
+def install_sqlite(cursor, articles):
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+        "article_id UNINDEXED, lang UNINDEXED, title, description, body, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    for article in articles:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (article_id, lang, title, description, body) VALUES (%s, %s, %s, %s, %s)',
+            [(article.pk, lang, *document(article, lang)) for lang in LANGUAGES],
+        )
+
+
+INSTALL = {'postgresql': install_postgresql, 'sqlite': install_sqlite}
+UNINSTALL = {
+    'postgresql': [f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector_{lang}' for lang in LANGUAGES],
+    'sqlite': [f'DROP TABLE IF EXISTS {FTS_TABLE}'],
+}
+
+
+def create_search_index(apps, schema_editor):
+    """
+    PostgreSQL: tsvector колонки з GIN індексами, SQLite: FTS5 таблиця.
+    Індексує вже наявні статті. Інші БД - без індексу (пошук через icontains).
+    """
+    install = INSTALL.get(schema_editor.connection.vendor)
+    if install is None:
+        return
+    NewsArticle = apps.get_model('core', 'NewsArticle')
+    with schema_editor.connection.cursor() as cursor:
+        install(cursor, NewsArticle.objects.all().iterator())
+
+
+def drop_search_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for sql in UNINSTALL.get(schema_editor.connection.vendor, []):
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_add_name_email_to_consultation'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 4.2.8 on 2026-10-19 20:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_news_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsArticleTerms",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("language", models.CharField(max_length=2)),
+                ("terms", models.JSONField(default=dict)),
+                ("signature", models.JSONField(default=dict)),
+            ],
+            options={
+                "verbose_name": "Терміни статті",
+                "verbose_name_plural": "Терміни статей",
+            },
+        ),
+        migrations.CreateModel(
+            name="RelatedNewsArticle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("language", models.CharField(max_length=2)),
+                ("position", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+            ],
+            options={
+                "verbose_name": "Схожа стаття",
+                "verbose_name_plural": "Схожі статті",
+                "ordering": ["article", "language", "position"],
+            },
+        ),
+        migrations.CreateModel(
+            name="RelatedNewsPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("language", models.CharField(max_length=2)),
+                ("term", models.CharField(max_length=16)),
+                ("weight", models.FloatField()),
+            ],
+            options={
+                "verbose_name": "Термін сигнатури",
+                "verbose_name_plural": "Терміни сигнатур",
+            },
+        ),
+        migrations.CreateModel(
+            name="RelatedNewsTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("language", models.CharField(max_length=2)),
+                ("term", models.CharField(max_length=16)),
+                ("df", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Частота терміну",
+                "verbose_name_plural": "Частоти термінів",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatednewsterm",
+            constraint=models.UniqueConstraint(
+                fields=("language", "term"), name="core_relatednewsterm_language_term"
+            ),
+        ),
+        migrations.AddField(
+            model_name="relatednewsposting",
+            name="article",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="term_postings",
+                to="core.newsarticle",
+            ),
+        ),
+        migrations.AddField(
+            model_name="relatednewsarticle",
+            name="article",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="related_links",
+                to="core.newsarticle",
+            ),
+        ),
+        migrations.AddField(
+            model_name="relatednewsarticle",
+            name="related",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="related_from",
+                to="core.newsarticle",
+            ),
+        ),
+        migrations.AddField(
+            model_name="newsarticleterms",
+            name="article",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="term_vectors",
+                to="core.newsarticle",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="relatednewsposting",
+            index=models.Index(fields=["language", "term"], name="core_relate_languag_376176_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="relatednewsarticle",
+            index=models.Index(
+                fields=["article", "language", "position"], name="core_relate_article_624ad0_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="newsarticleterms",
+            constraint=models.UniqueConstraint(
+                fields=("article", "language"), name="core_newsarticleterms_article_language"
+            ),
+        ),
+    ]
@@ -72,6 +72,77 @@ class NewsArticle(BaseModel):
         return reverse('core:news_detail', kwargs={'slug': slug})
 
 
+class NewsArticleTerms(models.Model):
+    """
+    Частоти термінів статті для індексу схожих статей (apps/core/related_news.py).
+    Зберігаються, щоб при збереженні однієї статті не розбирати HTML усіх інших.
+    signature - нормалізований TF-IDF вектор (SIGNATURE_TERMS термінів) на момент обчислення.
+    """
+    article = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='term_vectors')
+    language = models.CharField(max_length=2)
+    terms = models.JSONField(default=dict)
+    signature = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = "Терміни статті"
+        verbose_name_plural = "Терміни статей"
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'language'], name='core_newsarticleterms_article_language'),
+        ]
+
+
+class RelatedNewsTerm(models.Model):
+    """Документна частота терміну (скільки опублікованих статей його містять) по мові - для IDF."""
+    language = models.CharField(max_length=2)
+    term = models.CharField(max_length=16)
+    df = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Частота терміну"
+        verbose_name_plural = "Частоти термінів"
+        constraints = [
+            models.UniqueConstraint(fields=['language', 'term'], name='core_relatednewsterm_language_term'),
+        ]
+
+
+class RelatedNewsPosting(models.Model):
+    """
+    Інвертований індекс сигнатур: термін → статті з його вагою.
+    Схожість однієї статті рахується лише по статтях зі спільними термінами.
+    """
+    article = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='term_postings')
+    language = models.CharField(max_length=2)
+    term = models.CharField(max_length=16)
+    weight = models.FloatField()
+
+    class Meta:
+        verbose_name = "Термін сигнатури"
+        verbose_name_plural = "Терміни сигнатур"
+        indexes = [
+            models.Index(fields=['language', 'term']),
+        ]
+
+
+class RelatedNewsArticle(models.Model):
+    """
+    Попередньо обчислені схожі статті: top-k на статтю та мову.
+    news_detail читає їх одним запитом по індексу (article, language, position).
+    """
+    article = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='related_from')
+    language = models.CharField(max_length=2)
+    position = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['article', 'language', 'position']
+        verbose_name = "Схожа стаття"
+        verbose_name_plural = "Схожі статті"
+        indexes = [
+            models.Index(fields=['article', 'language', 'position']),
+        ]
+
+
 # ============================================================================
 # Homepage Content Models
 # ============================================================================
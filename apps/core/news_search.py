@@ -0,0 +1,235 @@
+"""
+Повнотекстовий пошук по NewsArticle (сторінка пошуку новин та admin).
+
+Індексуються title, meta_description та текст з HTML content окремо для кожної
+мови (RU поля з fallback на UK - як у news_detail). Індекс ведеться поза моделлю:
+- PostgreSQL: колонки search_vector_uk/ru (tsvector) з GIN індексами.
+  Конфігурація 'simple' для UK (в PostgreSQL немає української), 'russian' для RU;
+  ваги: title A, description B, content C; ранжування - ts_rank_cd.
+- SQLite: FTS5 таблиця core_newsarticle_search (рядок на статтю та мову), bm25.
+- інші БД: icontains по title/description, сортування за датою.
+
+Індекс оновлюється post_save/post_delete (connect_signals у CoreConfig.ready),
+створюється міграцією 0009_news_search (або rebuild_news_search). Після bulk_create - reindex().
+Токени запиту шукаються як префікси: "англ грам" знаходить "англійська граматика".
+"""
+import html
+import re
+from typing import Iterable, List, Optional
+
+from django.db import connection as default_connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.html import strip_tags
+
+LANGUAGES = ('uk', 'ru')
+MAX_RESULTS = 500
+MAX_QUERY_TOKENS = 8
+
+TABLE = 'core_newsarticle'
+FTS_TABLE = 'core_newsarticle_search'
+PG_CONFIGS = {'uk': 'simple', 'ru': 'russian'}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_SKIP_BLOCKS_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def html_to_text(value: str) -> str:
+    """Текст статті без тегів, скриптів та HTML entities."""
+    text = strip_tags(_SKIP_BLOCKS_RE.sub(' ', value or ''))
+    return ' '.join(html.unescape(text).split())
+
+
+def query_tokens(query: str) -> List[str]:
+    """Слова запиту (лише \\w - безпечно для to_tsquery та FTS5 MATCH)."""
+    return _TOKEN_RE.findall((query or '').lower())[:MAX_QUERY_TOKENS]
+
+
+def document(article, lang: str) -> dict:
+    """Поля для індексу однієї мови (RU - з fallback на UK)."""
+    def field(name):
+        if lang == 'ru':
+            return getattr(article, f'{name}_ru') or getattr(article, f'{name}_uk')
+        return getattr(article, f'{name}_uk')
+
+    return {
+        'title': field('title') or '',
+        'description': field('meta_description') or '',
+        'body': html_to_text(field('content')),
+    }
+
+
+class PostgresBackend:
+    vendor = 'postgresql'
+
+    def install(self, cursor):
+        for lang in LANGUAGES:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector_{lang} tsvector')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {TABLE}_search_{lang}_gin ON {TABLE} USING GIN (search_vector_{lang})'
+            )
+
+    def uninstall(self, cursor):
+        for lang in LANGUAGES:
+            cursor.execute(f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector_{lang}')
+
+    def index(self, cursor, article):
+        assignments, params = [], []
+        for lang in LANGUAGES:
+            doc = document(article, lang)
+            config = PG_CONFIGS[lang]
+            assignments.append(
+                f"search_vector_{lang} = "
+                f"setweight(to_tsvector('{config}', %s), 'A') || "
+                f"setweight(to_tsvector('{config}', %s), 'B') || "
+                f"setweight(to_tsvector('{config}', %s), 'C')"
+            )
+            params.extend([doc['title'], doc['description'], doc['body']])
+        cursor.execute(f'UPDATE {TABLE} SET {", ".join(assignments)} WHERE id = %s', params + [article.pk])
+
+    def remove(self, cursor, pk):
+        # Колонки видаляються разом з рядком статті
+        pass
+
+    def search(self, cursor, tokens, languages, published_only, limit):
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        ranks = [f"ts_rank_cd(search_vector_{lang}, to_tsquery('{PG_CONFIGS[lang]}', %s))" for lang in languages]
+        matches = [f"search_vector_{lang} @@ to_tsquery('{PG_CONFIGS[lang]}', %s)" for lang in languages]
+        rank = ranks[0] if len(ranks) == 1 else f'GREATEST({", ".join(ranks)})'
+        where = f'({" OR ".join(matches)})' + (' AND is_published' if published_only else '')
+        cursor.execute(
+            f'SELECT id FROM {TABLE} WHERE {where} ORDER BY {rank} DESC, published_at DESC LIMIT %s',
+            # limit=None → LIMIT NULL, у PostgreSQL це LIMIT ALL
+            [tsquery] * len(languages) * 2 + [limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class SQLiteBackend:
+    vendor = 'sqlite'
+
+    def install(self, cursor):
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "article_id UNINDEXED, lang UNINDEXED, title, description, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    def uninstall(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+    def index(self, cursor, article):
+        self.remove(cursor, article.pk)
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (article_id, lang, title, description, body) VALUES (%s, %s, %s, %s, %s)',
+            [
+                (article.pk, lang, doc['title'], doc['description'], doc['body'])
+                for lang, doc in ((lang, document(article, lang)) for lang in LANGUAGES)
+            ],
+        )
+
+    def remove(self, cursor, pk):
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE article_id = %s', [pk])
+
+    def search(self, cursor, tokens, languages, published_only, limit):
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        placeholders = ', '.join(['%s'] * len(languages))
+        # bm25() не можна агрегувати (GROUP BY по мовах) - дублікати статті відкидаємо тут
+        cursor.execute(
+            f'SELECT article_id, bm25({FTS_TABLE}, 0, 0, 10.0, 5.0, 1.0) AS score'
+            f' FROM {FTS_TABLE} JOIN {TABLE} a ON a.id = article_id'
+            f' WHERE {FTS_TABLE} MATCH %s AND lang IN ({placeholders})'
+            f'{" AND a.is_published" if published_only else ""}'
+            f' ORDER BY score, a.published_at DESC LIMIT %s',
+            # LIMIT -1 у SQLite - без обмеження
+            [match, *languages, -1 if limit is None else limit * len(languages)],
+        )
+        return list(dict.fromkeys(row[0] for row in cursor.fetchall()))[:limit]
+
+
+BACKENDS = {backend.vendor: backend for backend in (PostgresBackend(), SQLiteBackend())}
+
+
+def get_backend(connection=None):
+    """Бекенд для БД або None (пошук через icontains)."""
+    return BACKENDS.get((connection or default_connection).vendor)
+
+
+def index_article(article) -> None:
+    backend = get_backend()
+    if backend is not None:
+        with default_connection.cursor() as cursor:
+            backend.index(cursor, article)
+
+
+def reindex(articles: Optional[Iterable] = None) -> int:
+    """Переіндексує статті (за замовчуванням - всі); повертає кількість."""
+    from .models import NewsArticle
+
+    if articles is None:
+        articles = NewsArticle.objects.all()
+    count = 0
+    for article in articles.iterator() if hasattr(articles, 'iterator') else articles:
+        index_article(article)
+        count += 1
+    return count
+
+
+def search(query: str, lang: Optional[str] = None, published_only: bool = True,
+           limit: Optional[int] = MAX_RESULTS) -> List[int]:
+    """
+    id статей за релевантністю (найкращі першими).
+
+    lang=None - пошук по обох мовах (admin), limit=None - всі збіги (admin).
+    """
+    from .models import NewsArticle
+
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    languages = [lang] if lang in LANGUAGES else list(LANGUAGES)
+    backend = get_backend()
+    if backend is not None:
+        with default_connection.cursor() as cursor:
+            return backend.search(cursor, tokens, languages, published_only, limit)
+
+    queryset = NewsArticle.objects.all()
+    if published_only:
+        queryset = queryset.filter(is_published=True)
+    for token in tokens:
+        condition = Q()
+        for field_lang in languages:
+            condition |= Q(**{f'title_{field_lang}__icontains': token})
+            condition |= Q(**{f'meta_description_{field_lang}__icontains': token})
+        queryset = queryset.filter(condition)
+    return list(queryset.order_by('-published_at').values_list('pk', flat=True)[:limit])
+
+
+def rank_annotation(ids: List[int]) -> Case:
+    """Позиція статті у результатах search() для order_by (admin); статті поза ids - в кінці."""
+    return Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+        default=Value(len(ids)),
+        output_field=IntegerField(),
+    )
+
+
+def _index_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_article(instance)
+
+
+def _remove_on_delete(sender, instance, **kwargs):
+    backend = get_backend()
+    if backend is not None:
+        with default_connection.cursor() as cursor:
+            backend.remove(cursor, instance.pk)
+
+
+def connect_signals() -> None:
+    """Оновлення індексу при збереженні/видаленні статті (CoreConfig.ready)."""
+    from django.db.models.signals import post_delete, post_save
+
+    from .models import NewsArticle
+
+    post_save.connect(_index_on_save, sender=NewsArticle, dispatch_uid='news_search_save')
+    post_delete.connect(_remove_on_delete, sender=NewsArticle, dispatch_uid='news_search_delete')
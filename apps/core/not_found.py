@@ -0,0 +1,178 @@
+"""
+Швидкий шлях для 404: negative cache, легка 404 сторінка та top-N трекер.
+
+`<slug:city>` в кінці URLconf ловить будь-який невідомий односегментний URL,
+тож сканери та боти щоразу проходять resolve, sessions/locale/CSRF та view.
+Промахи статичних маршрутів (міста, програми, школи з seo_config) не змінюються
+без деплою, тому повторні запити до них віддаються з negative cache ще у
+FrontDoorMiddleware готовою 404 відповіддю.
+"""
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponseNotFound
+from django.template.loader import render_to_string
+from django.utils import translation
+
+from .utils.background import background_tasks
+
+# Тексти легкої 404 сторінки (без context processors, base.html та запитів до БД)
+NOT_FOUND_TEXT: Dict[str, Dict[str, str]] = {
+    'uk': {
+        'title': 'Сторінку не знайдено',
+        'message': 'Сторінка, яку ви шукаєте, не існує або була переміщена.',
+        'home': 'На головну',
+        'programs': 'Програми навчання',
+        'home_url': '/',
+        'programs_url': '/programs/',
+    },
+    'ru': {
+        'title': 'Страница не найдена',
+        'message': 'Страница, которую вы ищете, не существует или была перемещена.',
+        'home': 'На главную',
+        'programs': 'Программы обучения',
+        'home_url': '/ru/',
+        'programs_url': '/ru/programs/',
+    },
+}
+
+
+class NegativeCache:
+    """
+    Обмежений LRU шляхів, що нещодавно повернули 404 (на процес).
+
+    TTL страхує від застарілих записів, якщо дані маршруту все ж змінились.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, path: str) -> None:
+        with self._lock:
+            self._entries[path] = time.monotonic() + self.ttl
+            self._entries.move_to_end(path)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, path: str) -> bool:
+        expires = self._entries.get(path)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            with self._lock:
+                self._entries.pop(path, None)
+            return False
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NotFoundTracker:
+    """
+    Top-N 404 шляхів: семплінг у пам'яті, періодичний запис у logs/not_found.log.
+
+    Кожен запис у лозі - один шлях з оцінкою кількості звернень за інтервал
+    (лічильник семплу / sample_rate). Лог читає `suggest_redirects`.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, flush_interval: float = 300,
+                 top_n: int = 50, max_tracked: int = 5000):
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.top_n = top_n
+        self.max_tracked = max_tracked
+        self.log_file = Path(settings.BASE_DIR) / 'logs' / 'not_found.log'
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, path: str) -> None:
+        """Враховує 404 (< 1ms, запис на диск - у фоновій черзі)."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+            if len(self._counts) > self.max_tracked:
+                # Space-saving: лишаємо найчастіші, рідкісні сканерні шляхи відкидаємо
+                self._counts = dict(self._top(self.max_tracked // 2))
+            if time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            snapshot = self._top(self.top_n)
+            self._counts = {}
+            self._last_flush = time.monotonic()
+        background_tasks.submit(self._write, snapshot)
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Поточний top (оцінка звернень з урахуванням семплінгу)."""
+        with self._lock:
+            return [(path, self._estimate(count)) for path, count in self._top(limit or self.top_n)]
+
+    def flush(self) -> None:
+        """Примусовий запис (для тестів та graceful shutdown)."""
+        with self._lock:
+            snapshot = self._top(self.top_n)
+            self._counts = {}
+            self._last_flush = time.monotonic()
+        self._write(snapshot)
+
+    def _top(self, limit: int) -> List[Tuple[str, int]]:
+        return sorted(self._counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def _estimate(self, count: int) -> int:
+        return round(count / self.sample_rate) if self.sample_rate else count
+
+    def _write(self, snapshot: List[Tuple[str, int]]) -> None:
+        if not snapshot:
+            return
+        timestamp = datetime.utcnow().isoformat()
+        self.log_file.parent.mkdir(exist_ok=True)
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            for path, count in snapshot:
+                f.write(json.dumps({
+                    'timestamp': timestamp,
+                    'path': path,
+                    'hits': self._estimate(count),
+                }, ensure_ascii=False) + '\n')
+
+
+@lru_cache(maxsize=None)
+def render_lite_404(language: str) -> bytes:
+    """Легка 404 сторінка, відрендерена один раз на мову."""
+    text = NOT_FOUND_TEXT.get(language) or NOT_FOUND_TEXT[settings.LANGUAGE_CODE]
+    with translation.override(language):
+        return render_to_string('core/404_lite.html', {'language': language, **text}).encode('utf-8')
+
+
+def lite_404_response(path: str) -> HttpResponseNotFound:
+    """404 відповідь для мови з префікса шляху (LocaleMiddleware ще не відпрацював)."""
+    language = translation.get_language_from_path(path) or settings.LANGUAGE_CODE
+    response = HttpResponseNotFound(render_lite_404(language), content_type='text/html; charset=utf-8')
+    response['Content-Language'] = language
+    return response
+
+
+# Singletons
+negative_cache = NegativeCache(
+    maxsize=getattr(settings, 'NOT_FOUND_CACHE_SIZE', 2048),
+    ttl=getattr(settings, 'NOT_FOUND_CACHE_TTL', 600),
+)
+not_found_tracker = NotFoundTracker(
+    sample_rate=getattr(settings, 'NOT_FOUND_SAMPLE_RATE', 1.0),
+    flush_interval=getattr(settings, 'NOT_FOUND_FLUSH_INTERVAL', 300),
+)
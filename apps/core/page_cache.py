@@ -0,0 +1,333 @@
+"""
+Повносторінковий кеш для анонімних GET запитів.
+
+Сторінки однакові для всіх анонімних відвідувачів, тому готовий HTML
+зберігається в кеші (alias PAGE_CACHE_ALIAS) та віддається ще до sessions,
+locale, context processors і view.
+
+Ключ: схема + host + мова + шлях + значущі query параметри (?page=).
+UTM/click-id параметри ігноруються, будь-які інші - кеш не використовується.
+
+CSRF токен у збереженому HTML замінюється плейсхолдером, а при віддачі -
+свіжим токеном для конкретного відвідувача (з установкою csrftoken cookie).
+
+Разом з HTML зберігаються стиснуті варіанти (apps.core.compression): gzip частинами
+між плейсхолдерами та brotli для сторінок без токена. Варіант обирається за
+Accept-Encoding, тож влучання в кеш не стискає сторінку заново.
+
+Інвалідація - через версії тегів: кожен запис пам'ятає версії своїх тегів
+(view:<url name>, all, seo_config), зміна моделі підвищує версії лише залежних тегів.
+Версії тегів лежать в окремому кеші (PAGE_CACHE_TAGS_ALIAS): кілька ключів ніколи
+не доходять до cull, тож інвалідація не губиться при витісненні сторінок.
+"""
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.middleware.csrf import CSRF_ALLOWED_CHARS, CSRF_SECRET_LENGTH, get_token
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+
+from . import compression
+from .instrumentation import record_cache
+
+# Query параметри, від яких залежить вміст сторінки
+CACHE_QUERY_PARAMS = frozenset({'page'})
+
+# Рекламні параметри: не впливають на сторінку, кеш працює і для кампаній
+IGNORED_QUERY_PREFIXES = ('utm_',)
+IGNORED_QUERY_PARAMS = frozenset({'gclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'yclid', '_ga', '_gl'})
+
+# Залежності сторінок від моделей: 'app.Model' → url names (ALL - всі сторінки)
+ALL = 'all'
+MODEL_DEPENDENCIES: Dict[str, Iterable[str]] = {
+    'core.NewsArticle': ['core:news_list', 'core:news_detail'],
+    'core.Achievement': ['core:index'],
+    'core.Advantage': ['core:index'],
+    'core.AdvantageItem': ['core:index'],
+    'core.CourseCategory': ['core:index'],
+    'core.Course': ['core:index'],
+    'core.Testimonial': ['core:index', 'core:feedback'],
+    'core.FAQ': ['core:faq'],
+    'core.ContactInfo': ['core:contacts'],
+    # Бігуча стрічка - context processor, є на кожній сторінці
+    'core.RunningLineText': [ALL],
+}
+
+# Сторінки, зібрані з apps/core/seo_config.py
+SEO_CONFIG_VIEWS = frozenset({
+    'core:index', 'core:programs_list', 'core:program_detail', 'core:school_location',
+    'core:city_page', 'core:kids_learning_page', 'core:premium_learning_page',
+})
+
+CSRF_PLACEHOLDER = '__PAGE_CACHE_CSRF_TOKEN__'
+_CSRF_CANDIDATE_RE = re.compile(r'(?<![A-Za-z0-9])[A-Za-z0-9]{64}(?![A-Za-z0-9])')
+
+# Заголовки, які не зберігаємо (формуються заново при віддачі)
+_SKIP_HEADERS = frozenset({'set-cookie', 'content-length', 'date'})
+
+
+def _seo_config_fingerprint() -> str:
+    source = Path(__file__).with_name('seo_config.py')
+    try:
+        return hashlib.md5(source.read_bytes()).hexdigest()[:12]
+    except OSError:
+        return ''
+
+
+SEO_CONFIG_FINGERPRINT = _seo_config_fingerprint()
+
+
+# Версія тегу, який ще не інвалідовувався (prerender порівнює версії з built_at)
+INITIAL_TAG_VERSION = 0
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def get_tag_cache():
+    """Кеш версій тегів - окремо від сторінок, щоб cull сторінок не видаляв теги."""
+    return caches[getattr(settings, 'PAGE_CACHE_TAGS_ALIAS', 'default')]
+
+
+def _tag_key(tag: str) -> str:
+    return f'pagecache:tag:{tag}'
+
+
+def tag_versions(tags) -> dict:
+    """Поточні версії тегів (ключ тегу → версія); ключі без версії у відповіді відсутні."""
+    return get_tag_cache().get_many([_tag_key(tag) for tag in tags])
+
+
+def purge_tags(*tags: str) -> None:
+    """Інвалідує всі записи з цими тегами (нова версія тегу)."""
+    get_tag_cache().set_many({_tag_key(tag): time.time_ns() for tag in tags}, None)
+
+
+def purge_views(*view_names: str) -> None:
+    """Інвалідує сторінки за url name ('core:index') або всі (ALL)."""
+    purge_tags(*[ALL if name == ALL else f'view:{name}' for name in view_names])
+
+
+def purge_for_model(sender, **kwargs) -> None:
+    """post_save/post_delete receiver: інвалідує сторінки, залежні від моделі."""
+    view_names = MODEL_DEPENDENCIES.get(sender._meta.label)
+    if view_names:
+        purge_views(*view_names)
+
+
+def connect_signals() -> None:
+    """Підключає інвалідацію до моделей з MODEL_DEPENDENCIES (CoreConfig.ready)."""
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    for label in MODEL_DEPENDENCIES:
+        model = apps.get_model(label)
+        post_save.connect(purge_for_model, sender=model, dispatch_uid=f'page_cache_{label}_save')
+        post_delete.connect(purge_for_model, sender=model, dispatch_uid=f'page_cache_{label}_delete')
+
+
+def cache_key_for(request) -> Optional[str]:
+    """
+    Ключ сторінки або None, якщо запит не кешується.
+
+    Кешуються лише анонімні GET/HEAD без сесії, повідомлень та авторизації.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    if settings.SESSION_COOKIE_NAME in request.COOKIES or 'messages' in request.COOKIES:
+        return None
+    if 'HTTP_AUTHORIZATION' in request.META:
+        return None
+
+    params = []
+    for name, values in request.GET.lists():
+        if name in CACHE_QUERY_PARAMS:
+            params.extend(f'{name}={value}' for value in values)
+        elif name in IGNORED_QUERY_PARAMS or name.startswith(IGNORED_QUERY_PREFIXES):
+            continue
+        else:
+            return None
+
+    language = translation.get_language_from_path(request.path_info) or settings.LANGUAGE_CODE
+    raw = '|'.join([
+        request.scheme, request.get_host(), language, request.path, '&'.join(sorted(params)),
+    ])
+    return 'pagecache:page:' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+# Url names, що мають власний тег (інші сторінки залежать лише від ALL)
+DEPENDENT_VIEWS = frozenset(
+    name for names in MODEL_DEPENDENCIES.values() for name in names if name != ALL
+)
+_ALL_TAG_KEYS = [_tag_key(ALL)] + [_tag_key(f'view:{name}') for name in sorted(DEPENDENT_VIEWS)]
+
+
+def _tags_for(view_name: str) -> list:
+    return [ALL, f'view:{view_name}'] if view_name in DEPENDENT_VIEWS else [ALL]
+
+
+def snapshot_versions() -> dict:
+    """
+    Версії всіх тегів ДО рендеру сторінки.
+
+    Якщо модель зміниться під час рендеру, запис отримає стару версію тегу
+    і не буде віддаватись.
+    """
+    cache = get_tag_cache()
+    versions = cache.get_many(_ALL_TAG_KEYS)
+    missing = [key for key in _ALL_TAG_KEYS if versions.get(key) is None]
+    if missing:
+        # Запис ніколи не зберігає None: відсутній тег засіваємо (add не перезапише purge з іншого worker)
+        for key in missing:
+            cache.add(key, INITIAL_TAG_VERSION, None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+def csrf_secret_from_token(token: str) -> str:
+    """
+    Секрет замаскованого CSRF токена (алгоритм django.middleware.csrf).
+
+    Публічного API для цього в Django немає, а приватна _unmask_cipher_token може
+    змінитись - маскування повторено на публічних константах, сумісність з поточною
+    версією Django перевіряє test_page_cache.test_csrf_secret_matches_django.
+    """
+    mask, cipher = token[:CSRF_SECRET_LENGTH], token[CSRF_SECRET_LENGTH:]
+    return ''.join(
+        CSRF_ALLOWED_CHARS[CSRF_ALLOWED_CHARS.index(x) - CSRF_ALLOWED_CHARS.index(y)]
+        for x, y in zip(cipher, mask)
+    )
+
+
+def _strip_csrf(body: str, request) -> str:
+    """Замінює CSRF токени цього запиту плейсхолдером."""
+    secret = request.META.get('CSRF_COOKIE')
+    if not secret:
+        return body
+
+    def replace(match):
+        token = match.group(0)
+        return CSRF_PLACEHOLDER if csrf_secret_from_token(token) == secret else token
+
+    return _CSRF_CANDIDATE_RE.sub(replace, body)
+
+
+def store(request, response, key: str, versions: dict) -> bool:
+    """
+    Зберігає відповідь, якщо вона однакова для всіх анонімних відвідувачів.
+
+    versions - результат snapshot_versions() до виклику view.
+    """
+    if request.method != 'GET' or response.status_code != 200 or response.streaming:
+        return False
+    if not response.get('Content-Type', '').startswith('text/html'):
+        return False
+    if 'private' in response.get('Cache-Control', '') or 'no-store' in response.get('Cache-Control', ''):
+        return False
+    # Сесію читали/змінювали або поставили інші cookies - сторінка персональна
+    session = getattr(request, 'session', None)
+    if session is not None and session.accessed:
+        return False
+    if any(name != settings.CSRF_COOKIE_NAME for name in response.cookies):
+        return False
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return False
+
+    charset = response.charset or 'utf-8'
+    body = _strip_csrf(response.content.decode(charset), request)
+    tags = _tags_for(match.view_name)
+    versions = {tag: versions.get(_tag_key(tag)) for tag in tags}
+    if any(version is None for version in versions.values()):
+        return False
+
+    entry = {
+        'status': response.status_code,
+        'headers': [(name, value) for name, value in response.items() if name.lower() not in _SKIP_HEADERS],
+        'body': body,
+        'charset': charset,
+        'view_name': match.view_name,
+        'tags': versions,
+        'seo_config': SEO_CONFIG_FINGERPRINT if match.view_name in SEO_CONFIG_VIEWS else None,
+    }
+    if not response.has_header('Content-Encoding'):
+        entry.update(_compressed_variants(body, charset))
+    get_cache().set(key, entry, getattr(settings, 'PAGE_CACHE_TIMEOUT', 600))
+    return True
+
+
+def _compressed_variants(body: str, charset: str) -> dict:
+    """gzip частини між плейсхолдерами та brotli (лише без CSRF токена)."""
+    raw = body.encode(charset)
+    if len(raw) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+        return {}
+    segments = raw.split(CSRF_PLACEHOLDER.encode(charset))
+    variants = {'gzip': compression.precompress_segments(segments)}
+    if len(segments) == 1:
+        variants['br'] = compression.precompress_brotli(raw)
+    return variants
+
+
+def lookup(key: str) -> Optional[dict]:
+    """Запис кешу, якщо жоден з його тегів не інвалідовано."""
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is not None:
+        current = tag_versions(entry['tags'])
+        # Відсутній тег (кеш тегів очищено) - версію не перевірити, запис вважаємо застарілим
+        if any(current.get(_tag_key(tag)) is None or current[_tag_key(tag)] != version
+               for tag, version in entry['tags'].items()):
+            entry = None
+        elif entry['seo_config'] is not None and entry['seo_config'] != SEO_CONFIG_FINGERPRINT:
+            entry = None
+    record_cache('page', entry is not None)
+    return entry
+
+
+def serve(request, entry: dict, csrf_middleware) -> HttpResponse:
+    """
+    Відповідь із запису кешу зі свіжим CSRF токеном.
+
+    csrf_middleware - екземпляр CsrfViewMiddleware: читає csrftoken cookie
+    відвідувача та ставить його, якщо токен новий.
+    """
+    body = entry['body']
+    token = ''
+    if CSRF_PLACEHOLDER in body:
+        csrf_middleware.process_request(request)
+        token = get_token(request)
+
+    encoding = None
+    if 'gzip' in entry:
+        encoding = compression.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), 'br' in entry)
+
+    if request.method == 'HEAD':
+        content = b''
+    elif encoding == 'br':
+        content = entry['br']
+    elif encoding == 'gzip':
+        charset = entry['charset']
+        segments = body.encode(charset).split(CSRF_PLACEHOLDER.encode(charset))
+        content = compression.assemble_gzip(segments, entry['gzip'], token.encode(charset))
+    else:
+        content = body.replace(CSRF_PLACEHOLDER, token).encode(entry['charset'])
+
+    response = HttpResponse(content, status=entry['status'])
+    for name, value in entry['headers']:
+        response[name] = value
+    if 'gzip' in entry:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(content))
+    response['X-Page-Cache'] = 'HIT'
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        response = csrf_middleware.process_response(request, response)
+    return response
@@ -0,0 +1,276 @@
+"""
+Статичний пре-рендер (SSG) сторінок, зібраних з констант views.py та seo_config.
+
+Заглушки, about, job, shares, школи, міста та програми однакові для всіх
+відвідувачів і змінюються лише з деплоєм. `manage.py prerender_pages` (build.sh)
+рендерить їх для кожної мови у PRERENDER_DIR, а PageCacheMiddleware віддає
+готовий HTML з пам'яті процесу - без view, context processors та БД.
+
+Форми: CSRF токен у файлах замінено плейсхолдером кешу сторінок, при віддачі
+підставляється токен відвідувача (page_cache.serve), стиснуті варіанти - ті самі.
+
+Актуальність:
+- manifest містить відбиток seo_config.py, views.py, шаблонів та static manifest;
+  при розбіжності з кодом процесу файли ігноруються (сторінки рендеряться як звичайно)
+  до наступного `prerender_pages`;
+- зміна моделей (бігуча стрічка) підвищує версії тегів кешу сторінок - сторінки,
+  зібрані раніше, віддаються динамічно.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.urls import reverse
+from django.utils import translation
+
+from . import page_cache
+from .instrumentation import record_cache
+from .seo_config import CITIES, LOCATIONS, PROGRAMS
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Сторінки без параметрів
+PRERENDER_VIEWS = [
+    'core:about',
+    'core:job',
+    'core:shares',
+    'core:golovna_3_stub',
+    'core:glavnaya_stranicza_stub',
+    'core:summer_camp_2021_stub',
+    'core:sertyfikat_stub',
+    'core:shares_detail_stub',
+    'core:programma_loyalnosty_stub',
+    'core:buy_stub',
+    'core:dogovir_stub',
+]
+
+# Сторінки з параметром: url name → (kwarg, дані з seo_config)
+PRERENDER_DYNAMIC_VIEWS = {
+    'core:program_detail': ('slug', PROGRAMS),
+    'core:school_location': ('slug', LOCATIONS),
+    'core:city_page': ('city', CITIES),
+}
+
+
+def get_prerender_dir() -> Path:
+    return Path(getattr(settings, 'PRERENDER_DIR', Path(settings.BASE_DIR) / 'prerendered'))
+
+
+def prerender_paths() -> List[str]:
+    """Шляхи сторінок для пре-рендеру (всі мови)."""
+    paths = []
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            paths.extend(reverse(name) for name in PRERENDER_VIEWS)
+            for name, (kwarg, data) in PRERENDER_DYNAMIC_VIEWS.items():
+                paths.extend(reverse(name, kwargs={kwarg: slug}) for slug in data)
+    return list(dict.fromkeys(paths))
+
+
+def _template_dirs() -> List[Path]:
+    dirs = []
+    for engine in settings.TEMPLATES:
+        dirs.extend(Path(path) for path in engine.get('DIRS', []))
+        if engine.get('APP_DIRS'):
+            dirs.extend(
+                Path(config.path) / 'templates' for config in apps.get_app_configs()
+                if (Path(config.path) / 'templates').is_dir()
+            )
+    return dirs
+
+
+def _source_files() -> Iterable[Path]:
+    core_dir = Path(__file__).parent
+    yield core_dir / 'seo_config.py'
+    yield core_dir / 'views.py'
+    for template_dir in _template_dirs():
+        # Шаблони Django admin не впливають на сторінки сайту
+        if 'django' in template_dir.parts:
+            continue
+        yield from sorted(template_dir.rglob('*.html'))
+    # Хешовані імена статики в HTML (ManifestStaticFilesStorage, build_assets)
+    yield Path(settings.STATIC_ROOT) / 'staticfiles.json'
+    yield Path(settings.BASE_DIR) / 'static' / 'dist' / 'manifest.json'
+
+
+def source_fingerprint() -> str:
+    """Відбиток коду та шаблонів, з яких зібрано сторінки."""
+    digest = hashlib.md5()
+    for path in _source_files():
+        try:
+            content = path.read_bytes()
+        except OSError:
+            continue
+        digest.update(str(path.relative_to(settings.BASE_DIR) if path.is_relative_to(settings.BASE_DIR)
+                          else path).encode('utf-8'))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def _file_name(path: str) -> str:
+    """'/' → index.html, '/shares/' → shares/index.html, '/ru/about' → ru/about.html."""
+    name = path.strip('/')
+    if not name:
+        return 'index.html'
+    return f'{name}/index.html' if path.endswith('/') else f'{name}.html'
+
+
+def build(output_dir: Path, host: str, secure: bool, paths: Optional[List[str]] = None) -> dict:
+    """
+    Рендерить сторінки через Django test client та записує HTML + manifest.
+
+    Кеш сторінок і вже зібрані файли вимикаються, щоб рендер був свіжим.
+
+    Returns:
+        manifest (pages - лише успішно відрендерені сторінки, errors - решта)
+    """
+    from django.test import Client, override_settings
+
+    paths = paths if paths is not None else prerender_paths()
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'built_at': time.time_ns(),
+        'fingerprint': source_fingerprint(),
+        'host': host,
+        'secure': secure,
+        'pages': {},
+        'errors': {},
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with override_settings(PAGE_CACHE_ENABLED=False, PRERENDER_ENABLED=False):
+        client = Client(HTTP_HOST=host, raise_request_exception=False)
+        for path in paths:
+            response = client.get(path, secure=secure)
+            if response.status_code != 200 or response.streaming:
+                manifest['errors'][path] = response.status_code
+                continue
+            if not response.get('Content-Type', '').startswith('text/html') or response.cookies.keys() - {
+                settings.CSRF_COOKIE_NAME
+            }:
+                manifest['errors'][path] = 'personalized'
+                continue
+
+            charset = response.charset or 'utf-8'
+            body = page_cache._strip_csrf(response.content.decode(charset), response.wsgi_request)
+            file_name = _file_name(path)
+            target = output_dir / file_name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(body, encoding=charset)
+            manifest['pages'][path] = {
+                'file': file_name,
+                'view_name': response.resolver_match.view_name,
+                'charset': charset,
+                'headers': [
+                    (name, value) for name, value in response.items()
+                    if name.lower() not in page_cache._SKIP_HEADERS
+                ],
+            }
+
+    # Manifest останнім і атомарно: workers не побачать напівзібраний набір
+    tmp_manifest = output_dir / f'{MANIFEST_NAME}.tmp'
+    tmp_manifest.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding='utf-8')
+    os.replace(tmp_manifest, output_dir / MANIFEST_NAME)
+    return manifest
+
+
+def read_manifest(output_dir: Path) -> Optional[dict]:
+    try:
+        manifest = json.loads((output_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+class PrerenderedPages:
+    """
+    Зібрані сторінки в пам'яті процесу.
+
+    Manifest читається при першому запиті; HTML та стиснуті варіанти кожної
+    сторінки - при першому зверненні до неї.
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None):
+        self.configured_dir = output_dir
+        self.output_dir: Optional[Path] = None
+        self._manifest: Optional[dict] = None
+        self._loaded = False
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Optional[dict]:
+        with self._lock:
+            if self._loaded:
+                return self._manifest
+            output_dir = self.configured_dir or get_prerender_dir()
+            manifest = read_manifest(output_dir)
+            if manifest is not None and manifest['fingerprint'] != source_fingerprint():
+                logger.warning('Prerendered pages in %s are outdated, run prerender_pages', output_dir)
+                manifest = None
+            self.output_dir = output_dir
+            self._manifest = manifest
+            self._loaded = True
+            return manifest
+
+    def reset(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._manifest = None
+            self._entries = {}
+            self.output_dir = None
+
+    def lookup(self, request) -> Optional[dict]:
+        """
+        Запис у форматі кешу сторінок (для page_cache.serve) або None.
+
+        Виклик лише для запитів, які пройшли page_cache.cache_key_for.
+        """
+        manifest = self._manifest if self._loaded else self._load()
+        if manifest is None or 'page' in request.GET:
+            return None
+        page = manifest['pages'].get(request.path)
+        if page is None:
+            return None
+        if request.get_host() != manifest['host'] or request.is_secure() != manifest['secure']:
+            return None
+        if self._is_stale(page['view_name'], manifest['built_at']):
+            return None
+
+        entry = self._entries.get(request.path)
+        if entry is None:
+            entry = self._entries[request.path] = self._build_entry(page)
+        record_cache('prerender', True)
+        return entry
+
+    def _is_stale(self, view_name: str, built_at: int) -> bool:
+        """Модель, від якої залежить сторінка, змінилась після збирання."""
+        # snapshot_versions засіває відсутні теги, тож версія є завжди (0 - змін ще не було)
+        versions = page_cache.snapshot_versions()
+        return any(versions[page_cache._tag_key(tag)] > built_at for tag in page_cache._tags_for(view_name))
+
+    def _build_entry(self, page: dict) -> dict:
+        charset = page['charset']
+        body = (self.output_dir / page['file']).read_text(encoding=charset)
+        entry = {
+            'status': 200,
+            'headers': [tuple(header) for header in page['headers']],
+            'body': body,
+            'charset': charset,
+            'view_name': page['view_name'],
+        }
+        entry.update(page_cache._compressed_variants(body, charset))
+        return entry
+
+
+# Singleton
+prerendered_pages = PrerenderedPages()
@@ -0,0 +1,94 @@
+"""
+Форми SQL запитів та пошук N+1 у межах одного запиту.
+
+sql_shape() прибирає з SQL значення (рядки, числа, списки IN), тож запити
+`WHERE id = 1`, `WHERE id = 2`, ... мають одну форму. Якщо одна форма
+повторюється кілька разів за запит - це майже завжди цикл
+у шаблоні чи view без select_related/prefetch_related.
+
+Використання:
+- NPlusOneMiddleware (apps.core.middleware) - у розробці пише попередження
+  в лог apps.core.query_budget (NPLUSONE_DETECTION, поріг NPLUSONE_THRESHOLD);
+- QueryBudgetMixin (apps/core/tests/query_budget.py) - бюджети запитів у тестах.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|\?')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+
+_recorder: ContextVar[Optional['QueryRecorder']] = ContextVar('speakup_query_recorder', default=None)
+
+
+def sql_shape(sql: str) -> str:
+    """SQL без значень: однакова форма для запитів, що різняться лише параметрами."""
+    shape = _STRING_RE.sub('?', sql)
+    shape = _NUMBER_RE.sub('?', shape)
+    shape = _PLACEHOLDER_RE.sub('?', shape)
+    shape = _IN_LIST_RE.sub('IN (...)', shape)
+    return _SPACE_RE.sub(' ', shape).strip()
+
+
+class QueryRecorder:
+    """Форми всіх SQL запитів, виконаних поки recorder активний."""
+
+    def __init__(self):
+        self.shapes: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        return sum(self.shapes.values())
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Форми, що повторились threshold+ разів (найчастіші першими)."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def _record_wrapper(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.shapes[sql_shape(sql)] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_wrapper(sender=None, connection=None, **kwargs):
+    if _record_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_wrapper)
+
+
+def install() -> None:
+    """Встановлює execute_wrapper на всі з'єднання (поточні та майбутні)."""
+    connection_created.connect(_install_wrapper, dispatch_uid='query_budget_wrapper')
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection=connection)
+
+
+@contextmanager
+def record_queries():
+    """Context manager: QueryRecorder для коду всередині (ContextVar - працює і з async views)."""
+    install()
+    recorder = QueryRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def format_report(recorder: QueryRecorder, threshold: int) -> str:
+    lines = [f'{recorder.count} queries, repeated shapes:']
+    for shape, count in recorder.repeated(threshold):
+        lines.append(f'  {count}x {shape[:300]}')
+    return '\n'.join(lines)
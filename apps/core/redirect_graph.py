@@ -0,0 +1,225 @@
+"""
+Компіляція графа редиректів: REDIRECTS + URLconf + нормалізація slash.
+
+Кожне правило REDIRECTS розгортається до кінцевої адреси, яку реально віддасть сайт,
+з урахуванням інших правил, trailing slash fallback у FrontDoorMiddleware та
+APPEND_SLASH у CommonMiddleware. Результат - таблиця "джерело → кінцева адреса",
+тож кожен старий URL коштує рівно один 301.
+
+Для кожного UK правила автоматично додаються варіанти з мовними префіксами
+i18n_patterns (/ru/...), тож RU трафік зі старих URL отримує той самий один 301.
+
+Цикли - помилка конфігурації (RedirectCycleError при старті процесу та в
+`manage.py compile_redirects`). Решта проблем потрапляє у звіт.
+"""
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import LocalePrefixPattern, Resolver404, URLResolver, get_resolver, resolve, translate_url
+from django.utils import translation
+
+from .redirects import REDIRECTS
+from .seo_config import CITIES, LOCATIONS, PROGRAMS
+
+logger = logging.getLogger(__name__)
+
+# Динамічні маршрути, які віддають 404 для невідомих slug (view_name → (kwarg, дані))
+DYNAMIC_ROUTES = {
+    'core:city_page': ('city', CITIES),
+    'core:program_detail': ('slug', PROGRAMS),
+    'core:school_location': ('slug', LOCATIONS),
+}
+
+# Маршрути з даними в БД: при компіляції існування сторінки не перевірити
+DATABASE_ROUTES = frozenset({'core:news_detail'})
+
+# Захист від нескінченного обходу (цикли ловляться раніше)
+MAX_HOPS = 20
+
+# Результат резолву шляху
+PAGE = 'page'        # існуюча сторінка
+DATABASE = 'database'  # сторінка з БД (вважаємо існуючою для цілей редиректу)
+MISS = 'miss'        # збіг з динамічним маршрутом, але slug невідомий → 404
+NO_ROUTE = None      # жоден маршрут не підходить
+
+
+class RedirectCycleError(ImproperlyConfigured):
+    """REDIRECTS (разом з нормалізацією slash) утворюють цикл."""
+
+
+@dataclass
+class RedirectIssue:
+    """Запис звіту компіляції."""
+    kind: str  # chain, dead_target, shadowed_route
+    source: str
+    detail: str
+
+
+@dataclass
+class CompiledRedirects:
+    """Сплощена таблиця редиректів та звіт компіляції."""
+    table: Dict[str, str] = field(default_factory=dict)
+    issues: List[RedirectIssue] = field(default_factory=list)
+
+    def issues_of(self, kind: str) -> List[RedirectIssue]:
+        return [issue for issue in self.issues if issue.kind == kind]
+
+
+def resolve_path(path: str) -> Optional[str]:
+    """
+    Визначає, що URLconf зробить з шляхом.
+
+    Мовний префікс (/ru/) активує відповідну мову, як це робить LocaleMiddleware,
+    бо i18n_patterns резолвить префікс лише для активної мови.
+    """
+    language = translation.get_language_from_path(path) or settings.LANGUAGE_CODE
+    with translation.override(language):
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return NO_ROUTE
+
+    if match.view_name in DATABASE_ROUTES:
+        return DATABASE
+    dynamic = DYNAMIC_ROUTES.get(match.view_name)
+    if dynamic:
+        kwarg, known = dynamic
+        if match.kwargs.get(kwarg) not in known:
+            return MISS
+    return PAGE
+
+
+def _lookup(path: str, redirects: Dict[str, str]) -> Optional[str]:
+    """Та сама логіка, що й FrontDoorMiddleware.find_redirect."""
+    new_url = redirects.get(path)
+    if new_url is None and path != '/' and path.endswith('/'):
+        new_url = redirects.get(path.rstrip('/'))
+    return new_url
+
+
+def next_hop(path: str, redirects: Dict[str, str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Наступний редирект, який отримає клієнт на цьому шляху.
+
+    Returns:
+        (наступна адреса або None якщо це кінцева точка, резолв кінцевої точки)
+    """
+    new_url = _lookup(path, redirects)
+    if new_url is not None:
+        return new_url, None
+
+    # Зовнішні/абсолютні адреси не аналізуємо
+    if not path.startswith('/'):
+        return None, PAGE
+
+    resolved = resolve_path(path)
+    if resolved is NO_ROUTE and settings.APPEND_SLASH and not path.endswith('/'):
+        # CommonMiddleware додає slash лише якщо шлях не резолвиться взагалі
+        if resolve_path(path + '/') is PAGE:
+            return path + '/', None
+    return None, resolved
+
+
+def language_prefixes() -> List[Tuple[str, str]]:
+    """
+    Мови з URL префіксом згідно з i18n_patterns у ROOT_URLCONF.
+
+    Returns:
+        [(код мови, '/ru'), ...] - без мови за замовчуванням, якщо prefix_default_language=False
+    """
+    for pattern in get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver) and isinstance(pattern.pattern, LocalePrefixPattern):
+            prefix_default = pattern.pattern.prefix_default_language
+            return [
+                (code, f'/{code}')
+                for code, _name in settings.LANGUAGES
+                if prefix_default or code != settings.LANGUAGE_CODE
+            ]
+    return []
+
+
+def with_language_variants(redirects: Dict[str, str]) -> Dict[str, str]:
+    """
+    Додає до UK правил варіанти з мовними префіксами.
+
+    '/courses/' → '/programs/' дає '/ru/courses/' → '/ru/programs/'. Ціль перекладається
+    через translate_url, тож адреси поза i18n_patterns (/sitemap.xml) лишаються без префікса.
+    Явні правила та існуючі сторінки мають пріоритет над згенерованими варіантами.
+    """
+    prefixes = language_prefixes()
+    expanded = dict(redirects)
+    for code, prefix in prefixes:
+        for source, target in redirects.items():
+            # Правила, що вже мають мовний префікс, не розмножуємо
+            if any(source == p or source.startswith(p + '/') for _code, p in prefixes):
+                continue
+            variant = prefix + source
+            if variant in expanded or resolve_path(variant) in (PAGE, DATABASE):
+                continue
+            with translation.override(settings.LANGUAGE_CODE):
+                expanded[variant] = translate_url(target, code)
+    return expanded
+
+
+def compile_redirects(redirects: Optional[Dict[str, str]] = None) -> CompiledRedirects:
+    """
+    Розгортає всі ланцюжки до однієї адреси.
+
+    За замовчуванням компілює REDIRECTS разом з мовними варіантами.
+
+    Raises:
+        RedirectCycleError: якщо хоча б одне правило зациклюється
+    """
+    redirects = with_language_variants(REDIRECTS) if redirects is None else redirects
+    compiled = CompiledRedirects()
+    cycles = []
+
+    for source, target in redirects.items():
+        if source.startswith('/') and resolve_path(source) is PAGE:
+            compiled.issues.append(RedirectIssue(
+                'shadowed_route', source, 'джерело редиректу є існуючою сторінкою'
+            ))
+
+        hops = [source, target]
+        resolved = None
+        cycle = False
+        while True:
+            following, resolved = next_hop(hops[-1], redirects)
+            if following is None:
+                break
+            hops.append(following)
+            if following in hops[:-1] or len(hops) > MAX_HOPS:
+                cycle = True
+                break
+
+        if cycle:
+            cycles.append(' → '.join(hops))
+            continue
+
+        current = hops[-1]
+        compiled.table[source] = current
+        if len(hops) > 2:
+            compiled.issues.append(RedirectIssue('chain', source, ' → '.join(hops)))
+        if resolved not in (PAGE, DATABASE):
+            compiled.issues.append(RedirectIssue(
+                'dead_target', source, f'{current} повертає 404'
+            ))
+
+    if cycles:
+        raise RedirectCycleError('Цикли в REDIRECTS:\n' + '\n'.join(cycles))
+
+    return compiled
+
+
+@lru_cache(maxsize=1)
+def get_compiled_redirects() -> CompiledRedirects:
+    """Компілює REDIRECTS один раз на процес і логує проблеми."""
+    compiled = compile_redirects()
+    for issue in compiled.issues:
+        level = logging.INFO if issue.kind == 'chain' else logging.WARNING
+        logger.log(level, '[Redirects] %s: %s (%s)', issue.kind, issue.source, issue.detail)
+    return compiled
@@ -0,0 +1,164 @@
+"""
+Підказки редиректів для 404: trigram індекс по всіх живих URL сайту.
+
+Замість ручного пошуку схожих сторінок (scripts/verify_all_urls.py,
+scripts/check_news_old_urls.py) 404 шляхи з logs/not_found.log зіставляються
+з URL зі SITEMAP_URLS, slug PROGRAMS/LOCATIONS/CITIES та NewsArticle.
+Індекс будується один раз: trigram → кандидати, тож пошук торкається лише
+кандидатів зі спільними trigram, а не всіх URL.
+"""
+import json
+import math
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.urls import NoReverseMatch, reverse
+from django.utils import translation
+
+from .models import NewsArticle
+from .seo_config import CITIES, LOCATIONS, PROGRAMS, SITEMAP_URLS
+
+
+@dataclass
+class Suggestion:
+    """Кандидат редиректу для 404 шляху."""
+    path: str
+    target: str
+    similarity: float
+    hits: int
+
+    @property
+    def score(self) -> float:
+        # Частота важить, але не перебиває схожість: log замість лінійної
+        return self.similarity * math.log1p(self.hits)
+
+
+def url_key(path: str) -> str:
+    """Текст для порівняння: без мовного префікса, слеші/дефіси → пробіли."""
+    language = translation.get_language_from_path(path)
+    if language and language != settings.LANGUAGE_CODE:
+        path = path[len(language) + 1:]
+    return ' '.join(path.lower().replace('_', '-').replace('/', ' ').replace('-', ' ').split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigram слів з межами (як pg_trgm): 'ielts' → '  i', ' ie', 'iel', ..."""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Інвертований trigram індекс URL з Jaccard схожістю."""
+
+    def __init__(self, urls: Iterable[str]):
+        self.urls: List[str] = []
+        self.grams: List[Set[str]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for url in dict.fromkeys(urls):
+            index = len(self.urls)
+            grams = trigrams(url_key(url))
+            self.urls.append(url)
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings[gram].append(index)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def search(self, path: str, limit: int = 1, min_similarity: float = 0.0) -> List[tuple]:
+        """
+        Найсхожіші URL.
+
+        Returns:
+            [(url, similarity), ...] за спаданням схожості
+        """
+        query = trigrams(url_key(path))
+        if not query:
+            return []
+        shared = Counter()
+        for gram in query:
+            shared.update(self.postings.get(gram, ()))
+
+        results = []
+        for index, common in shared.items():
+            similarity = common / (len(query) + len(self.grams[index]) - common)
+            if similarity >= min_similarity:
+                results.append((self.urls[index], similarity))
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit]
+
+
+def collect_known_urls(language: str) -> List[str]:
+    """Усі живі URL сайту для мови."""
+    urls = []
+    with translation.override(language):
+        for item in SITEMAP_URLS:
+            url_name = item[0]
+            try:
+                if len(item) >= 4:
+                    kwarg = 'city' if url_name == 'core:city_page' else 'slug'
+                    urls.append(reverse(url_name, kwargs={kwarg: item[3]}))
+                else:
+                    urls.append(reverse(url_name))
+            except NoReverseMatch:
+                continue
+        urls.extend(reverse('core:program_detail', kwargs={'slug': slug}) for slug in PROGRAMS)
+        urls.extend(reverse('core:school_location', kwargs={'slug': slug}) for slug in LOCATIONS)
+        urls.extend(reverse('core:city_page', kwargs={'city': slug}) for slug in CITIES)
+
+        slug_field = 'slug_ru' if language == 'ru' else 'slug_uk'
+        slugs = NewsArticle.objects.filter(is_published=True).exclude(**{f'{slug_field}__isnull': True}).exclude(
+            **{slug_field: ''}
+        ).values_list(slug_field, flat=True)
+        urls.extend(reverse('core:news_detail', kwargs={'slug': slug}) for slug in slugs)
+    return list(dict.fromkeys(urls))
+
+
+def load_not_found_hits(log_files: Iterable[Path]) -> Dict[str, int]:
+    """Сумує звернення по шляхах з логів NotFoundTracker (JSON lines)."""
+    hits: Dict[str, int] = Counter()
+    for log_file in log_files:
+        if not log_file.exists():
+            continue
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+                if data.get('path'):
+                    hits[data['path']] += int(data.get('hits', 1))
+    return dict(hits)
+
+
+def suggest_redirects(hits: Dict[str, int], min_similarity: float = 0.35,
+                      skip: Optional[Set[str]] = None) -> List[Suggestion]:
+    """
+    Для кожного 404 шляху - найсхожіший живий URL тієї ж мови.
+
+    Args:
+        hits: {шлях: кількість 404}
+        min_similarity: поріг Jaccard схожості trigram
+        skip: шляхи, що вже мають редирект
+    """
+    indexes = {code: TrigramIndex(collect_known_urls(code)) for code, _name in settings.LANGUAGES}
+    skip = skip or set()
+
+    suggestions = []
+    for path, count in hits.items():
+        if path in skip:
+            continue
+        language = translation.get_language_from_path(path) or settings.LANGUAGE_CODE
+        matches = indexes[language].search(path, limit=1, min_similarity=min_similarity)
+        if matches and matches[0][0] != path:
+            target, similarity = matches[0]
+            suggestions.append(Suggestion(path, target, round(similarity, 3), count))
+
+    suggestions.sort(key=lambda suggestion: (-suggestion.score, suggestion.path))
+    return suggestions
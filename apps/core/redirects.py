@@ -1,6 +1,9 @@
 """
 Mapping старих URL на нові для 301 редиректів.
 Всі URL мають варіанти з trailing slash та без (обробляється в middleware).
+Варіанти з мовним префіксом (/ru/...) генеруються автоматично з UK правил
+(apps.core.redirect_graph.with_language_variants) - явні /ru/ правила потрібні
+лише якщо RU ціль відрізняється від перекладу UK цілі.
 """
 
 REDIRECTS = {
@@ -0,0 +1,423 @@
+"""
+Індекс схожих статей для news_detail (TF-IDF, окремо для кожної мови).
+
+Офлайн (manage.py build_related_news) для всіх опублікованих статей:
+1. терміни: слова title (x3), meta_description (x2) та тексту content (через
+   news_search.document - RU з fallback на UK), приведені до перших STEM_LENGTH
+   літер (грубий стемінг для української/російської) без коротких та стоп-слів;
+2. ваги TF-IDF (сублінійний tf), в сигнатурі статті лишаються SIGNATURE_TERMS
+   найважчих термінів, вектор нормалізується;
+3. косинусна схожість через інвертований індекс сигнатур - порівнюються лише
+   статті зі спільними термінами, а не всі пари;
+4. top-k (TOP_K) з score >= MIN_SCORE записуються в RelatedNewsArticle.
+
+Індекс зберігається в БД: частоти термінів та сигнатури статей (NewsArticleTerms),
+документні частоти (RelatedNewsTerm) та інвертований індекс сигнатур (RelatedNewsPosting).
+Тож збереження статті (post_save → on_commit → update_queue, не в запиті admin)
+рахує лише її вектор, оновлює df її термінів, скорить її по postings спільних термінів
+та зливає її в списки сусідів; повністю (по postings) перераховуються лише повні
+списки, де її score впав. IDF решти статей при цьому не переоцінюється - періодичний
+повний build_related_news вирівнює дрейф.
+
+Оновлення серіалізуються: у процесі - черга update_queue з одним потоком, між
+gunicorn workers - select_for_update рядків NewsArticleTerms статей, чиї списки
+переписуються (списки перечитуються вже під блокуванням). Задача, відкинута
+переповненою чергою, логується як помилка - тоді потрібен build_related_news.
+"""
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import OperationalError, transaction
+from django.db.models import F
+
+from . import news_search, page_cache
+from .utils.background import BackgroundTaskQueue
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = news_search.LANGUAGES
+TOP_K = 4
+MIN_SCORE = 0.05
+SIGNATURE_TERMS = 40
+STEM_LENGTH = 6
+MIN_TERM_LENGTH = 3
+FIELD_WEIGHTS = {'title': 3, 'description': 2, 'body': 1}
+# Повтори оновлення, перерваного deadlock з оновленням в іншому процесі (PostgreSQL)
+UPDATE_ATTEMPTS = 3
+
+_WORD_RE = re.compile(r'[^\W\d_]+', re.UNICODE)
+_ARTICLE_FIELDS = [f'{name}_{lang}' for name in ('title', 'meta_description', 'content') for lang in LANGUAGES]
+
+STOP_WORDS = frozenset({
+    # uk
+    'але', 'або', 'бути', 'був', 'була', 'були', 'вже', 'все', 'для', 'його', 'їх', 'краще', 'мене',
+    'між', 'можна', 'над', 'наш', 'наша', 'наші', 'нас', 'вас', 'ваш', 'від', 'про', 'при', 'під',
+    'після', 'також', 'так', 'те', 'тим', 'того', 'тому', 'треба', 'цей', 'ця', 'це', 'ці', 'чи',
+    'що', 'щоб', 'як', 'яка', 'які', 'який', 'якщо',
+    # ru
+    'без', 'был', 'была', 'были', 'быть', 'все', 'всё', 'если', 'еще', 'ещё', 'или', 'как', 'когда',
+    'который', 'которые', 'лучше', 'меня', 'можно', 'над', 'наш', 'нас', 'вас', 'ваш', 'она', 'они',
+    'оно', 'под', 'при', 'про', 'после', 'так', 'также', 'там', 'тем', 'того', 'тоже', 'чем', 'что',
+    'чтобы', 'это', 'эта', 'эти', 'этот',
+    # en (назви програм, цитати)
+    'and', 'are', 'for', 'the', 'with', 'you', 'your',
+})
+
+Vector = Dict[str, float]
+Related = List[Tuple[int, float]]
+
+
+def article_terms(article, lang: str) -> Dict[str, int]:
+    """Частоти (зважені полем) термінів статті однією мовою."""
+    counts: Counter = Counter()
+    for field, text in news_search.document(article, lang).items():
+        weight = FIELD_WEIGHTS[field]
+        for word in _WORD_RE.findall(text.lower()):
+            if len(word) >= MIN_TERM_LENGTH and word not in STOP_WORDS:
+                counts[word[:STEM_LENGTH]] += weight
+    return dict(counts)
+
+
+def signature(terms: Dict[str, int], df: Dict[str, int], total: int) -> Vector:
+    """Нормалізований TF-IDF вектор з SIGNATURE_TERMS найважчих термінів."""
+    weights = {
+        term: (1 + math.log(count)) * math.log((1 + total) / (1 + df[term]))
+        for term, count in terms.items()
+        # Термін лише однієї статті ні з чим не зв'язує
+        if df.get(term, 0) > 1
+    }
+    top = heapq.nlargest(SIGNATURE_TERMS, weights.items(), key=lambda item: item[1])
+    norm = math.sqrt(sum(weight * weight for _, weight in top))
+    return {term: weight / norm for term, weight in top} if norm else {}
+
+
+def signatures(corpus: Dict[int, Dict[str, int]]) -> Dict[int, Vector]:
+    """Сигнатури всього корпусу (повна перебудова)."""
+    df = Counter(term for terms in corpus.values() for term in terms)
+    vectors = {pk: signature(terms, df, len(corpus)) for pk, terms in corpus.items()}
+    return {pk: vector for pk, vector in vectors.items() if vector}
+
+
+def postings(vectors: Dict[int, Vector]) -> Dict[str, List[Tuple[int, float]]]:
+    index = defaultdict(list)
+    for pk, vector in vectors.items():
+        for term, weight in vector.items():
+            index[term].append((pk, weight))
+    return index
+
+
+def scores_for(pk: int, vectors: Dict[int, Vector], index) -> Dict[int, float]:
+    """Косинусна схожість статті з усіма статтями зі спільними термінами."""
+    scores: Dict[int, float] = defaultdict(float)
+    for term, weight in vectors.get(pk, {}).items():
+        for other, other_weight in index[term]:
+            scores[other] += weight * other_weight
+    scores.pop(pk, None)
+    return scores
+
+
+def top_related(scores: Dict[int, float], k: int = TOP_K) -> Related:
+    # При рівному score - новіша стаття (більший pk)
+    candidates = ((pk, score) for pk, score in scores.items() if score >= MIN_SCORE)
+    return heapq.nlargest(k, candidates, key=lambda item: (item[1], item[0]))
+
+
+def _store(lang: str, related: Dict[int, Related]) -> None:
+    """Замінює top-k для статей з related (ключі) однією мовою."""
+    from .models import RelatedNewsArticle
+
+    RelatedNewsArticle.objects.filter(language=lang, article_id__in=list(related)).delete()
+    RelatedNewsArticle.objects.bulk_create([
+        RelatedNewsArticle(article_id=pk, related_id=other, language=lang, position=position, score=round(score, 6))
+        for pk, items in related.items()
+        for position, (other, score) in enumerate(items)
+    ], batch_size=1000)
+
+
+def build(articles: Optional[Iterable] = None) -> Dict[str, int]:
+    """
+    Повна перебудова індексу (manage.py build_related_news).
+
+    Повертає кількість статей з хоча б одною схожою по мовах.
+    """
+    from .models import NewsArticle, NewsArticleTerms, RelatedNewsArticle, RelatedNewsPosting, RelatedNewsTerm
+
+    if articles is None:
+        articles = NewsArticle.objects.filter(is_published=True).only('pk', *_ARTICLE_FIELDS)
+    corpora: Dict[str, Dict[int, Dict[str, int]]] = {lang: {} for lang in LANGUAGES}
+    for article in articles.iterator() if hasattr(articles, 'iterator') else articles:
+        for lang in LANGUAGES:
+            corpora[lang][article.pk] = article_terms(article, lang)
+
+    counts = {}
+    with transaction.atomic():
+        for model in (NewsArticleTerms, RelatedNewsTerm, RelatedNewsPosting, RelatedNewsArticle):
+            model.objects.all().delete()
+        for lang, corpus in corpora.items():
+            vectors = signatures(corpus)
+            NewsArticleTerms.objects.bulk_create([
+                NewsArticleTerms(article_id=pk, language=lang, terms=terms, signature=vectors.get(pk, {}))
+                for pk, terms in corpus.items()
+            ], batch_size=500)
+            RelatedNewsTerm.objects.bulk_create([
+                RelatedNewsTerm(language=lang, term=term, df=df)
+                for term, df in Counter(term for terms in corpus.values() for term in terms).items()
+            ], batch_size=1000)
+            index = postings(vectors)
+            RelatedNewsPosting.objects.bulk_create([
+                RelatedNewsPosting(article_id=pk, language=lang, term=term, weight=weight)
+                for term, items in index.items()
+                for pk, weight in items
+            ], batch_size=1000)
+            related = {pk: top_related(scores_for(pk, vectors, index)) for pk in vectors}
+            related = {pk: items for pk, items in related.items() if items}
+            _store(lang, related)
+            counts[lang] = len(related)
+    return counts
+
+
+def _adjust_df(lang: str, old: Iterable[str], new: Iterable[str]) -> None:
+    """Документні частоти після зміни набору термінів однієї статті (атомарно через F)."""
+    from .models import RelatedNewsTerm
+
+    removed, added = set(old) - set(new), set(new) - set(old)
+    if removed:
+        terms = RelatedNewsTerm.objects.filter(language=lang, term__in=removed)
+        terms.update(df=F('df') - 1)
+        terms.filter(df__lte=0).delete()
+    if added:
+        RelatedNewsTerm.objects.bulk_create(
+            [RelatedNewsTerm(language=lang, term=term) for term in added], ignore_conflicts=True,
+        )
+        RelatedNewsTerm.objects.filter(language=lang, term__in=added).update(df=F('df') + 1)
+
+
+def _scores(lang: str, pk: int, vector: Vector) -> Dict[int, float]:
+    """Косинусна схожість вектора з іншими статтями по postings його термінів."""
+    from .models import RelatedNewsPosting
+
+    scores: Dict[int, float] = defaultdict(float)
+    rows = RelatedNewsPosting.objects.filter(language=lang, term__in=list(vector)).exclude(article_id=pk)
+    for other, term, weight in rows.values_list('article_id', 'term', 'weight').iterator():
+        scores[other] += vector[term] * weight
+    return scores
+
+
+def _recompute(lang: str, pk: int) -> Related:
+    """Повний top-k статті по її збереженій сигнатурі."""
+    from .models import NewsArticleTerms
+
+    vector = NewsArticleTerms.objects.filter(article_id=pk, language=lang).values_list('signature', flat=True).first()
+    return top_related(_scores(lang, pk, vector)) if vector else []
+
+
+def _index_vector(lang: str, pk: int, terms: Optional[Dict[str, int]]) -> Vector:
+    """Оновлює терміни, df, сигнатуру та postings статті; повертає її нову сигнатуру."""
+    from .models import NewsArticleTerms, RelatedNewsPosting, RelatedNewsTerm
+
+    stored = NewsArticleTerms.objects.filter(article_id=pk, language=lang).values_list('terms', flat=True).first()
+    _adjust_df(lang, stored or {}, terms or {})
+    RelatedNewsPosting.objects.filter(article_id=pk, language=lang).delete()
+    if terms is None:
+        NewsArticleTerms.objects.filter(article_id=pk, language=lang).delete()
+        return {}
+
+    total = NewsArticleTerms.objects.filter(language=lang).exclude(article_id=pk).count() + 1
+    df = dict(RelatedNewsTerm.objects.filter(language=lang, term__in=list(terms)).values_list('term', 'df'))
+    vector = signature(terms, df, total)
+    NewsArticleTerms.objects.update_or_create(
+        article_id=pk, language=lang, defaults={'terms': terms, 'signature': vector},
+    )
+    RelatedNewsPosting.objects.bulk_create([
+        RelatedNewsPosting(article_id=pk, language=lang, term=term, weight=weight) for term, weight in vector.items()
+    ])
+    return vector
+
+
+def _affected(previous: Iterable[int], scores: Dict[int, float]) -> Set[int]:
+    """Статті, куди pk входив або тепер проходить за score (схожість симетрична)."""
+    return set(previous) | {other for other, score in scores.items() if score >= MIN_SCORE}
+
+
+def _lock(lang: str, pks: Iterable[int]) -> None:
+    """Блокує рядки NewsArticleTerms до кінця транзакції (у порядку pk)."""
+    from .models import NewsArticleTerms
+
+    list(
+        NewsArticleTerms.objects.select_for_update().filter(language=lang, article_id__in=list(pks))
+        .order_by('article_id').values_list('pk', flat=True)
+    )
+
+
+def _merge_into_neighbours(lang: str, pk: int, scores: Dict[int, float], affected: Set[int]) -> Dict[int, Related]:
+    """
+    Нові списки статей affected (рядки вже заблоковані).
+
+    pk вливається в збережений список сусіда; повністю перераховується лише повний
+    список, де score pk впав - наступного кандидата в ньому не видно.
+    """
+    from .models import RelatedNewsArticle
+
+    current: Dict[int, Related] = defaultdict(list)
+    rows = RelatedNewsArticle.objects.filter(language=lang, article_id__in=affected)
+    for article_id, related_id, score in rows.values_list('article_id', 'related_id', 'score'):
+        current[article_id].append((related_id, score))
+
+    result = {}
+    for other in affected:
+        items = current[other]
+        old_score = dict(items).get(pk)
+        new_score = scores.get(other, 0.0)
+        if old_score is not None and len(items) >= TOP_K and new_score < old_score:
+            result[other] = _recompute(lang, other)
+            continue
+        merged = {related: score for related, score in items if related != pk}
+        if new_score >= MIN_SCORE:
+            merged[pk] = new_score
+        updated = top_related(merged)
+        if updated != items:
+            result[other] = updated
+    return result
+
+
+def _neighbours(lang: str, pk: int) -> List[int]:
+    from .models import RelatedNewsArticle
+
+    return list(RelatedNewsArticle.objects.filter(language=lang, related_id=pk).values_list('article_id', flat=True))
+
+
+def _update_language(lang: str, pk: int, terms: Optional[Dict[str, int]]) -> None:
+    vector = _index_vector(lang, pk, terms)
+    locked: Set[int] = set()
+    while True:
+        # Під блокуванням перечитуємо: паралельне оновлення могло змінити списки та postings
+        scores = _scores(lang, pk, vector) if vector else {}
+        affected = _affected(_neighbours(lang, pk), scores) - {pk}
+        if affected <= locked:
+            break
+        _lock(lang, affected - locked)
+        locked |= affected
+    related = _merge_into_neighbours(lang, pk, scores, affected)
+    related[pk] = top_related(scores)
+    _store(lang, related)
+
+
+def update_article(pk: int, attempts: int = UPDATE_ATTEMPTS) -> None:
+    """
+    Інкрементне оновлення після збереження статті (задача update_queue).
+
+    Скориться лише вектор статті; оновлюються її top-k та списки сусідів.
+    """
+    from .models import NewsArticle
+
+    article = NewsArticle.objects.filter(pk=pk).only('pk', 'is_published', *_ARTICLE_FIELDS).first()
+    if article is None:
+        return
+    try:
+        with transaction.atomic():
+            for lang in LANGUAGES:
+                _update_language(lang, pk, article_terms(article, lang) if article.is_published else None)
+    except OperationalError:
+        # Deadlock з оновленням в іншому процесі - PostgreSQL перериває одну з транзакцій
+        if attempts <= 1:
+            raise
+        update_article(pk, attempts - 1)
+        return
+    # Блок схожих статей - на детальних сторінках самої статті та сусідів
+    page_cache.purge_views('core:news_detail')
+
+
+def remove_article(pk: int, terms: Dict[str, Dict[str, int]], neighbours: Dict[str, List[int]]) -> None:
+    """
+    Після видалення статті (задача update_queue): df її термінів та списки, де вона була.
+
+    Рядки статті (терміни, postings, списки) вже видалені каскадом - terms та neighbours
+    зібрані в pre_delete.
+    """
+    from .models import RelatedNewsArticle
+
+    with transaction.atomic():
+        for lang in LANGUAGES:
+            _adjust_df(lang, terms.get(lang, {}), {})
+            _lock(lang, neighbours.get(lang, []))
+            full = [
+                other for other in neighbours.get(lang, [])
+                # Неповний список і без статті лишається правильним
+                if RelatedNewsArticle.objects.filter(language=lang, article_id=other).count() >= TOP_K - 1
+            ]
+            _store(lang, {other: _recompute(lang, other) for other in full})
+    page_cache.purge_views('core:news_detail')
+
+
+def related_articles(article, lang: str, limit: int = TOP_K):
+    """Схожі опубліковані статті (лише поля для посилань) одним запитом по індексу."""
+    from .models import NewsArticle
+
+    return NewsArticle.objects.filter(
+        related_from__article=article, related_from__language=lang, is_published=True,
+    ).order_by('related_from__position').only('slug_uk', 'slug_ru', 'title_uk', 'title_ru')[:limit]
+
+
+# Один потік: оновлення в процесі не перетинаються; більша черга - для масових дій admin
+update_queue = BackgroundTaskQueue(maxsize=10000, workers=1)
+_pending: Set[int] = set()
+_pending_lock = threading.Lock()
+
+
+def _submit(func, *args) -> bool:
+    if update_queue.submit(func, *args):
+        return True
+    logger.error(
+        'Related news: queue full, %s%r dropped - run manage.py build_related_news', func.__name__, args,
+    )
+    return False
+
+
+def _run_update(pk: int) -> None:
+    with _pending_lock:
+        _pending.discard(pk)
+    update_article(pk)
+
+
+def schedule_update(pk: int) -> bool:
+    """Ставить оновлення статті в update_queue; повторні збереження до його початку - одна задача."""
+    with _pending_lock:
+        if pk in _pending:
+            return True
+        _pending.add(pk)
+    if _submit(_run_update, pk):
+        return True
+    with _pending_lock:
+        _pending.discard(pk)
+    return False
+
+
+def _update_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        # Після коміту і у фоні: збереження в admin не чекає на перерахунок
+        pk = instance.pk
+        transaction.on_commit(lambda: schedule_update(pk))
+
+
+def _remove_on_delete(sender, instance, **kwargs):
+    from .models import NewsArticleTerms
+
+    pk = instance.pk
+    terms = dict(NewsArticleTerms.objects.filter(article_id=pk).values_list('language', 'terms'))
+    neighbours = {lang: _neighbours(lang, pk) for lang in LANGUAGES}
+    transaction.on_commit(lambda: _submit(remove_article, pk, terms, neighbours))
+
+
+def connect_signals() -> None:
+    """Інкрементне оновлення індексу при збереженні/видаленні статті (CoreConfig.ready)."""
+    from django.db.models.signals import post_save, pre_delete
+
+    from .models import NewsArticle
+
+    post_save.connect(_update_on_save, sender=NewsArticle, dispatch_uid='related_news_save')
+    pre_delete.connect(_remove_on_delete, sender=NewsArticle, dispatch_uid='related_news_delete')
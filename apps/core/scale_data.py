@@ -0,0 +1,319 @@
+"""
+Синтетичні дані великого обсягу для навантажувальних тестів.
+
+Продакшн має мало рядків, тож проблеми з 50k новин чи 500k заявок не
+видно ні в тестах, ні в бенчмарках. Тут - генератори реалістичних двомовних
+NewsArticle, Testimonial, TrialLesson, ConsultationRequest та рядків
+logs/redirects.log (формат AsyncRedirectLogger).
+
+Моделі вставляються bulk_create чанками (транзакція на чанк): без save()
+та сигналів, тож мільйон рядків займає хвилини. Дати (created_at, published_at)
+рознесені в минуле - як у справжній історії заявок.
+
+Використовується командою `manage.py seed_scale_data`.
+"""
+import json
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Max, Model
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from apps.core.models import ConsultationRequest, NewsArticle, Testimonial
+from apps.leads.models import TrialLesson
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# (slug, заголовок UK, заголовок RU)
+NEWS_TOPICS = [
+    ('idiomy-pro-yizhu', 'Ідіоми про їжу', 'Идиомы о еде'),
+    ('phrasal-verbs', 'Фразові дієслова на кожен день', 'Фразовые глаголы на каждый день'),
+    ('pidgotovka-do-ielts', 'Як підготуватися до IELTS', 'Как подготовиться к IELTS'),
+    ('anglijska-dlya-ditej', 'Англійська для дітей: з чого почати', 'Английский для детей: с чего начать'),
+    ('biznes-anglijska', 'Бізнес англійська для співбесіди', 'Бизнес английский для собеседования'),
+    ('gramatyka-present-perfect', 'Present Perfect без болю', 'Present Perfect без боли'),
+    ('slova-dlya-podorozhej', 'Слова для подорожей', 'Слова для путешествий'),
+    ('rozmovna-praktyka', 'Розмовна практика з носієм', 'Разговорная практика с носителем'),
+    ('britanska-vs-amerykanska', 'Британська чи американська англійська', 'Британский или американский английский'),
+    ('motyvatsiya-vchytys', 'Як не кинути вивчення мови', 'Как не бросить изучение языка'),
+]
+
+SENTENCES_UK = [
+    'Регулярна розмовна практика допомагає швидше подолати мовний бар\'єр.',
+    'На заняттях ми поєднуємо граматику, лексику та живе спілкування.',
+    'Викладачі Speak Up підбирають програму під рівень та цілі кожного учня.',
+    'Короткі щоденні вправи дають кращий результат, ніж рідкі довгі уроки.',
+    'Слухайте подкасти та дивіться серіали мовою оригіналу з субтитрами.',
+    'Нові слова краще запам\'ятовуються в контексті, а не окремими списками.',
+    'Пробний урок допоможе визначити рівень та скласти план навчання.',
+    'У групах до шести людей кожен учень встигає говорити на занятті.',
+]
+
+SENTENCES_RU = [
+    'Регулярная разговорная практика помогает быстрее преодолеть языковой барьер.',
+    'На занятиях мы совмещаем грамматику, лексику и живое общение.',
+    'Преподаватели Speak Up подбирают программу под уровень и цели каждого ученика.',
+    'Короткие ежедневные упражнения дают лучший результат, чем редкие длинные уроки.',
+    'Слушайте подкасты и смотрите сериалы на языке оригинала с субтитрами.',
+    'Новые слова лучше запоминаются в контексте, а не отдельными списками.',
+    'Пробный урок поможет определить уровень и составить план обучения.',
+    'В группах до шести человек каждый ученик успевает говорить на занятии.',
+]
+
+NAMES = [
+    'Олена', 'Андрій', 'Ірина', 'Максим', 'Наталія', 'Олександр', 'Юлія', 'Дмитро',
+    'Катерина', 'Сергій', 'Марія', 'Віктор', 'Анна', 'Богдан', 'Софія', 'Тарас',
+]
+
+TESTIMONIAL_TEXTS = [
+    'Дуже подобаються заняття, за пів року заговорила англійською.',
+    'Викладач уважний, уроки проходять цікаво та динамічно.',
+    'Нарешті перестав боятися говорити, рекомендую школу друзям.',
+    'Підготувалась до IELTS і склала на 7.0, дякую команді!',
+    'Дитина із задоволенням ходить на заняття, прогрес помітний.',
+    'Зручний розклад та онлайн формат, можна займатися з будь-якого міста.',
+]
+
+# (utm_source, utm_medium, вага) - органіка без UTM найчастіша
+TRAFFIC_SOURCES = [
+    ('', '', 45),
+    ('google', 'cpc', 25),
+    ('facebook', 'paid_social', 12),
+    ('instagram', 'social', 12),
+    ('tiktok', 'paid_social', 6),
+]
+
+REFERRERS = ['', 'https://www.google.com/', 'https://www.instagram.com/', 'https://speak-up.com.ua/']
+
+TEST_STATUSES = [('not_started', 50), ('skipped', 30), ('completed', 20)]
+LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1']
+MESSENGERS = ['whatsapp', 'instagram', 'telegram']
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)',
+]
+
+
+@contextmanager
+def explicit_timestamps(model) -> Iterator[None]:
+    """
+    Вимикає auto_now/auto_now_add на час вставки, щоб зберегти задані дати.
+
+    bulk_create викликає pre_save полів, і auto_now_add перезаписав би
+    created_at поточним часом.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_insert(model, count: int, build: Callable[[int], Model], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                progress: Optional[Callable[[int], None]] = None) -> int:
+    """Створює count об'єктів build(i) чанками по chunk_size (транзакція на чанк)."""
+    created = 0
+    with explicit_timestamps(model):
+        for start in range(0, count, chunk_size):
+            objects = [build(index) for index in range(start, min(start + chunk_size, count))]
+            with transaction.atomic(using=model.objects.db):
+                model.objects.bulk_create(objects, batch_size=chunk_size)
+            created += len(objects)
+            if progress:
+                progress(created)
+    return created
+
+
+class ScaleDataGenerator:
+    """
+    Будує реалістичні об'єкти моделей (random з seed - відтворювано).
+
+    Індекси slug/old_url продовжуються від максимального pk, тож повторний
+    запуск дописує нові рядки без конфліктів унікальності.
+    """
+
+    def __init__(self, seed: int = 0, years: int = 3):
+        self.random = random.Random(seed)
+        self.now = timezone.now()
+        self.span_seconds = int(timedelta(days=365 * years).total_seconds())
+        self.news_offset = (NewsArticle.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+    def past(self, span_seconds: Optional[int] = None):
+        return self.now - timedelta(seconds=self.random.randrange(span_seconds or self.span_seconds))
+
+    def phone(self) -> str:
+        return f'+380{self.random.choice("5679")}{self.random.randrange(10 ** 8):08d}'
+
+    def ip(self) -> str:
+        octets = (self.random.choice((37, 46, 91, 176, 188)), self.random.randrange(256),
+                  self.random.randrange(256), self.random.randrange(1, 255))
+        return '.'.join(map(str, octets))
+
+    def traffic(self) -> dict:
+        """UTM поля заявки за зваженим розподілом джерел."""
+        source, medium, _ = self.random.choices(TRAFFIC_SOURCES, [item[2] for item in TRAFFIC_SOURCES])[0]
+        fields = {
+            'utm_source': source,
+            'utm_medium': medium,
+            'utm_campaign': f'{source}-{self.random.choice(("spring", "autumn", "ielts", "kids"))}' if source else '',
+            'referrer': self.random.choice(REFERRERS),
+            'ip_address': self.ip(),
+        }
+        if source == 'google':
+            fields['gclid'] = f'Cj0K{self.random.getrandbits(96):024x}'
+        elif source in ('facebook', 'instagram'):
+            fields['fbclid'] = f'IwAR{self.random.getrandbits(96):024x}'
+        return fields
+
+    def content(self, sentences: List[str]) -> str:
+        """HTML статті: 4-10 абзаців по 3-6 речень з підзаголовками."""
+        paragraphs = []
+        for index in range(self.random.randint(4, 10)):
+            if index and index % 3 == 0:
+                paragraphs.append(f'<h2>{self.random.choice(sentences)[:-1]}</h2>')
+            text = ' '.join(self.random.choices(sentences, k=self.random.randint(3, 6)))
+            paragraphs.append(f'<p>{text}</p>')
+        return '\n'.join(paragraphs)
+
+    def news_article(self, index: int) -> NewsArticle:
+        number = self.news_offset + index
+        slug, title_uk, title_ru = self.random.choice(NEWS_TOPICS)
+        published_at = self.past()
+        return NewsArticle(
+            slug_uk=f'{slug}-{number}',
+            slug_ru=f'{slug}-ru-{number}',
+            title_uk=f'{title_uk} ({number})',
+            title_ru=f'{title_ru} ({number})',
+            content_uk=self.content(SENTENCES_UK),
+            content_ru=self.content(SENTENCES_RU),
+            meta_description_uk=self.random.choice(SENTENCES_UK),
+            meta_description_ru=self.random.choice(SENTENCES_RU),
+            published_at=published_at,
+            # Старі WordPress адреси: номер попереду, тож вони не збігаються з новими
+            old_url_uk=f'/news/{number}-{slug}/',
+            old_url_ru=f'/ru/news/{number}-{slug}/',
+            is_published=self.random.random() > 0.05,
+            created_at=published_at,
+            updated_at=published_at,
+        )
+
+    def testimonial(self, index: int) -> Testimonial:
+        created_at = self.past()
+        is_published = self.random.random() < 0.8
+        return Testimonial(
+            name=self.random.choice(NAMES),
+            text=self.random.choice(TESTIMONIAL_TEXTS),
+            rating=self.random.choices((5, 4, 3, 2, 1), (70, 20, 6, 2, 2))[0],
+            is_published=is_published,
+            moderated_at=created_at + timedelta(hours=self.random.randint(1, 72)) if is_published else None,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def trial_lesson(self, index: int) -> TrialLesson:
+        created_at = self.past()
+        test_status = self.random.choices(*zip(*TEST_STATUSES))[0]
+        notified = self.random.random() < 0.97
+        return TrialLesson(
+            name=self.random.choice(NAMES) if self.random.random() < 0.9 else None,
+            phone=self.phone(),
+            test_status=test_status,
+            test_results={
+                'level': self.random.choice(LEVELS),
+                'score': self.random.randint(5, 40),
+            } if test_status == 'completed' else None,
+            created_at=created_at,
+            email_sent=notified,
+            telegram_sent=notified,
+            notified_at=created_at + timedelta(seconds=self.random.randint(1, 30)) if notified else None,
+            **self.traffic(),
+        )
+
+    def consultation_request(self, index: int) -> ConsultationRequest:
+        created_at = self.past()
+        prefers_messenger = self.random.random() < 0.3
+        name = self.random.choice(NAMES)
+        return ConsultationRequest(
+            name=name,
+            email=f'client{self.random.randrange(10 ** 7)}@example.com' if self.random.random() < 0.4 else None,
+            phone=self.phone(),
+            prefers_messenger=prefers_messenger,
+            messenger_choice=self.random.choice(MESSENGERS) if prefers_messenger else '',
+            created_at=created_at,
+            updated_at=created_at,
+            **self.traffic(),
+        )
+
+    def redirect_targets(self, news_sample: int = 20000) -> List[Tuple[str, str, str]]:
+        """
+        (old_url, new_url, redirect_type) для логу: статичні REDIRECTS та
+        old_url новин з БД (вибірка до news_sample статей).
+        """
+        from apps.core.redirect_graph import get_compiled_redirects
+
+        targets = [(source, target, 'static') for source, target in get_compiled_redirects().table.items()]
+        articles = NewsArticle.objects.exclude(old_url_uk='').values_list('old_url_uk', 'slug_uk')
+        with translation.override('uk'):
+            targets += [
+                (old_url, reverse('core:news_detail', kwargs={'slug': slug}), 'news')
+                for old_url, slug in articles[:news_sample]
+            ]
+        return targets
+
+    def redirect_log_lines(self, count: int, days: int = 30) -> Iterator[str]:
+        """
+        JSON рядки у форматі AsyncRedirectLogger, впорядковані за часом.
+
+        Популярність URL - розподіл Ципфа: кілька старих адрес отримують
+        більшість трафіку, решта - довгий хвіст.
+        """
+        targets = self.redirect_targets()
+        if not targets:
+            return
+        self.random.shuffle(targets)
+        weights = [1 / rank for rank in range(1, len(targets) + 1)]
+        span = int(timedelta(days=days).total_seconds())
+        start = self.now - timedelta(seconds=span)
+        offsets = sorted(self.random.randrange(span) for _ in range(count))
+        for offset, (old_url, new_url, redirect_type) in zip(offsets, self.random.choices(targets, weights, k=count)):
+            yield json.dumps({
+                'timestamp': (start + timedelta(seconds=offset)).replace(tzinfo=None).isoformat(),
+                'old_url': old_url,
+                'new_url': new_url,
+                'redirect_type': redirect_type,
+                'user_agent': self.random.choice(USER_AGENTS),
+                'referrer': self.random.choice(REFERRERS),
+                'ip': self.ip(),
+            }) + '\n'
+
+
+def write_redirect_log(path: Path, lines: Iterator[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Дописує рядки у файл чанками; повертає кількість рядків."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    chunk: List[str] = []
+    with open(path, 'a', encoding='utf-8') as log_file:
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                log_file.writelines(chunk)
+                written += len(chunk)
+                chunk = []
+        log_file.writelines(chunk)
+    return written + len(chunk)
@@ -0,0 +1,563 @@
+"""
+SEO аудит сайту in-process (manage.py seo_audit).
+
+Краулер стартує з URL sitemap (обидві мови), рендерить сторінки Django test
+client'ом у пулі потоків і йде за внутрішніми посиланнями, canonical та hreflang.
+HTML розбирається потоковим html.parser без побудови дерева - збираються лише
+<html lang>, <title>, <h1>, meta description, canonical, hreflang та <a href>.
+
+Перевірки:
+- сторінка: статус, canonical (є, абсолютний, на себе), lang, title,
+  meta description, h1;
+- сайт: биті внутрішні посилання, посилання на редиректи, ланцюжки та цикли
+  редиректів, canonical/hreflang на не-200, пари hreflang (uk <-> ru взаємні,
+  як їх будує context_processors.seo_context), дублікати title/description.
+
+Результати розбору та перевірок сторінки кешуються за хешем вмісту (без CSRF
+токена): повторний запуск після невеликої зміни розбирає лише змінені сторінки.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Змінюйте при зміні перевірок сторінки - кеш попередньої версії ігнорується
+AUDIT_VERSION = 1
+
+LANGUAGES = ('uk', 'ru')
+DEFAULT_DESCRIPTION = 'SpeakUp - Django HTMX Application'
+TITLE_LENGTH = (20, 70)
+DESCRIPTION_LENGTH = (50, 160)
+MAX_REDIRECT_HOPS = 10
+
+# Не сторінки: статика, адмінка, API форм (POST), метрики
+SKIP_PREFIXES = ('/static/', '/media/', '/admin/', '/leads/api/', '/metrics')
+SKIP_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'viber:', 'tg:', 'whatsapp:')
+
+# Маскований CSRF токен різний у кожному рендері - не повинен змінювати хеш
+CSRF_TOKEN_RE = re.compile(rb'((?:name="csrf-token" content|name="csrfmiddlewaretoken" value)=")[A-Za-z0-9]+"')
+
+ERROR = 'error'
+WARNING = 'warning'
+
+SEVERITY = {
+    'status': ERROR,
+    'canonical_missing': ERROR,
+    'canonical_not_absolute': ERROR,
+    'canonical_mismatch': WARNING,
+    'canonical_not_ok': ERROR,
+    'lang_invalid': ERROR,
+    'lang_mismatch': ERROR,
+    'title_missing': ERROR,
+    'title_length': WARNING,
+    'description_missing': ERROR,
+    'description_default': ERROR,
+    'description_length': WARNING,
+    'h1_missing': WARNING,
+    'h1_multiple': WARNING,
+    'hreflang_missing': ERROR,
+    'hreflang_not_ok': ERROR,
+    'hreflang_not_reciprocal': ERROR,
+    'broken_link': ERROR,
+    'link_to_redirect': WARNING,
+    'redirect_chain': WARNING,
+    'redirect_loop': ERROR,
+    'redirect_to_error': ERROR,
+    'duplicate_title': WARNING,
+    'duplicate_description': WARNING,
+}
+
+
+@dataclass
+class Issue:
+    code: str
+    url: str
+    detail: str = ''
+
+    @property
+    def severity(self) -> str:
+        return SEVERITY[self.code]
+
+
+@dataclass
+class PageFacts:
+    """Зібране з HTML сторінки (кешується разом з issues сторінки)."""
+    lang: str = ''
+    title: str = ''
+    h1_count: int = 0
+    description: Optional[str] = None
+    canonical: Optional[str] = None
+    hreflang: Dict[str, str] = field(default_factory=dict)
+    links: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Fetched:
+    """Відповідь сервера на один URL."""
+    status: int
+    location: Optional[str] = None
+    content_hash: str = ''
+    facts: Optional[PageFacts] = None
+    issues: List[Issue] = field(default_factory=list)
+    cached: bool = False
+
+
+class SeoParser(HTMLParser):
+    """Потоковий розбір: лише потрібні для аудиту теги, без дерева документа (start_<tag> на тег)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.facts = PageFacts()
+        self._in_title = False
+        self._title_parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        handler = getattr(self, f'start_{tag}', None)
+        if handler is not None:
+            handler(dict(attrs))
+
+    def start_a(self, attributes):
+        if attributes.get('href'):
+            self.facts.links.append(attributes['href'])
+
+    def start_link(self, attributes):
+        rel = (attributes.get('rel') or '').lower().split()
+        if 'canonical' in rel and self.facts.canonical is None:
+            self.facts.canonical = attributes.get('href') or ''
+        elif 'alternate' in rel and attributes.get('hreflang'):
+            self.facts.hreflang[attributes['hreflang']] = attributes.get('href') or ''
+
+    def start_meta(self, attributes):
+        if (attributes.get('name') or '').lower() == 'description' and self.facts.description is None:
+            self.facts.description = (attributes.get('content') or '').strip()
+
+    def start_h1(self, attributes):
+        self.facts.h1_count += 1
+
+    def start_title(self, attributes):
+        if not self.facts.title:
+            self._in_title = True
+
+    def start_html(self, attributes):
+        self.facts.lang = attributes.get('lang') or ''
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._in_title:
+            self._in_title = False
+            self.facts.title = ' '.join(''.join(self._title_parts).split())
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+
+
+def parse_html(html: str) -> PageFacts:
+    parser = SeoParser()
+    parser.feed(html)
+    parser.close()
+    return parser.facts
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(CSRF_TOKEN_RE.sub(rb'\1"', body)).hexdigest()
+
+
+def normalize_path(path: str) -> str:
+    """Шлях без trailing slash - як canonical у seo_context."""
+    return path.rstrip('/') if path != '/' else '/'
+
+
+def page_language(path: str) -> str:
+    return 'ru' if path == '/ru/' or path.startswith('/ru/') else str(settings.LANGUAGE_CODE)
+
+
+def _check_canonical(url: str, path: str, facts: PageFacts) -> Optional[Issue]:
+    if facts.canonical is None:
+        return Issue('canonical_missing', url)
+    if not facts.canonical.startswith(('http://', 'https://')):
+        return Issue('canonical_not_absolute', url, facts.canonical)
+    if normalize_path(urlsplit(facts.canonical).path) != normalize_path(path):
+        return Issue('canonical_mismatch', url, facts.canonical)
+    return None
+
+
+def _check_lang(url: str, path: str, facts: PageFacts) -> Optional[Issue]:
+    if facts.lang not in LANGUAGES:
+        return Issue('lang_invalid', url, facts.lang)
+    if facts.lang != page_language(path):
+        return Issue('lang_mismatch', url, f'{facts.lang} != {page_language(path)}')
+    return None
+
+
+def _check_title(url: str, path: str, facts: PageFacts) -> Optional[Issue]:
+    if not facts.title:
+        return Issue('title_missing', url)
+    if not TITLE_LENGTH[0] <= len(facts.title) <= TITLE_LENGTH[1]:
+        return Issue('title_length', url, f'{len(facts.title)}: {facts.title}')
+    return None
+
+
+def _check_description(url: str, path: str, facts: PageFacts) -> Optional[Issue]:
+    if not facts.description:
+        return Issue('description_missing', url)
+    if facts.description == DEFAULT_DESCRIPTION:
+        return Issue('description_default', url)
+    if not DESCRIPTION_LENGTH[0] <= len(facts.description) <= DESCRIPTION_LENGTH[1]:
+        return Issue('description_length', url, str(len(facts.description)))
+    return None
+
+
+def _check_h1(url: str, path: str, facts: PageFacts) -> Optional[Issue]:
+    if facts.h1_count == 0:
+        return Issue('h1_missing', url)
+    if facts.h1_count > 1:
+        return Issue('h1_multiple', url, str(facts.h1_count))
+    return None
+
+
+def _check_hreflang(url: str, path: str, facts: PageFacts) -> Optional[Issue]:
+    missing = [lang for lang in LANGUAGES if lang not in facts.hreflang]
+    return Issue('hreflang_missing', url, ', '.join(missing)) if missing else None
+
+
+PAGE_CHECKS = (_check_canonical, _check_lang, _check_title, _check_description, _check_h1, _check_hreflang)
+
+
+def check_page(url: str, facts: PageFacts) -> List[Issue]:
+    """Перевірки, що залежать лише від URL та HTML сторінки (кешуються)."""
+    path = urlsplit(url).path
+    return [issue for issue in (check(url, path, facts) for check in PAGE_CHECKS) if issue is not None]
+
+
+class AuditCache:
+    """
+    JSON файл: url -> хеш вмісту, PageFacts та issues сторінки.
+
+    Запис читається лише при збігу хешу та AUDIT_VERSION.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                logger.warning('SEO audit cache %s is unreadable, starting from scratch', path)
+                data = {}
+            if data.get('version') == AUDIT_VERSION:
+                self.entries = data.get('pages', {})
+
+    def get(self, url: str, digest: str) -> Optional[Tuple[PageFacts, List[Issue]]]:
+        entry = self.entries.get(url)
+        if not entry or entry['hash'] != digest:
+            return None
+        return PageFacts(**entry['facts']), [Issue(**issue) for issue in entry['issues']]
+
+    def set(self, url: str, digest: str, facts: PageFacts, issues: List[Issue]) -> None:
+        with self.lock:
+            self.entries[url] = {'hash': digest, 'facts': asdict(facts), 'issues': [asdict(i) for i in issues]}
+
+    def save(self, urls: Iterable[str]) -> None:
+        """Зберігає записи лише обійдених URL (видалені сторінки випадають)."""
+        if not self.path:
+            return
+        keep = set(urls)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({
+            'version': AUDIT_VERSION,
+            'pages': {url: entry for url, entry in self.entries.items() if url in keep},
+        }, ensure_ascii=False), encoding='utf-8')
+
+
+@dataclass
+class AuditReport:
+    pages: Dict[str, Fetched]
+    issues: List[Issue]
+    duration: float
+
+    @property
+    def parsed(self) -> int:
+        return sum(1 for page in self.pages.values() if page.facts is not None and not page.cached)
+
+    @property
+    def cached(self) -> int:
+        return sum(1 for page in self.pages.values() if page.cached)
+
+    def count(self, severity: str) -> int:
+        return sum(1 for issue in self.issues if issue.severity == severity)
+
+    def as_dict(self) -> dict:
+        by_code: Dict[str, int] = defaultdict(int)
+        for issue in self.issues:
+            by_code[issue.code] += 1
+        return {
+            'summary': {
+                'urls': len(self.pages),
+                'html_pages': sum(1 for page in self.pages.values() if page.facts is not None),
+                'parsed': self.parsed,
+                'cached': self.cached,
+                'errors': self.count(ERROR),
+                'warnings': self.count(WARNING),
+                'duration_seconds': round(self.duration, 3),
+                'by_code': dict(sorted(by_code.items())),
+            },
+            'issues': [{**asdict(issue), 'severity': issue.severity} for issue in self.issues],
+        }
+
+
+class Frontier:
+    """Черга обходу: кожен URL один раз, не більше max_pages."""
+
+    def __init__(self, max_pages: int):
+        self.max_pages = max_pages
+        self.seen: Set[str] = set()
+        self.queue: Deque[str] = deque()
+
+    def __bool__(self) -> bool:
+        return bool(self.queue)
+
+    def push(self, url: str) -> None:
+        if url not in self.seen and len(self.seen) < self.max_pages:
+            self.seen.add(url)
+            self.queue.append(url)
+
+    def extend(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.push(url)
+
+    def pop(self) -> str:
+        return self.queue.popleft()
+
+
+class SeoAuditor:
+    """Краулер з пулом потоків (Django test client на потік)."""
+
+    def __init__(self, host: str, concurrency: int = 4, cache: Optional[AuditCache] = None,
+                 max_pages: int = 5000, secure: Optional[bool] = None):
+        self.host = host
+        self.concurrency = concurrency
+        self.cache = cache or AuditCache(None)
+        self.max_pages = max_pages
+        if secure is None:
+            secure = (getattr(settings, 'CANONICAL_DOMAIN', '') or '').startswith('https://')
+        self.secure = secure
+        self.internal_hosts = {host, urlsplit(getattr(settings, 'CANONICAL_DOMAIN', '') or '').netloc} - {''}
+        self.local = threading.local()
+
+    def internal(self, href: str, base: str = '/') -> Optional[str]:
+        """Внутрішній шлях (з query, без fragment) або None для зовнішніх та не-сторінок."""
+        href = href.strip()
+        if not href or href.startswith('#') or href.lower().startswith(SKIP_SCHEMES):
+            return None
+        parts = urlsplit(urljoin(base, href))
+        if parts.scheme not in ('', 'http', 'https') or (parts.netloc and parts.netloc not in self.internal_hosts):
+            return None
+        if parts.path.startswith(SKIP_PREFIXES):
+            return None
+        return parts.path + (f'?{parts.query}' if parts.query else '')
+
+    def fetch(self, url: str) -> Fetched:
+        from django.test import Client
+
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(HTTP_HOST=self.host, raise_request_exception=False)
+        try:
+            response = self.local.client.get(url, secure=self.secure)
+        finally:
+            # Як у warm_urls: з'єднання потоку не тримаємо між запитами
+            connections.close_all()
+        if response.status_code in (301, 302, 303, 307, 308):
+            return Fetched(response.status_code, location=self.internal(response['Location'], url) or '')
+        if response.status_code != 200 or 'html' not in response.get('Content-Type', ''):
+            return Fetched(response.status_code)
+
+        body = response.content
+        digest = content_hash(body)
+        cached = self.cache.get(url, digest)
+        if cached:
+            facts, issues = cached
+            return Fetched(200, content_hash=digest, facts=facts, issues=issues, cached=True)
+        facts = parse_html(body.decode(response.charset or 'utf-8', errors='replace'))
+        issues = check_page(url, facts)
+        self.cache.set(url, digest, facts, issues)
+        return Fetched(200, content_hash=digest, facts=facts, issues=issues)
+
+    def follow(self, url: str, fetched: Fetched) -> List[str]:
+        """URL, на які веде сторінка: редирект, посилання, canonical, hreflang."""
+        if fetched.location:
+            return [fetched.location]
+        if fetched.facts is None:
+            return []
+        targets = list(fetched.facts.links)
+        if fetched.facts.canonical:
+            targets.append(fetched.facts.canonical)
+        targets.extend(fetched.facts.hreflang.values())
+        return [path for path in (self.internal(target, url) for target in targets) if path]
+
+    def crawl(self, seeds: Iterable[str]) -> Dict[str, Fetched]:
+        frontier = Frontier(self.max_pages)
+        for seed in seeds:
+            frontier.push(seed)
+        if self.concurrency <= 1:
+            return self._crawl_serial(frontier)
+        return self._crawl_parallel(frontier)
+
+    def _crawl_serial(self, frontier: 'Frontier') -> Dict[str, Fetched]:
+        # Без пулу: той самий потік і з'єднання з БД (тести в транзакції)
+        pages: Dict[str, Fetched] = {}
+        while frontier:
+            url = frontier.pop()
+            pages[url] = self.fetch(url)
+            frontier.extend(self.follow(url, pages[url]))
+        return pages
+
+    def _crawl_parallel(self, frontier: 'Frontier') -> Dict[str, Fetched]:
+        pages: Dict[str, Fetched] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            running: Dict[Future, str] = {}
+            while frontier or running:
+                while frontier and len(running) < self.concurrency * 2:
+                    url = frontier.pop()
+                    running[executor.submit(self.fetch, url)] = url
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = running.pop(future)
+                    try:
+                        pages[url] = future.result()
+                    except Exception as e:  # noqa: BLE001 - одна зламана сторінка не зупиняє аудит
+                        logger.warning('SEO audit failed to fetch %s: %r', url, e)
+                        pages[url] = Fetched(0)
+                        continue
+                    frontier.extend(self.follow(url, pages[url]))
+        return pages
+
+    def audit(self, seeds: Iterable[str]) -> AuditReport:
+        start = time.monotonic()
+        pages = self.crawl(seeds)
+        issues = [issue for page in pages.values() for issue in page.issues]
+        issues.extend(site_issues(pages, self))
+        self.cache.save(pages)
+        return AuditReport(pages, issues, time.monotonic() - start)
+
+
+def resolve(pages: Dict[str, Fetched], url: str) -> Tuple[List[str], Optional[int]]:
+    """Ланцюжок редиректів від url та фінальний статус (None - цикл або не обійдено)."""
+    chain = [url]
+    while True:
+        page = pages.get(chain[-1])
+        if page is None:
+            return chain, None
+        if not page.location:
+            return chain, page.status
+        if page.location in chain or len(chain) > MAX_REDIRECT_HOPS:
+            return chain + [page.location], None
+        chain.append(page.location)
+
+
+def _redirect_issues(pages: Dict[str, Fetched], url: str) -> List[Issue]:
+    chain, status = resolve(pages, url)
+    issues = []
+    if status is None and chain[-1] in chain[:-1]:
+        issues.append(Issue('redirect_loop', url, ' -> '.join(chain)))
+    elif len(chain) > 2:
+        issues.append(Issue('redirect_chain', url, ' -> '.join(chain)))
+    if status is not None and status != 200:
+        issues.append(Issue('redirect_to_error', url, f'{chain[-1]} {status}'))
+    return issues
+
+
+def link_issues(pages: Dict[str, Fetched], auditor: SeoAuditor) -> List[Issue]:
+    """Редиректи (цикли, ланцюжки, на помилку) та посилання на биті сторінки чи редиректи."""
+    issues = []
+    for url, page in pages.items():
+        if page.location is not None:
+            issues.extend(_redirect_issues(pages, url))
+        if page.facts is None:
+            continue
+        for href in dict.fromkeys(page.facts.links):
+            target = auditor.internal(href, url)
+            if not target:
+                continue
+            chain, status = resolve(pages, target)
+            if status is not None and status >= 400:
+                issues.append(Issue('broken_link', url, f'{target} {status}'))
+            elif len(chain) > 1:
+                issues.append(Issue('link_to_redirect', url, f'{target} -> {chain[-1]}'))
+    return issues
+
+
+def _hreflang_issue(pages: Dict[str, Fetched], auditor: SeoAuditor, url: str, lang: str, href: str) -> Optional[Issue]:
+    target = auditor.internal(href, url)
+    if not target:
+        return None
+    chain, status = resolve(pages, target)
+    if status != 200 or len(chain) > 1:
+        return Issue('hreflang_not_ok', url, f'{lang}: {href}')
+    own_lang = page_language(urlsplit(url).path)
+    if lang == own_lang:
+        return None
+    # Сторінка-пара має посилатись назад на цю сторінку
+    pair = pages[target].facts
+    back = auditor.internal(pair.hreflang.get(own_lang, ''), target) if pair else None
+    if back is None or normalize_path(urlsplit(back).path) != normalize_path(urlsplit(url).path):
+        return Issue('hreflang_not_reciprocal', url, f'{lang}: {target} -> {back}')
+    return None
+
+
+def canonical_issues(pages: Dict[str, Fetched], auditor: SeoAuditor) -> List[Issue]:
+    """Canonical та hreflang мають вести на сторінки з 200 без редиректів, hreflang - взаємно."""
+    issues = []
+    for url, page in pages.items():
+        facts = page.facts
+        if facts is None:
+            continue
+        if facts.canonical:
+            target = auditor.internal(facts.canonical, url)
+            if target and resolve(pages, target) != ([target], 200):
+                issues.append(Issue('canonical_not_ok', url, facts.canonical))
+        for lang, href in facts.hreflang.items():
+            issue = _hreflang_issue(pages, auditor, url, lang, href)
+            if issue is not None:
+                issues.append(issue)
+    return issues
+
+
+def duplicate_issues(pages: Dict[str, Fetched]) -> List[Issue]:
+    """Однакові title/description серед канонічних сторінок (пагінація та ?utm не рахуються)."""
+    titles, descriptions = defaultdict(list), defaultdict(list)
+    for url, page in pages.items():
+        if page.facts is None or '?' in url:
+            continue
+        if page.facts.title:
+            titles[page.facts.title].append(url)
+        if page.facts.description:
+            descriptions[page.facts.description].append(url)
+
+    issues = []
+    for code, groups in (('duplicate_title', titles), ('duplicate_description', descriptions)):
+        for urls in groups.values():
+            distinct = sorted({normalize_path(url) for url in urls})
+            if len(distinct) > 1:
+                issues.append(Issue(code, distinct[0], f'{len(distinct)} pages: {", ".join(distinct[:5])}'))
+    return issues
+
+
+def site_issues(pages: Dict[str, Fetched], auditor: SeoAuditor) -> List[Issue]:
+    """Перевірки між сторінками (не кешуються - залежать від усього сайту)."""
+    return link_issues(pages, auditor) + canonical_issues(pages, auditor) + duplicate_issues(pages)
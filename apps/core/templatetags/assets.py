@@ -0,0 +1,74 @@
+"""
+Template tags для підключення зібраних бандлів (див. apps.core.assets).
+
+Якщо manifest не зібрано (локальна розробка, тести) - теги рендерять
+окремі <link>/<script> з тих самих списків, тому шаблони не залежать від збірки.
+"""
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from apps.core.assets import CSS_BUNDLES, HTMX_CDN_URL, JS_ENTRIES, load_manifest
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset_css(name: str) -> str:
+    """Critical CSS інлайн + один <link> на бандл (або окремі <link> без manifest)."""
+    manifest = load_manifest()
+    bundle = manifest['css'].get(name) if manifest else None
+
+    if not bundle:
+        return format_html_join(
+            '\n', '<link rel="stylesheet" href="{}">',
+            ((static(path),) for path in CSS_BUNDLES[name])
+        )
+
+    parts = []
+    if bundle.get('critical_css'):
+        # CSS з власних файлів збірки, не з користувацького вводу
+        parts.append(mark_safe(f"<style>{bundle['critical_css']}</style>"))
+    parts.append(format_html('<link rel="stylesheet" href="{}">', static(bundle['file'])))
+    return mark_safe('\n'.join(parts))
+
+
+@register.simple_tag
+def asset_modulepreload(name: str) -> str:
+    """<link rel="modulepreload"> для статичного графу імпортів точок входу."""
+    manifest = load_manifest()
+    bundle = manifest['js'].get(name) if manifest else None
+    if not bundle:
+        return ''
+    return format_html_join(
+        '\n', '<link rel="modulepreload" href="{}">',
+        ((static(path),) for path in bundle['modulepreload'])
+    )
+
+
+@register.simple_tag
+def asset_js_entries(name: str) -> str:
+    """<script type="module"> для точок входу бандла."""
+    return format_html_join(
+        '\n', '<script src="{}" type="module" defer></script>',
+        ((static(path),) for path in JS_ENTRIES[name])
+    )
+
+
+@register.simple_tag
+def htmx_script() -> str:
+    """Локальна копія htmx, якщо вона зібрана; інакше - CDN."""
+    manifest = load_manifest()
+    if manifest and manifest.get('htmx'):
+        return format_html('<script src="{}" defer></script>', static(manifest['htmx']))
+    return format_html('<script src="{}" defer></script>', HTMX_CDN_URL)
+
+
+@register.simple_tag
+def htmx_preconnect() -> str:
+    """Preconnect до CDN потрібен тільки коли htmx не завендорено."""
+    manifest = load_manifest()
+    if manifest and manifest.get('htmx'):
+        return ''
+    return mark_safe('<link rel="preconnect" href="https://unpkg.com" crossorigin>')
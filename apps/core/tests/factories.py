@@ -1,14 +1,159 @@
 """
 Factory classes for creating test data.
+
+Використовуються тестами (бюджети запитів) та бенчмарками
+(scripts/bench_hot_paths.py, seed_site_content) - працюють з будь-якою БД.
 """
-# import factory
-# from apps.core.models import YourModel
+import factory
+from django.utils import timezone
+
+from apps.core.models import (
+    FAQ, Achievement, Advantage, AdvantageItem, ConsultationRequest, ContactInfo, Course,
+    CourseCategory, NewsArticle, RunningLineText, Testimonial,
+)
+from apps.leads.models import TrialLesson
+
+PARAGRAPH = (
+    '<p>Англійська для дорослих та дітей: розмовна практика, граматика та підготовка '
+    'до іспитів з викладачами Speak Up.</p>'
+)
+
+
+class NewsArticleFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = NewsArticle
+
+    slug_uk = factory.Sequence(lambda n: f'news-{n}')
+    slug_ru = factory.Sequence(lambda n: f'news-ru-{n}')
+    title_uk = factory.Sequence(lambda n: f'Новина {n}')
+    title_ru = factory.Sequence(lambda n: f'Новость {n}')
+    content_uk = PARAGRAPH * 8
+    content_ru = PARAGRAPH * 8
+    meta_description_uk = 'Новини школи англійської мови Speak Up'
+    meta_description_ru = 'Новости школы английского языка Speak Up'
+    old_url_uk = factory.Sequence(lambda n: f'/news/old-{n}')
+    old_url_ru = factory.Sequence(lambda n: f'/ru/news/old-{n}')
+    published_at = factory.Sequence(lambda n: timezone.now() - timezone.timedelta(days=n))
+
+
+class TestimonialFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Testimonial
+
+    name = factory.Sequence(lambda n: f'Відгук {n}')
+    text = 'Дуже подобаються заняття, за пів року заговорила англійською.'
+    rating = 5
+    is_published = True
+
+
+class AchievementFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Achievement
+
+    number = factory.Sequence(lambda n: (n + 1) * 100)
+    label_uk = factory.Sequence(lambda n: f'Досягнення {n}')
+    suffix = '+'
+    order = factory.Sequence(lambda n: n)
+
+
+class AdvantageFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Advantage
+
+    title_uk = factory.Sequence(lambda n: f'Перевага {n}')
+    order = factory.Sequence(lambda n: n)
+
+
+class AdvantageItemFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = AdvantageItem
+
+    advantage = factory.SubFactory(AdvantageFactory)
+    text_uk = factory.Sequence(lambda n: f'Пункт {n}')
+    order = factory.Sequence(lambda n: n)
+
+
+class CourseCategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CourseCategory
+
+    name_uk = factory.Sequence(lambda n: f'Категорія {n}')
+    slug = factory.Sequence(lambda n: f'category-{n}')
+    order = factory.Sequence(lambda n: n)
+
+
+class CourseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Course
+
+    category = factory.SubFactory(CourseCategoryFactory)
+    title_uk = factory.Sequence(lambda n: f'Курс {n}')
+    short_desc_uk = 'Короткий опис курсу'
+    detail_content_uk = PARAGRAPH
+    slug = factory.Sequence(lambda n: f'course-{n}')
+    order = factory.Sequence(lambda n: n)
+
+
+class FAQFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = FAQ
+
+    question_uk = factory.Sequence(lambda n: f'Питання {n}?')
+    answer_uk = 'Відповідь на питання'
+    order = factory.Sequence(lambda n: n)
+
+
+class ContactInfoFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ContactInfo
+
+    phone_uk = '+38 (093) 170-78-67'
+    schedule_weekdays_uk = 'Пн-Пт: 10:00-21:30'
+    schedule_weekend_uk = 'Сб: 11:00-15:00'
+
+
+class RunningLineTextFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = RunningLineText
+
+    text = factory.Sequence(lambda n: f'Акція {n}')
+    order = factory.Sequence(lambda n: n)
+
+
+class TrialLessonFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = TrialLesson
+
+    name = factory.Sequence(lambda n: f'Учень {n}')
+    phone = factory.Sequence(lambda n: f'+380{930000000 + n % 10 ** 8}')
+    utm_source = 'google'
 
-# class YourModelFactory(factory.django.DjangoModelFactory):
-#     class Meta:
-#         model = YourModel
 
+class ConsultationRequestFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ConsultationRequest
 
+    name = factory.Sequence(lambda n: f'Клієнт {n}')
+    phone = factory.Sequence(lambda n: f'+380{500000000 + n % 10 ** 8}')
 
 
+def seed_site_content(news: int = 12, testimonials: int = 12, categories: int = 3, per_category: int = 3) -> None:
+    """
+    Контент головної, новин та відгуків: кілька записів кожної моделі,
+    що виводиться в циклах шаблонів (щоб N+1 проявлялись).
 
+    Лічильники slug починаються з 0 (news-0, /news/old-0), тож викликати
+    для порожньої БД.
+    """
+    for factory_class in (NewsArticleFactory, CourseCategoryFactory, CourseFactory):
+        factory_class.reset_sequence()
+    RunningLineTextFactory.create_batch(3)
+    ContactInfoFactory()
+    AchievementFactory.create_batch(4)
+    for advantage in AdvantageFactory.create_batch(3):
+        AdvantageItemFactory.create_batch(3, advantage=advantage)
+    for category in CourseCategoryFactory.create_batch(categories):
+        CourseFactory.create_batch(per_category, category=category)
+    TestimonialFactory.create_batch(testimonials)
+    FAQFactory.create_batch(5)
+    NewsArticleFactory.create_batch(news)
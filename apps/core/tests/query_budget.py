@@ -0,0 +1,39 @@
+"""
+Бюджети SQL запитів для тестів сторінок (apps.core.query_budget).
+
+    class MyTest(QueryBudgetMixin, TestCase):
+        def test_index(self):
+            self.assertQueryBudget('/', 7)
+
+Перевищення бюджету або повторювана форма SQL (N+1) валить тест зі
+списком форм запитів у повідомленні.
+"""
+from apps.core import query_budget
+
+
+class QueryBudgetMixin:
+    """Mixin для TestCase: assertQueryBudget / assertNoRepeatedQueries."""
+
+    # Одна форма SQL N+ разів за запит вважається N+1
+    repeat_threshold = 3
+
+    def request_recorded(self, path, method='get', data=None, **extra):
+        with query_budget.record_queries() as recorder:
+            response = getattr(self.client, method)(path, data, **extra)
+        return response, recorder
+
+    def assertQueryBudget(self, path, budget, method='get', data=None, status=200, **extra):
+        """Запит до path виконує не більше budget SQL запитів і без N+1."""
+        response, recorder = self.request_recorded(path, method, data, **extra)
+        self.assertEqual(response.status_code, status, f'{method.upper()} {path}')
+        if recorder.count > budget:
+            self.fail(
+                f'{method.upper()} {path}: {recorder.count} queries, budget {budget}\n'
+                + '\n'.join(f'  {count}x {shape[:300]}' for shape, count in recorder.shapes.most_common())
+            )
+        self.assertNoRepeatedQueries(recorder, f'{method.upper()} {path}')
+        return response
+
+    def assertNoRepeatedQueries(self, recorder, label=''):
+        if recorder.repeated(self.repeat_threshold):
+            self.fail(f'{label}: possible N+1\n{query_budget.format_report(recorder, self.repeat_threshold)}')
@@ -0,0 +1,53 @@
+"""
+Тести для збірки статичних ресурсів (apps.core.assets).
+"""
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from apps.core.assets import CRITICAL_CSS, CSS_BUNDLES, load_manifest, minify_css, resolve_js_graph
+
+
+class MinifyCssTest(TestCase):
+    """Тести для minify_css"""
+
+    def test_strips_comments_and_whitespace(self):
+        css = '/* header */\n.a > .b {\n  color: red;\n  margin: 0 auto;\n}\n'
+        self.assertEqual(minify_css(css), '.a>.b{color:red;margin:0 auto}')
+
+    def test_keeps_significant_spaces(self):
+        """Пробіли в calc() та перед псевдокласом значущі."""
+        css = '.a :hover { width: calc(100% - 2px); }'
+        self.assertEqual(minify_css(css), '.a :hover{width:calc(100% - 2px)}')
+
+
+class AssetDefinitionsTest(TestCase):
+    """Перевірка узгодженості визначень бандлів"""
+
+    def test_critical_css_is_bundle_prefix(self):
+        for name, critical in CRITICAL_CSS.items():
+            with self.subTest(bundle=name):
+                self.assertEqual(CSS_BUNDLES[name][:len(critical)], critical)
+
+    def test_js_graph_follows_static_imports(self):
+        deps = resolve_js_graph('js/modules/faq-accordion.js')
+        self.assertEqual(deps, ['js/modules/base-accordion.js'])
+
+
+@override_settings(ASSET_BUNDLES_ENABLED=False)
+class AssetTagsFallbackTest(TestCase):
+    """Без manifest теги рендерять окремі файли"""
+
+    def setUp(self):
+        load_manifest.cache_clear()
+
+    def tearDown(self):
+        load_manifest.cache_clear()
+
+    def test_asset_css_fallback(self):
+        html = Template("{% load assets %}{% asset_css 'base' %}").render(Context())
+        self.assertEqual(html.count('<link rel="stylesheet"'), len(CSS_BUNDLES['base']))
+        self.assertNotIn('<style>', html)
+
+    def test_htmx_uses_cdn_without_manifest(self):
+        html = Template('{% load assets %}{% htmx_script %}').render(Context())
+        self.assertIn('unpkg.com/htmx.org', html)
@@ -0,0 +1,103 @@
+"""
+Тести стиснення: склеєний gzip, варіанти кешу сторінок, стиснення на льоту.
+"""
+import gzip
+import re
+import zlib
+
+import brotli
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from apps.core import compression
+from apps.core.page_cache import csrf_secret_from_token, get_cache
+
+
+class SplicedGzipTest(SimpleTestCase):
+    """Тести assemble_gzip: частини + токен дають валідний gzip потік."""
+
+    def test_segments_with_token_decompress_to_full_body(self):
+        segments = [b'<html>' + b'a' * 5000, b'<p>middle</p>' * 100, b'</html>']
+        deflated = compression.precompress_segments(segments)
+
+        token = b'T' * compression.TOKEN_SLOT
+        data = compression.assemble_gzip(segments, deflated, token)
+        self.assertEqual(gzip.decompress(data), token.join(segments))
+
+    def test_dictionary_keeps_ratio_close_to_whole_body(self):
+        # Схожі частини: без словника кожна стискалась би з нуля
+        segments = [
+            b''.join(b'<div class="card" id="item-%d"><p>Speak Up English school</p></div>\n' % (part * 1000 + i)
+                     for i in range(200))
+            for part in range(3)
+        ]
+        token = b'a' * compression.TOKEN_SLOT
+        deflated = compression.precompress_segments(segments)
+        data = compression.assemble_gzip(segments, deflated, token)
+        self.assertEqual(gzip.decompress(data), token.join(segments))
+        whole = zlib.compress(token.join(segments), compression.GZIP_LEVEL)
+        self.assertLess(sum(len(part) for part in deflated), len(whole) * 1.1)
+
+    def test_token_length_checked(self):
+        segments = [b'a', b'b']
+        with self.assertRaises(ValueError):
+            compression.assemble_gzip(segments, compression.precompress_segments(segments), b'short')
+
+    def test_single_segment_and_empty_body(self):
+        for body in (b'<html>single</html>', b''):
+            data = compression.assemble_gzip([body], compression.precompress_segments([body]), b'')
+            self.assertEqual(gzip.decompress(data), body)
+
+    def test_header_is_randomized(self):
+        segments = [b'x' * 100]
+        deflated = compression.precompress_segments(segments)
+        lengths = {len(compression.assemble_gzip(segments, deflated, b'')) for _ in range(20)}
+        self.assertGreater(len(lengths), 1)
+
+    def test_choose_encoding(self):
+        self.assertEqual(compression.choose_encoding('gzip, deflate, br', True), 'br')
+        self.assertEqual(compression.choose_encoding('gzip, deflate, br', False), 'gzip')
+        self.assertIsNone(compression.choose_encoding('identity', True))
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, GTM_TRACKING_ENABLED=False)
+class CompressedPageCacheTest(TestCase):
+    """Тести віддачі стиснутих варіантів з кешу сторінок."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = Client()
+
+    def tearDown(self):
+        get_cache().clear()
+
+    def test_cached_gzip_contains_fresh_csrf_token(self):
+        self.client.get('/faq')
+
+        visitor = Client(enforce_csrf_checks=True)
+        response = visitor.get('/faq', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        # Сторінка з CSRF токеном: brotli не склеюється, тож gzip
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        html = gzip.decompress(response.content).decode()
+        self.assertNotIn('__PAGE_CACHE_CSRF_TOKEN__', html)
+        token = re.search(r'name="csrf-token" content="([^"]+)"', html).group(1)
+        self.assertEqual(csrf_secret_from_token(token), response.cookies['csrftoken'].value)
+
+    def test_identity_when_not_accepted(self):
+        self.client.get('/faq')
+        response = self.client.get('/faq')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn(b'</html>', response.content)
+
+    def test_uncached_response_compressed_on_the_fly(self):
+        response = self.client.get('/faq', HTTP_ACCEPT_ENCODING='br')
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn(b'</html>', brotli.decompress(response.content))
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 7)
+    def test_small_responses_not_compressed(self):
+        response = self.client.get('/faq', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
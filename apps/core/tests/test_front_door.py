@@ -0,0 +1,118 @@
+"""
+Тести для FrontDoorMiddleware (класифікація запитів до sessions/locale/CSRF) та HostPolicy.
+"""
+from django.http import HttpResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from apps.core.hosts import HostPolicy
+from apps.core.middleware import FrontDoorMiddleware, RequestClass
+
+
+def downstream(request):
+    return HttpResponse('downstream')
+
+
+@override_settings(GTM_TRACKING_ENABLED=False, SECURE_SSL_REDIRECT=False)
+class FrontDoorMiddlewareTest(SimpleTestCase):
+    """Тести класифікації та термінальних відповідей."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = FrontDoorMiddleware(downstream)
+
+    def test_healthz_for_any_client(self):
+        request = self.factory.get('/healthz')
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'OK')
+        self.assertEqual(request.front_door, RequestClass.HEALTHCHECK)
+
+    def test_root_healthcheck_only_for_render(self):
+        response = self.middleware(self.factory.get('/', HTTP_USER_AGENT='Render/1.0'))
+        self.assertEqual(response.content, b'OK')
+
+        request = self.factory.get('/', HTTP_USER_AGENT='Mozilla/5.0')
+        response = self.middleware(request)
+        self.assertEqual(response.content, b'downstream')
+        self.assertEqual(request.front_door, RequestClass.NORMAL)
+
+    def test_wordpress_probe_gone(self):
+        for path in ['/wp-login.php', '/wp-content/uploads/a.jpg', '/wp-anything.php', '/xmlrpc.php']:
+            with self.subTest(path=path):
+                request = self.factory.get(path)
+                response = self.middleware(request)
+                self.assertEqual(response.status_code, 410)
+                self.assertEqual(request.front_door, RequestClass.WORDPRESS_PROBE)
+
+    def test_head_response_without_body(self):
+        for path in ['/about', '/wp-login.php']:
+            with self.subTest(path=path):
+                get_response = self.middleware(self.factory.get(path))
+                response = self.middleware(self.factory.head(path))
+                self.assertEqual(response.content, b'')
+                self.assertEqual(response['Content-Length'], str(len(get_response.content)))
+
+    def test_legacy_redirect_with_trailing_slash(self):
+        request = self.factory.get('/courses/')
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response['Location'], '/programs/')
+        self.assertEqual(request.front_door, RequestClass.LEGACY_REDIRECT)
+
+        # '/faqs//' немає в REDIRECTS, але '/faqs' є
+        response = self.middleware(self.factory.get('/faqs//'))
+        self.assertEqual(response['Location'], '/faq')
+
+    @override_settings(SECURE_SSL_REDIRECT=True)
+    def test_legacy_redirect_upgrades_to_https_first(self):
+        middleware = FrontDoorMiddleware(downstream)
+        response = middleware(self.factory.get('/courses/'))
+        self.assertEqual(response.status_code, 301)
+        self.assertTrue(response['Location'].startswith('https://'))
+
+        # Healthcheck по HTTP не редиректиться
+        response = middleware(self.factory.get('/healthz'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_google_ads_bot_is_not_terminal(self):
+        request = self.factory.get('/programs/', HTTP_USER_AGENT='AdsBot-Google (+http://www.google.com/adsbot.html)')
+        response = self.middleware(request)
+        self.assertEqual(response.content, b'downstream')
+        self.assertEqual(request.front_door, RequestClass.KNOWN_BOT)
+        self.assertTrue(request._google_ads_bot)
+
+    @override_settings(ALLOWED_HOSTS=['speakup.com.ua'])
+    def test_unknown_host_rejected_but_healthcheck_passes(self):
+        middleware = FrontDoorMiddleware(downstream)
+        request = self.factory.get('/programs/', HTTP_HOST='evil.example')
+        response = middleware(request)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(request.front_door, RequestClass.INVALID_HOST)
+
+        # Render healthcheck приходить з внутрішньою IP в Host
+        response = middleware(self.factory.get('/healthz', HTTP_HOST='10.228.1.2:10000'))
+        self.assertEqual(response.status_code, 200)
+
+
+class HostPolicyTest(SimpleTestCase):
+    """Тести HostPolicy (set/suffix matching, LRU спостережених хостів)."""
+
+    def test_exact_and_suffix_matching(self):
+        policy = HostPolicy(['speakup.com.ua', '.onrender.com'])
+        self.assertEqual(policy.check('speakup.com.ua:443'), ('speakup.com.ua', True))
+        self.assertTrue(policy.check('speakup-new.onrender.com')[1])
+        self.assertTrue(policy.check('onrender.com')[1])
+        self.assertFalse(policy.check('speakup.com.ua.evil.example')[1])
+
+    def test_wildcard_rejects_only_junk(self):
+        policy = HostPolicy(['*'])
+        self.assertTrue(policy.check('anything.example')[1])
+        for raw_host in ['', 'bad host', 'a' * 300, 'exa mple.com:80', 'host:port:1']:
+            with self.subTest(raw_host=raw_host):
+                self.assertEqual(policy.check(raw_host), ('', False))
+
+    @override_settings(ALLOWED_HOSTS=['speakup.com.ua'], CANONICAL_DOMAIN='https://www.speakup.com.ua')
+    def test_policy_matches_allowed_hosts(self):
+        # Не пропускаємо хости, які Django get_host() відхилить
+        policy = HostPolicy.from_settings()
+        self.assertTrue(policy.check('speakup.com.ua')[1])
+        self.assertFalse(policy.check('www.speakup.com.ua')[1])
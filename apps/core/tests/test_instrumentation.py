@@ -0,0 +1,79 @@
+"""
+Тести інструментування запитів: Server-Timing, семпли в лозі, лічильники кешів.
+"""
+import json
+import re
+
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from apps.core import instrumentation
+
+
+@override_settings(SERVER_TIMING_ENABLED=True, GTM_TRACKING_ENABLED=False)
+class ServerTimingTest(TestCase):
+    """Тести заголовка Server-Timing."""
+
+    def test_phases_present(self):
+        response = Client().get('/news/')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        for name in ('total', 'mw', 'view', 'db', 'tpl', 'ctx'):
+            self.assertRegex(timing, rf'(^|, ){name};dur=[\d.]+')
+
+    def test_db_queries_counted(self):
+        response = Client().get('/news/')
+        queries = int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response['Server-Timing']).group(1))
+        self.assertGreater(queries, 0)
+
+    def test_front_door_response_without_view(self):
+        # WordPress 410 віддає FrontDoorMiddleware - view не викликається
+        response = Client().get('/wp-login.php')
+        self.assertIn('view;dur=0.0', response['Server-Timing'])
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled(self):
+        self.assertNotIn('Server-Timing', Client().get('/news/'))
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_middleware_removed_when_disabled(self):
+        response = Client().get('/news/')
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(GTM_TRACKING_ENABLED=False)
+class SampledLogTest(TestCase):
+    """Тести JSON семплів у лозі apps.core.instrumentation."""
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_sampled_request_logged(self):
+        with self.assertLogs('apps.core.instrumentation', level='INFO') as logs:
+            Client().get('/news/')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], '/news/')
+        self.assertEqual(record['view'], 'core:news_list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['db_queries'], 0)
+        self.assertIn('forms_context', record['context_processors'])
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=0, INSTRUMENTATION_SLOW_MS=0)
+    def test_slow_request_always_logged(self):
+        with self.assertLogs('apps.core.instrumentation', level='INFO'):
+            Client().get('/news/')
+
+
+class RecordCacheTest(SimpleTestCase):
+    """Тести record_cache."""
+
+    def test_counts_within_request_only(self):
+        instrumentation.record_cache('page', True)
+
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        try:
+            instrumentation.record_cache('page', True)
+            instrumentation.record_cache('page', False)
+            instrumentation.record_cache('page', True)
+        finally:
+            instrumentation.deactivate(token)
+
+        self.assertEqual(metrics.cache, {'page': [2, 1]})
+        self.assertIn('cache-page;desc="2 hit, 1 miss"', instrumentation.server_timing(metrics, 0.01))
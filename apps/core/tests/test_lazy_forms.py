@@ -0,0 +1,59 @@
+"""
+Тести лінивих unbound форм з кешованим HTML полів.
+"""
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import SimpleTestCase
+from django.utils import translation
+from apps.core.forms import ConsultationForm
+from apps.core.utils.lazy_forms import LazyForm, clear_form_cache
+from apps.leads.forms import TrialLessonForm
+
+TEMPLATE = Template(
+    '{{ form.name }}{% if form.name.errors %}ERR{% endif %}'
+    '<label for="{{ form.prefers_messenger.id_for_label }}">{{ form.prefers_messenger.label }}</label>'
+)
+
+
+class LazyFormTest(SimpleTestCase):
+    """Тести LazyForm / CachedBoundField."""
+
+    def setUp(self):
+        clear_form_cache()
+
+    def tearDown(self):
+        clear_form_cache()
+
+    def test_renders_same_html_as_real_form(self):
+        form = ConsultationForm()
+        expected = Template(TEMPLATE.source).render(Context({'form': form}))
+        self.assertEqual(TEMPLATE.render(Context({'form': LazyForm(ConsultationForm)})), expected)
+
+    def test_form_not_instantiated_when_unused_or_cached(self):
+        with mock.patch.object(TrialLessonForm, '__init__', side_effect=AssertionError('instantiated')):
+            Template('{% if False %}{{ form.name }}{% endif %}').render(Context({'form': LazyForm(TrialLessonForm)}))
+
+        Template('{{ form.name }}').render(Context({'form': LazyForm(TrialLessonForm)}))
+        with mock.patch.object(TrialLessonForm, '__init__', side_effect=AssertionError('instantiated')):
+            html = Template('{{ form.name }}{{ form.name.errors }}').render(
+                Context({'form': LazyForm(TrialLessonForm)})
+            )
+        self.assertIn('name="name"', html)
+
+    def test_cache_is_per_language(self):
+        lazy = LazyForm(TrialLessonForm)
+        with translation.override('uk'):
+            str(lazy['name'])
+        with translation.override('ru'):
+            str(lazy['name'])
+        with mock.patch.object(TrialLessonForm, '__init__', side_effect=AssertionError('instantiated')):
+            with translation.override('ru'):
+                str(LazyForm(TrialLessonForm)['name'])
+
+    def test_non_field_attributes_delegate_to_form(self):
+        lazy = LazyForm(TrialLessonForm)
+        self.assertFalse(lazy.is_bound)
+        self.assertEqual(lazy.errors, {})
+        with self.assertRaises(KeyError):
+            lazy['missing']
@@ -0,0 +1,100 @@
+"""
+Тести метрик Prometheus: registry, злиття знімків workers, /metrics.
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from apps.core import metrics
+
+
+class RegistryTest(SimpleTestCase):
+    """Тести лічильників, гістограм та злиття знімків."""
+
+    def setUp(self):
+        metrics.registry.reset()
+
+    def tearDown(self):
+        metrics.registry.reset()
+
+    def test_histogram_buckets_are_cumulative(self):
+        metrics.request_latency.observe(0.003, 'core:index')
+        metrics.request_latency.observe(0.2, 'core:index')
+        metrics.request_latency.observe(20, 'core:index')
+
+        text = metrics.render(metrics.merge([metrics.registry.snapshot()]))
+        self.assertIn('speakup_request_duration_seconds_bucket{view="core:index",le="0.005"} 1', text)
+        self.assertIn('speakup_request_duration_seconds_bucket{view="core:index",le="0.25"} 2', text)
+        self.assertIn('speakup_request_duration_seconds_bucket{view="core:index",le="+Inf"} 3', text)
+        self.assertIn('speakup_request_duration_seconds_count{view="core:index"} 3', text)
+
+    def test_workers_summed_and_dead_gauges_dropped(self):
+        metrics.redirects.inc('static')
+        own = metrics.registry.snapshot()
+        # Worker, що вже завершився: лічильники враховуються, gauge - ні
+        dead = json.loads(json.dumps(own))
+        dead['pid'] = 2 ** 22 + 12345
+        dead['metrics']['speakup_background_queue_depth'] = [[[], 7.0]]
+
+        merged = metrics.merge([own, dead])
+        self.assertEqual(merged['speakup_redirects_total'][('static',)], 2)
+        own_depth = own['metrics']['speakup_background_queue_depth'][0][1]
+        self.assertEqual(merged['speakup_background_queue_depth'][()], own_depth)
+
+    def test_flush_and_collect_from_shared_dir(self):
+        metrics.leads.inc('trial', 'created')
+        with tempfile.TemporaryDirectory() as directory:
+            other = {'pid': os.getpid() + 1, 'metrics': {'speakup_leads_total': [[['trial', 'created'], 2]]}}
+            Path(directory, 'other.json').write_text(json.dumps(other), encoding='utf-8')
+            with override_settings(METRICS_DIR=directory):
+                merged = metrics.merge(metrics.collect())
+            self.assertTrue(Path(directory, f'{os.getpid()}.json').exists())
+        self.assertEqual(merged['speakup_leads_total'][('trial', 'created')], 3)
+
+    def test_cache_hit_ratio(self):
+        from apps.core.instrumentation import record_cache
+
+        for hit in (True, True, True, False):
+            record_cache('page', hit)
+        text = metrics.render(metrics.merge([metrics.registry.snapshot()]))
+        self.assertIn('speakup_cache_lookups_total{cache="page",result="hit"} 3', text)
+        self.assertIn('speakup_cache_hit_ratio{cache="page"} 0.75', text)
+
+
+@override_settings(METRICS_TOKEN='secret-token', GTM_TRACKING_ENABLED=False)
+class MetricsEndpointTest(TestCase):
+    """Тести /metrics та лічильників на реальних запитах."""
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.client = Client()
+
+    def tearDown(self):
+        metrics.registry.reset()
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret-token')
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_requires_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 404)
+
+    def test_latency_and_redirects_counted(self):
+        self.client.get('/news/')
+        self.client.get('/wp-login.php')
+
+        text = self.scrape()
+        self.assertIn('speakup_request_duration_seconds_count{view="core:news_list"} 1', text)
+        self.assertIn('speakup_request_duration_seconds_count{view="front_door:wordpress_probe"} 1', text)
+        self.assertIn('speakup_redirects_total{type="wordpress_410"} 1', text)
+        self.assertIn('# TYPE speakup_background_queue_depth gauge', text)
+
+    def test_honeypot_counted(self):
+        self.client.post('/leads/api/trial-form/', {'contact_me_by_fax_only': 'bot'})
+        self.assertIn('speakup_leads_total{form="trial",result="honeypot"} 1', self.scrape())
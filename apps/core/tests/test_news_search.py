@@ -0,0 +1,71 @@
+"""
+Тести повнотекстового пошуку новин (apps.core.news_search).
+"""
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from apps.core import news_search
+from apps.core.models import NewsArticle
+from .factories import NewsArticleFactory
+
+
+@override_settings(GTM_TRACKING_ENABLED=False)
+class NewsSearchTest(TestCase):
+    """Індекс, ранжування, сторінка пошуку та admin."""
+
+    def setUp(self):
+        self.in_title = NewsArticleFactory(title_uk='Граматика англійської мови', title_ru='Грамматика английского')
+        self.in_body = NewsArticleFactory(content_uk='<p>Трохи про граматику &amp; вимову</p><script>var x;</script>')
+        self.draft = NewsArticleFactory(title_uk='Граматика для чернетки', is_published=False)
+
+    def test_html_to_text(self):
+        self.assertEqual(news_search.html_to_text('<p>A &amp; <b>B</b></p><style>p{}</style>'), 'A & B')
+
+    def test_ranked_prefix_search(self):
+        ids = news_search.search('грамат')
+        self.assertEqual(ids[:2], [self.in_title.pk, self.in_body.pk])
+        self.assertNotIn(self.draft.pk, ids)
+        self.assertIn(self.draft.pk, news_search.search('грамат', published_only=False))
+        self.assertEqual(news_search.search('грамм', lang='ru'), [self.in_title.pk])
+        self.assertEqual(news_search.search('"*) OR'), [])
+
+    def test_index_follows_save_and_delete(self):
+        self.in_body.title_uk = 'Фонетика'
+        self.in_body.save()
+        self.assertEqual(news_search.search('фонетика'), [self.in_body.pk])
+
+        self.in_body.delete()
+        self.assertEqual(news_search.search('фонетика'), [])
+
+    def test_search_view_paginates_in_rank_order(self):
+        NewsArticleFactory.create_batch(10, title_uk='Вимова англійською')
+        response = self.client.get('/news/search/', {'q': 'вимов'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total'], 11)
+        self.assertEqual(len(response.context['page_obj'].object_list), 10)
+        self.assertNotIn(self.in_body, response.context['page_obj'].object_list)
+
+        response = self.client.get('/news/search/', {'q': 'вимов', 'page': 2})
+        self.assertEqual(list(response.context['page_obj'].object_list), [self.in_body])
+        self.assertContains(response, 'noindex')
+
+    def test_admin_search_uses_index(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        response = self.client.get('/admin/core/newsarticle/', {'q': 'граматика'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article.pk for article in response.context['cl'].result_list],
+            [self.in_title.pk, self.draft.pk, self.in_body.pk],
+        )
+
+        response = self.client.get('/admin/core/newsarticle/', {'q': self.in_body.slug_uk})
+        self.assertEqual(list(response.context['cl'].result_list), [NewsArticle.objects.get(pk=self.in_body.pk)])
+
+    def test_admin_search_is_not_capped(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        with mock.patch.object(news_search, 'MAX_RESULTS', 1):
+            response = self.client.get('/admin/core/newsarticle/', {'q': 'граматика'})
+        self.assertEqual(response.context['cl'].result_list[0].pk, self.in_title.pk)
+        self.assertEqual(response.context['cl'].result_count, 3)
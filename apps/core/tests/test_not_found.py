@@ -0,0 +1,84 @@
+"""
+Тести швидкого 404 шляху: negative cache, легка 404 сторінка, top-N трекер.
+"""
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from apps.core.not_found import NegativeCache, NotFoundTracker, negative_cache
+
+
+class NegativeCacheTest(SimpleTestCase):
+    """Тести NegativeCache (LRU + TTL)."""
+
+    def test_bounded_lru(self):
+        cache = NegativeCache(maxsize=2, ttl=60)
+        cache.add('/a')
+        cache.add('/b')
+        cache.add('/c')
+        self.assertNotIn('/a', cache)
+        self.assertIn('/c', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_ignored(self):
+        cache = NegativeCache(ttl=0)
+        cache.add('/a')
+        self.assertNotIn('/a', cache)
+
+
+class NotFoundTrackerTest(SimpleTestCase):
+    """Тести top-N трекера 404."""
+
+    def test_top_and_flush(self):
+        tracker = NotFoundTracker(flush_interval=3600, top_n=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker.log_file = Path(tmp) / 'not_found.log'
+            for path in ['/a', '/b', '/b', '/c', '/c', '/c']:
+                tracker.record(path)
+            self.assertEqual(tracker.top(), [('/c', 3), ('/b', 2)])
+
+            tracker.flush()
+            lines = [json.loads(line) for line in tracker.log_file.read_text(encoding='utf-8').splitlines()]
+            self.assertEqual([(line['path'], line['hits']) for line in lines], [('/c', 3), ('/b', 2)])
+            self.assertEqual(tracker.top(), [])
+
+    def test_sampling_scales_estimate(self):
+        tracker = NotFoundTracker(sample_rate=0.5, flush_interval=3600)
+        with mock.patch('apps.core.not_found.random.random', return_value=0.1):
+            tracker.record('/a')
+            tracker.record('/a')
+        self.assertEqual(tracker.top(), [('/a', 4)])
+
+
+@override_settings(GTM_TRACKING_ENABLED=False)
+class FastNotFoundPathTest(TestCase):
+    """Повторний промах catch-all маршруту обслуговується FrontDoorMiddleware."""
+
+    def setUp(self):
+        negative_cache.clear()
+
+    def tearDown(self):
+        negative_cache.clear()
+
+    def test_repeated_city_miss_served_from_negative_cache(self):
+        response = self.client.get('/no-such-city')
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('/no-such-city', negative_cache)
+
+        response = self.client.get('/no-such-city')
+        self.assertEqual(response.status_code, 404)
+        self.assertContains(response, 'noindex', status_code=404)
+        self.assertContains(response, 'Сторінку не знайдено', status_code=404)
+
+    def test_ru_prefix_gets_ru_page(self):
+        negative_cache.add('/ru/no-such-city')
+        response = self.client.get('/ru/no-such-city')
+        self.assertContains(response, 'Страница не найдена', status_code=404)
+        self.assertEqual(response['Content-Language'], 'ru')
+
+    def test_news_miss_not_cached(self):
+        # Статті в БД можуть з'явитися будь-коли
+        self.client.get('/news/no-such-article/')
+        self.assertNotIn('/news/no-such-article/', negative_cache)
@@ -0,0 +1,89 @@
+"""
+Тести повносторінкового кешу для анонімних GET.
+"""
+import re
+
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, TestCase, Client, override_settings
+from apps.core.models import FAQ
+from apps.core.page_cache import csrf_secret_from_token, get_cache, get_tag_cache
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, GTM_TRACKING_ENABLED=False)
+class PageCacheTest(TestCase):
+    """Тести PageCacheMiddleware та інвалідації."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = Client()
+
+    def tearDown(self):
+        get_cache().clear()
+
+    def test_second_request_served_from_cache_without_queries(self):
+        response = self.client.get('/faq')
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/faq')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+
+    def test_utm_params_share_cache_entry(self):
+        self.client.get('/faq')
+        response = self.client.get('/faq?utm_source=google&utm_campaign=spring&gclid=abc')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    def test_page_param_is_part_of_key_and_unknown_params_bypass(self):
+        self.client.get('/news/')
+        response = self.client.get('/news/?page=2')
+        self.assertNotEqual(response.get('X-Page-Cache'), 'HIT')
+
+        response = self.client.get('/faq?q=test')
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_languages_cached_separately(self):
+        self.client.get('/faq')
+        response = self.client.get('/ru/faq')
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+
+    def test_session_cookie_bypasses_cache(self):
+        self.client.get('/faq')
+        self.client.cookies['sessionid'] = 'abc'
+        response = self.client.get('/faq')
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_fresh_csrf_token_injected(self):
+        self.client.get('/faq')
+
+        visitor = Client(enforce_csrf_checks=True)
+        response = visitor.get('/faq')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        self.assertNotContains(response, '__PAGE_CACHE_CSRF_TOKEN__')
+
+        token = re.search(r'name="csrf-token" content="([^"]+)"', response.content.decode()).group(1)
+        secret = response.cookies['csrftoken'].value
+        self.assertEqual(csrf_secret_from_token(token), secret)
+
+    def test_model_change_purges_dependent_pages_only(self):
+        self.client.get('/faq')
+        self.client.get('/contacts')
+
+        FAQ.objects.create(question_uk='Питання?', answer_uk='Відповідь', order=1)
+
+        self.assertEqual(self.client.get('/faq')['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/contacts')['X-Page-Cache'], 'HIT')
+
+    def test_evicted_tag_version_invalidates_entry(self):
+        self.client.get('/contacts')
+        self.assertEqual(self.client.get('/contacts')['X-Page-Cache'], 'HIT')
+
+        get_tag_cache().clear()
+        self.assertEqual(self.client.get('/contacts')['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/contacts')['X-Page-Cache'], 'HIT')
+
+    def test_csrf_secret_matches_django(self):
+        request = RequestFactory().get('/')
+        token = get_token(request)
+        self.assertEqual(csrf_secret_from_token(token), request.META['CSRF_COOKIE'])
@@ -0,0 +1,78 @@
+"""
+Тести статичного пре-рендеру сторінок.
+"""
+import json
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, Client, override_settings
+from apps.core.models import RunningLineText
+from apps.core.page_cache import csrf_secret_from_token, get_cache
+from apps.core.prerender import build, prerendered_pages, prerender_paths
+
+
+class PrerenderTest(TestCase):
+    """Тести build() та віддачі через PageCacheMiddleware."""
+
+    def setUp(self):
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.settings_override = override_settings(
+            PRERENDER_ENABLED=True, PRERENDER_DIR=self.output_dir, GTM_TRACKING_ENABLED=False,
+        )
+        self.settings_override.enable()
+        get_cache().clear()
+        prerendered_pages.reset()
+        self.manifest = build(self.output_dir, 'testserver', False, ['/about', '/ru/programs/individual'])
+
+    def tearDown(self):
+        self.settings_override.disable()
+        prerendered_pages.reset()
+        get_cache().clear()
+        shutil.rmtree(self.output_dir)
+
+    def test_paths_cover_stubs_and_seo_config_pages(self):
+        paths = prerender_paths()
+        self.assertIn('/about', paths)
+        self.assertIn('/ru/job', paths)
+        self.assertIn('/programs/individual', paths)
+        self.assertIn('/golovna-3/', paths)
+
+    def test_build_writes_pages_with_csrf_placeholder(self):
+        self.assertEqual(set(self.manifest['pages']), {'/about', '/ru/programs/individual'})
+        html = (self.output_dir / 'about.html').read_text(encoding='utf-8')
+        self.assertIn('__PAGE_CACHE_CSRF_TOKEN__', html)
+        self.assertTrue((self.output_dir / 'ru' / 'programs' / 'individual.html').exists())
+
+    def test_served_without_queries_with_fresh_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        with self.assertNumQueries(0):
+            response = client.get('/about')
+        self.assertEqual(response['X-Page-Cache'], 'PRERENDERED')
+
+        html = response.content.decode()
+        self.assertNotIn('__PAGE_CACHE_CSRF_TOKEN__', html)
+        token = re.search(r'name="csrf-token" content="([^"]+)"', html).group(1)
+        self.assertEqual(csrf_secret_from_token(token), response.cookies['csrftoken'].value)
+
+    def test_outdated_fingerprint_ignored(self):
+        manifest_file = self.output_dir / 'manifest.json'
+        manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+        manifest['fingerprint'] = 'old'
+        manifest_file.write_text(json.dumps(manifest), encoding='utf-8')
+
+        response = Client().get('/about')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get('X-Page-Cache'), 'PRERENDERED')
+
+    def test_model_change_after_build_falls_back_to_view(self):
+        RunningLineText.objects.create(text='Нова акція')
+        response = Client().get('/about')
+        self.assertNotEqual(response.get('X-Page-Cache'), 'PRERENDERED')
+        self.assertContains(response, 'Нова акція')
+
+    def test_other_host_not_served(self):
+        with override_settings(ALLOWED_HOSTS=['testserver', 'example.com']):
+            response = Client(HTTP_HOST='example.com').get('/about')
+        self.assertNotEqual(response.get('X-Page-Cache'), 'PRERENDERED')
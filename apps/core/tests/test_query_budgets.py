@@ -0,0 +1,120 @@
+"""
+Бюджети SQL запитів для основних сторінок.
+
+Бюджет - поточна кількість запитів при наповненій БД (factories.seed_site_content).
+Додали запит - підніміть бюджет свідомо в тому ж коміті.
+"""
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from django.urls import path, reverse
+from apps.core import query_budget
+from apps.core.models import NewsArticle
+from .factories import seed_site_content
+from .query_budget import QueryBudgetMixin
+
+# url name → (kwargs, бюджет запитів)
+QUERY_BUDGETS = {
+    # achievements, advantages + items, course_categories + courses, testimonials, бігуча стрічка
+    'core:index': ({}, 5),
+    'core:about': ({}, 1),
+    'core:contacts': ({}, 2),
+    'core:faq': ({}, 2),
+    'core:programs_list': ({}, 1),
+    'core:program_detail': ({'slug': 'individual'}, 1),
+    'core:city_page': ({'city': 'lvov'}, 1),
+    'core:news_list': ({}, 3),
+    # 4 з них - NewsRedirectMiddleware (old_url_uk/old_url_ru, шлях з та без slash), 1 - схожі статті
+    'core:news_detail': ({'slug': 'news-0'}, 7),
+    # count() для intro та count() пагінатора - окремі запити
+    'core:feedback': ({}, 5),
+    'core:job': ({}, 1),
+    'core:shares': ({}, 1),
+    'sitemap': ({}, 2),
+}
+
+
+@override_settings(GTM_TRACKING_ENABLED=False)
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Кожна основна сторінка вкладається у свій бюджет запитів."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_site_content()
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_main_pages_within_budget(self):
+        for name, (kwargs, budget) in QUERY_BUDGETS.items():
+            with self.subTest(name=name):
+                self.assertQueryBudget(reverse(name, kwargs=kwargs), budget)
+
+    def test_russian_pages_within_budget(self):
+        self.assertQueryBudget('/ru/', QUERY_BUDGETS['core:index'][1])
+        # Як і UK: 4 запити NewsRedirectMiddleware (old_url_ru з префіксом /ru/)
+        self.assertQueryBudget('/ru/news/news-ru-0/', QUERY_BUDGETS['core:news_detail'][1])
+
+    def test_russian_news_redirect(self):
+        # old_url_uk (промах), потім old_url_ru
+        response = self.assertQueryBudget('/ru/news/old-0', 2, status=301)
+        self.assertEqual(response['Location'], '/ru/news/news-ru-0/')
+
+    def test_news_redirect_within_budget(self):
+        self.assertQueryBudget('/news/old-0', 1, status=301)
+
+
+class SqlShapeTest(SimpleTestCase):
+    """Тести нормалізації SQL та пошуку повторів."""
+
+    def test_values_removed(self):
+        first = query_budget.sql_shape('SELECT * FROM "t" WHERE "t"."id" = 1 AND "name" = \'a\'')
+        second = query_budget.sql_shape('SELECT *  FROM "t" WHERE "t"."id" = 25 AND "name" = \'it\'\'s\'')
+        self.assertEqual(first, second)
+        self.assertEqual(
+            query_budget.sql_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            query_budget.sql_shape('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    def test_identifiers_with_digits_kept(self):
+        self.assertIn('T3', query_budget.sql_shape('SELECT "T3"."id" FROM t T3 LIMIT 21'))
+
+    def test_repeated_shapes(self):
+        recorder = query_budget.QueryRecorder()
+        for pk in range(4):
+            recorder.shapes[query_budget.sql_shape(f'SELECT * FROM course WHERE category_id = {pk}')] += 1
+        recorder.shapes[query_budget.sql_shape('SELECT * FROM category')] += 1
+        self.assertEqual(recorder.count, 5)
+        self.assertEqual(recorder.repeated(3), [('SELECT * FROM course WHERE category_id = ?', 4)])
+
+
+def n_plus_one_view(request):
+    """Цикл із запитом на кожен елемент - класичний N+1."""
+    titles = [NewsArticle.objects.get(pk=article.pk).title_uk for article in NewsArticle.objects.all()]
+    return HttpResponse(', '.join(titles))
+
+
+urlpatterns = [path('n-plus-one/', n_plus_one_view, name='n_plus_one')]
+
+
+@override_settings(
+    NPLUSONE_DETECTION=True, NPLUSONE_THRESHOLD=3, GTM_TRACKING_ENABLED=False,
+    ROOT_URLCONF='apps.core.tests.test_query_budgets',
+)
+class NPlusOneMiddlewareTest(TestCase):
+    """Тести NPlusOneMiddleware."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_site_content()
+
+    def test_repeated_shape_logged(self):
+        with self.assertLogs('apps.core.query_budget', level='WARNING') as logs:
+            response = Client().get('/n-plus-one/')
+        self.assertEqual(response['X-Query-Count'], '13')
+        self.assertIn('Possible N+1 in /n-plus-one/ (n_plus_one)', logs.output[0])
+        self.assertIn('12x SELECT', logs.output[0])
+
+    @override_settings(NPLUSONE_THRESHOLD=20)
+    def test_below_threshold_not_logged(self):
+        with self.assertNoLogs('apps.core.query_budget', level='WARNING'):
+            Client().get('/n-plus-one/')
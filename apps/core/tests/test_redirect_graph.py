@@ -0,0 +1,70 @@
+"""
+Тести компіляції графа редиректів.
+"""
+from django.test import SimpleTestCase
+from apps.core.redirect_graph import RedirectCycleError, compile_redirects, with_language_variants
+
+
+class RedirectGraphTest(SimpleTestCase):
+    """Тести compile_redirects на синтетичних та реальних правилах."""
+
+    def test_chain_collapsed_to_single_hop(self):
+        compiled = compile_redirects({
+            '/old-blog': '/blog',
+            '/blog': '/news/',
+        })
+        self.assertEqual(compiled.table['/old-blog'], '/news/')
+        self.assertEqual([issue.source for issue in compiled.issues_of('chain')], ['/old-blog'])
+
+    def test_trailing_slash_fallback_is_followed(self):
+        # '/legacy/' не має власного правила, але FrontDoor знайде '/legacy'
+        compiled = compile_redirects({
+            '/old': '/legacy/',
+            '/legacy': '/faq',
+        })
+        self.assertEqual(compiled.table['/old'], '/faq')
+
+    def test_append_slash_hop_included(self):
+        # '/shares/page/2' не резолвиться, CommonMiddleware додасть slash
+        compiled = compile_redirects({'/old-shares': '/shares/page/2'})
+        self.assertEqual(compiled.table['/old-shares'], '/shares/page/2/')
+
+    def test_cycle_fails_loudly(self):
+        with self.assertRaises(RedirectCycleError):
+            compile_redirects({'/a': '/b', '/b': '/a/'})
+
+    def test_dead_and_shadowed_reported(self):
+        compiled = compile_redirects({
+            '/faq': '/contacts',
+            '/old-city': '/unknown-city',
+        })
+        self.assertEqual([issue.source for issue in compiled.issues_of('shadowed_route')], ['/faq'])
+        self.assertEqual([issue.source for issue in compiled.issues_of('dead_target')], ['/old-city'])
+
+    def test_project_redirects_are_clean(self):
+        compiled = compile_redirects()
+        self.assertEqual(compiled.issues_of('dead_target'), [])
+        self.assertEqual(compiled.issues_of('shadowed_route'), [])
+
+    def test_language_variants_derived_from_uk_rules(self):
+        expanded = with_language_variants({
+            '/courses/': '/programs/',
+            '/sitemap.html': '/sitemap.xml',
+            '/contact': '/contacts',
+            '/ru/contact': '/ru/kontakty',
+        })
+        self.assertEqual(expanded['/ru/courses/'], '/ru/programs/')
+        # Адреси поза i18n_patterns не отримують префікс
+        self.assertEqual(expanded['/ru/sitemap.html'], '/sitemap.xml')
+        # Явне RU правило має пріоритет
+        self.assertEqual(expanded['/ru/contact'], '/ru/kontakty')
+        self.assertNotIn('/ru/ru/contact', expanded)
+
+    def test_language_variant_does_not_shadow_page(self):
+        expanded = with_language_variants({'/contacts': '/faq'})
+        self.assertNotIn('/ru/contacts', expanded)
+
+    def test_project_redirects_cover_ru_legacy_urls(self):
+        compiled = compile_redirects()
+        self.assertEqual(compiled.table['/ru/pidgotovka-do-ispitu-ielts'], '/ru/programs/ielts')
+        self.assertEqual(compiled.table['/ru/blog/'], '/ru/news/')
@@ -0,0 +1,80 @@
+"""
+Тести підказок редиректів для 404 (trigram індекс).
+"""
+import ast
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from apps.core.models import NewsArticle
+from apps.core.redirect_suggestions import TrigramIndex, suggest_redirects, url_key
+
+
+class TrigramIndexTest(SimpleTestCase):
+    """Тести TrigramIndex."""
+
+    def test_url_key_strips_language_prefix(self):
+        self.assertEqual(url_key('/ru/programs/ielts'), 'programs ielts')
+        self.assertEqual(url_key('/school/chervonoi-kalini/'), 'school chervonoi kalini')
+
+    def test_search_ranks_by_similarity(self):
+        index = TrigramIndex(['/programs/ielts', '/programs/toefl', '/school/minskaya'])
+        results = index.search('/programs/ielts-preparation', limit=2)
+        self.assertEqual(results[0][0], '/programs/ielts')
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_search_respects_threshold(self):
+        index = TrigramIndex(['/programs/ielts'])
+        self.assertEqual(index.search('/zzz', min_similarity=0.3), [])
+
+
+class SuggestRedirectsTest(TestCase):
+    """Тести suggest_redirects та management command."""
+
+    def test_suggestions_per_language(self):
+        suggestions = suggest_redirects({
+            '/shkola/minskaya': 5,
+            '/ru/programs/ielts-kurs': 2,
+        })
+        targets = {suggestion.path: suggestion.target for suggestion in suggestions}
+        self.assertEqual(targets['/shkola/minskaya'], '/school/minskaya')
+        self.assertEqual(targets['/ru/programs/ielts-kurs'], '/ru/programs/ielts')
+
+    def test_command_exports_redirect_format(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / 'not_found.log'
+            log_file.write_text('\n'.join(json.dumps(line) for line in [
+                {'path': '/shkola/minskaya', 'hits': 3},
+                {'path': '/shkola/minskaya', 'hits': 4},
+                {'path': '/courses/', 'hits': 10},  # вже є в REDIRECTS
+            ]), encoding='utf-8')
+
+            out = StringIO()
+            call_command('suggest_redirects', log=[str(log_file)], format='json', stdout=out, stderr=StringIO())
+
+        self.assertEqual(json.loads(out.getvalue()), {'/shkola/minskaya': '/school/minskaya'})
+
+    def test_python_export_escapes_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / 'not_found.log'
+            path = "/shkola/minskaya'\\"
+            log_file.write_text(json.dumps({'path': path, 'hits': 3}), encoding='utf-8')
+
+            out = StringIO()
+            call_command('suggest_redirects', log=[str(log_file)], format='python', stdout=out, stderr=StringIO())
+
+        self.assertEqual(ast.literal_eval('{' + out.getvalue() + '}'), {path: '/school/minskaya'})
+
+    def test_news_slugs_indexed(self):
+        NewsArticle.objects.create(
+            slug_uk='yak-vyvchyty-anglijsku-shvydko',
+            title_uk='Як вивчити англійську швидко',
+            content_uk='<p>Текст</p>',
+            meta_description_uk='Опис',
+            is_published=True,
+        )
+        suggestions = suggest_redirects({'/yak-vyvchyty-anglijsku-shvydko-2/': 1})
+        self.assertEqual(suggestions[0].target, '/news/yak-vyvchyty-anglijsku-shvydko/')
@@ -0,0 +1,98 @@
+"""
+Тести індексу схожих статей (apps.core.related_news).
+"""
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.core import related_news
+from apps.core.models import NewsArticleTerms, RelatedNewsArticle, RelatedNewsTerm
+from .factories import NewsArticleFactory
+
+GRAMMAR = '<p>Граматика: часи дієслів, неправильні дієслова та умовні речення з прикладами.</p>'
+TRAVEL = '<p>Подорожі за кордон: аеропорт, готель, паспортний контроль та розмови з туристами.</p>'
+EXAM = '<p>Підготовка до іспиту IELTS: есе, аудіювання, бали та стратегія на екзамені.</p>'
+
+
+def article(title, content, **kwargs):
+    return NewsArticleFactory(title_uk=title, content_uk=content * 3, content_ru='', title_ru='', **kwargs)
+
+
+@override_settings(GTM_TRACKING_ENABLED=False)
+class RelatedNewsTest(TestCase):
+    """Офлайн побудова, інкрементні оновлення та блок у news_detail."""
+
+    def setUp(self):
+        # Фонові задачі - в потоці тесту, щоб бачити його транзакцію
+        background = mock.patch('apps.core.related_news.update_queue')
+        background.start().submit.side_effect = lambda func, *args: func(*args)
+        self.addCleanup(background.stop)
+        self.grammar = [article(f'Граматика дієслів {n}', GRAMMAR) for n in range(3)]
+        self.travel = [article(f'Англійська для подорожей {n}', TRAVEL) for n in range(3)]
+        self.exam = [article(f'Іспит IELTS {n}', EXAM) for n in range(2)]
+        related_news.build()
+
+    def related(self, source, lang='uk'):
+        return [item.pk for item in related_news.related_articles(source, lang)]
+
+    def test_build_groups_similar_articles(self):
+        self.assertEqual(set(self.related(self.grammar[0])), {self.grammar[1].pk, self.grammar[2].pk})
+        self.assertEqual(set(self.related(self.travel[0], 'ru')), {self.travel[1].pk, self.travel[2].pk})
+        self.assertEqual(NewsArticleTerms.objects.count(), 16)
+        self.assertLessEqual(
+            RelatedNewsArticle.objects.filter(article=self.exam[0], language='uk').count(), related_news.TOP_K,
+        )
+
+    def test_incremental_update_on_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            new = article('Ще про граматику дієслів', GRAMMAR)
+        self.assertIn(self.grammar[0].pk, self.related(new))
+        self.assertIn(new.pk, self.related(self.grammar[0]))
+
+        new.is_published = False
+        with self.captureOnCommitCallbacks(execute=True):
+            new.save()
+        self.assertNotIn(new.pk, self.related(self.grammar[0]))
+        self.assertFalse(RelatedNewsArticle.objects.filter(article=new).exists())
+
+    def test_incremental_update_keeps_document_frequencies(self):
+        df = RelatedNewsTerm.objects.get(language='uk', term='грамат').df
+        with self.captureOnCommitCallbacks(execute=True):
+            new = article('Ще про граматику дієслів', GRAMMAR)
+        self.assertEqual(RelatedNewsTerm.objects.get(language='uk', term='грамат').df, df + 1)
+        self.assertTrue(NewsArticleTerms.objects.get(article=new, language='uk').signature)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new.delete()
+        self.assertEqual(RelatedNewsTerm.objects.get(language='uk', term='грамат').df, df)
+
+    def test_update_purges_news_detail_pages(self):
+        with mock.patch('apps.core.related_news.page_cache.purge_views') as purge_views:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.grammar[0].save()
+        purge_views.assert_called_with('core:news_detail')
+
+    def test_dropped_update_is_logged(self):
+        related_news.update_queue.submit.side_effect = None
+        related_news.update_queue.submit.return_value = False
+        with self.assertLogs('apps.core.related_news', 'ERROR') as logs:
+            self.assertFalse(related_news.schedule_update(self.grammar[0].pk))
+        self.assertIn('build_related_news', logs.output[0])
+        self.assertNotIn(self.grammar[0].pk, related_news._pending)
+
+    def test_delete_recomputes_lists(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.grammar[1].delete()
+        self.assertEqual(self.related(self.grammar[0]), [self.grammar[2].pk])
+
+    def test_news_detail_shows_related_links(self):
+        response = self.client.get(f'/news/{self.grammar[0].slug_uk}/')
+        self.assertContains(response, f'href="/news/{self.grammar[1].slug_uk}/"')
+        self.assertNotContains(response, self.travel[0].slug_uk)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('build_related_news', stdout=out)
+        self.assertIn('uk: 8', out.getvalue())
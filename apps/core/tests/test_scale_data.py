@@ -0,0 +1,69 @@
+"""
+Тести генератора даних великого обсягу (seed_scale_data).
+"""
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core.models import ConsultationRequest, NewsArticle, NewsArticleTerms, Testimonial
+from apps.core.scale_data import ScaleDataGenerator
+from apps.leads.models import TrialLesson
+
+
+@override_settings(DEBUG=True, GTM_TRACKING_ENABLED=False)
+class SeedScaleDataTest(TestCase):
+    """Тести команди seed_scale_data."""
+
+    def seed(self, **options):
+        call_command('seed_scale_data', chunk_size=7, stdout=StringIO(), **options)
+
+    def test_creates_requested_counts_in_chunks(self):
+        self.seed(news=20, testimonials=10, trial_lessons=30, consultations=15)
+        self.assertEqual(NewsArticle.objects.count(), 20)
+        self.assertEqual(Testimonial.objects.count(), 10)
+        self.assertEqual(TrialLesson.objects.count(), 30)
+        self.assertEqual(ConsultationRequest.objects.count(), 15)
+        # bulk_create без post_save - індекс схожих статей будується командою
+        self.assertEqual(
+            NewsArticleTerms.objects.filter(language='uk').count(), NewsArticle.objects.filter(is_published=True).count(),
+        )
+
+    def test_dates_spread_into_past(self):
+        self.seed(trial_lessons=30)
+        oldest = TrialLesson.objects.order_by('created_at').first().created_at
+        self.assertLess(oldest, timezone.now() - timezone.timedelta(days=30))
+        # auto_now_add відновлено після вставки
+        self.assertTrue(TrialLesson._meta.get_field('created_at').auto_now_add)
+
+    def test_repeated_runs_do_not_conflict(self):
+        self.seed(news=5)
+        self.seed(news=5)
+        self.assertEqual(NewsArticle.objects.count(), 10)
+
+    def test_redirect_log_entries_redirect(self):
+        self.seed(news=5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'redirects.log'
+            self.seed(redirect_log=50, redirect_log_file=str(path))
+            entries = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        self.assertEqual(len(entries), 50)
+        self.assertEqual(entries, sorted(entries, key=lambda entry: entry['timestamp']))
+        self.assertEqual(set(entries[0]), {
+            'timestamp', 'old_url', 'new_url', 'redirect_type', 'user_agent', 'referrer', 'ip',
+        })
+        news_targets = [item for item in ScaleDataGenerator().redirect_targets() if item[2] == 'news']
+        self.assertEqual(len(news_targets), 5)
+        for old_url, new_url, _ in news_targets:
+            response = self.client.get(old_url)
+            self.assertEqual(response.status_code, 301, old_url)
+            self.assertEqual(response['Location'], new_url)
+
+    @override_settings(DEBUG=False)
+    def test_requires_debug_or_force(self):
+        with self.assertRaises(CommandError):
+            self.seed(news=1)
@@ -0,0 +1,97 @@
+"""
+Тести SEO аудиту (apps.core.seo_audit та команда seo_audit).
+"""
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.seo_audit import (
+    AuditCache, Fetched, PageFacts, SeoAuditor, check_page, content_hash, parse_html, site_issues,
+)
+
+PAGE = """<!DOCTYPE html>
+<html lang="uk"><head>
+<title>Курси англійської   - SPEAK UP</title>
+<meta name="description" content="Курси англійської мови онлайн для дорослих і дітей, групові та індивідуальні">
+<meta name="csrf-token" content="{token}">
+<link rel="canonical" href="http://testserver/about">
+<link rel="alternate" hreflang="uk" href="http://testserver/about">
+<link rel="alternate" hreflang="ru" href="http://testserver/ru/about">
+</head><body><h1>Про нас</h1>
+<a href="/contacts/">Контакти</a> <a href="https://example.com/">Зовнішнє</a>
+<a href="tel:+380000000000">Телефон</a> <a href="#top">Вгору</a>
+</body></html>"""
+
+
+class SeoParserTest(SimpleTestCase):
+    """Тести розбору HTML та перевірок сторінки."""
+
+    def test_parse_html_collects_seo_facts(self):
+        facts = parse_html(PAGE.format(token='abc'))
+        self.assertEqual(facts.lang, 'uk')
+        self.assertEqual(facts.title, 'Курси англійської - SPEAK UP')
+        self.assertEqual(facts.h1_count, 1)
+        self.assertEqual(facts.canonical, 'http://testserver/about')
+        self.assertEqual(facts.hreflang, {'uk': 'http://testserver/about', 'ru': 'http://testserver/ru/about'})
+        self.assertIn('/contacts/', facts.links)
+
+    def test_check_page_clean_and_broken(self):
+        self.assertEqual(check_page('/about/', parse_html(PAGE.format(token='abc'))), [])
+
+        issues = check_page('/ru/about/', PageFacts(lang='uk', title='x', description='SpeakUp - Django HTMX Application'))
+        self.assertEqual(
+            [issue.code for issue in issues],
+            ['canonical_missing', 'lang_mismatch', 'title_length', 'description_default', 'h1_missing', 'hreflang_missing'],
+        )
+
+    def test_content_hash_ignores_csrf_token(self):
+        first = content_hash(PAGE.format(token='a' * 64).encode())
+        self.assertEqual(first, content_hash(PAGE.format(token='b' * 64).encode()))
+        self.assertNotEqual(first, content_hash(PAGE.format(token='a' * 64).replace('Про нас', 'Інше').encode()))
+
+    @override_settings(CANONICAL_DOMAIN='http://testserver')
+    def test_site_issues_links_and_redirects(self):
+        auditor = SeoAuditor('testserver')
+        pages = {
+            '/a/': Fetched(200, facts=PageFacts(links=['/b', '/missing/', 'https://example.com/x'])),
+            '/b': Fetched(301, location='/c'),
+            '/c': Fetched(301, location='/a/'),
+            '/missing/': Fetched(404),
+        }
+        codes = {(issue.code, issue.url) for issue in site_issues(pages, auditor)}
+        self.assertIn(('broken_link', '/a/'), codes)
+        self.assertIn(('link_to_redirect', '/a/'), codes)
+        self.assertIn(('redirect_chain', '/b'), codes)
+        self.assertNotIn(('redirect_loop', '/b'), codes)
+
+
+@override_settings(GTM_TRACKING_ENABLED=False, CANONICAL_DOMAIN='http://testserver')
+class SeoAuditCrawlTest(TestCase):
+    """Обхід сайту in-process та кеш за хешем вмісту."""
+
+    def test_crawl_follows_links_and_uses_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'cache.json'
+            first = SeoAuditor('testserver', concurrency=1, cache=AuditCache(path), max_pages=15).audit(['/about'])
+            self.assertEqual(first.pages['/about'].status, 200)
+            # hreflang пара та посилання з меню теж обійдені
+            self.assertIn('/ru/about', first.pages)
+            self.assertEqual(len(first.pages), 15)
+            self.assertEqual(first.cached, 0)
+
+            second = SeoAuditor('testserver', concurrency=1, cache=AuditCache(path), max_pages=15).audit(['/about'])
+            self.assertEqual(second.parsed, 0)
+            self.assertEqual(second.cached, first.parsed)
+            self.assertEqual(
+                sorted((i.code, i.url) for i in second.issues), sorted((i.code, i.url) for i in first.issues),
+            )
+
+    def test_command_reports_summary(self):
+        out = StringIO()
+        call_command(
+            'seo_audit', '--concurrency', '1', '--max-pages', '5', '--no-cache', '--fail-on', 'none', stdout=out,
+        )
+        self.assertIn('Обійдено 5 URL', out.getvalue())
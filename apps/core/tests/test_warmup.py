@@ -0,0 +1,43 @@
+"""
+Тести прогріву кешів сторінками з sitemap.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from apps.core.page_cache import get_cache
+from apps.core.warmup import sitemap_urls, warm_urls
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, GTM_TRACKING_ENABLED=False, CANONICAL_DOMAIN='http://testserver')
+class WarmUrlsTest(TestCase):
+    """Тести sitemap_urls/warm_urls та команди warm_caches."""
+
+    def setUp(self):
+        get_cache().clear()
+
+    def tearDown(self):
+        get_cache().clear()
+
+    def test_sitemap_urls_cover_both_languages(self):
+        urls = sitemap_urls(include_news=False)
+        self.assertIn('/', urls)
+        self.assertIn('/ru/', urls)
+        self.assertEqual(len(urls), len(set(urls)))
+
+    def test_warm_urls_populates_page_cache(self):
+        results = warm_urls(['/about', '/ru/about'], concurrency=1)
+        self.assertEqual([result.status for result in results], [200, 200])
+        self.assertEqual(results[0].page_cache, 'MISS')
+
+        response = Client().get('/about')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    def test_budget_skips_remaining_urls(self):
+        results = warm_urls(['/about', '/ru/about'], concurrency=1, budget=1e-9)
+        self.assertEqual(results, [])
+
+    def test_command_reports_urls(self):
+        out = StringIO()
+        call_command('warm_caches', '--no-news', '--limit', '2', '--concurrency', '1', stdout=out)
+        self.assertIn('Прогріто 2 URL', out.getvalue())
@@ -6,7 +6,7 @@ app_name = 'core'
 urlpatterns = [
     # Головні сторінки
     path('', views.index, name='index'),
-    path('about/', views.about, name='about'),
+    path('about', views.about, name='about'),
     path('contacts', views.contacts, name='contacts'),
     path('faq', views.faq, name='faq'),
     path('testing', views.testing, name='testing'),
@@ -19,6 +19,7 @@ urlpatterns = [
 
     # NEWS - ПЕРЕД catch-all! (КРИТИЧНО для SEO)
     path('news/', views.news_list, name='news_list'),
+    path('news/search/', views.news_search, name='news_search'),
     path('news/<slug:slug>/', views.news_detail, name='news_detail'),
 
     # Feedback, Job, Shares
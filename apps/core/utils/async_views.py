@@ -0,0 +1,30 @@
+"""
+Допоміжні засоби для async views.
+
+Django 4.2 декоратори (require_http_methods, csrf_protect) не вміють обгортати
+async функції - обгортка стає sync і повертає не-awaited coroutine.
+CSRF перевіряє глобальний CsrfViewMiddleware, а метод запиту - цей декоратор.
+"""
+from functools import wraps
+from typing import List
+
+from django.http import HttpResponseNotAllowed
+from django.utils.log import log_response
+
+
+def require_http_methods_async(request_method_list: List[str]):
+    """Аналог django.views.decorators.http.require_http_methods для async views."""
+    def decorator(view_func):
+        @wraps(view_func)
+        async def inner(request, *args, **kwargs):
+            if request.method not in request_method_list:
+                response = HttpResponseNotAllowed(request_method_list)
+                log_response(
+                    'Method Not Allowed (%s): %s', request.method, request.path,
+                    response=response,
+                    request=request,
+                )
+                return response
+            return await view_func(request, *args, **kwargs)
+        return inner
+    return decorator
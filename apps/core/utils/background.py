@@ -0,0 +1,96 @@
+"""
+Фонові задачі без блокування HTTP відповіді (нотифікації, аналітика, логування).
+
+Обмежена черга + фіксований пул daemon-потоків замість нового thread на кожну задачу.
+Потоки стартують ліниво в процесі, що їх використовує: при gunicorn preload_app
+потоки master-процесу не переживають fork, тому кожен worker піднімає свої.
+"""
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTaskQueue:
+    """
+    Черга фонових задач з фіксованою кількістю потоків.
+
+    Якщо черга переповнена, задача відкидається (submit повертає False) -
+    фонові задачі не повинні гальмувати обробку запитів.
+    """
+
+    def __init__(self, maxsize: int = 1000, workers: int = 2):
+        self.maxsize = maxsize
+        self.workers = workers
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """
+        Ставить задачу в чергу (< 1ms, не чекає виконання).
+
+        Returns:
+            True якщо задачу прийнято, False якщо черга переповнена
+        """
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            logger.warning('Background queue full, dropping task %s', getattr(func, '__name__', func))
+            return False
+        return True
+
+    def qsize(self) -> int:
+        """Поточна глибина черги (для метрик)."""
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Чекає виконання всіх задач (для тестів та management commands)."""
+        self._queue.join()
+
+    def _ensure_workers(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Після fork черга могла успадкувати стан master - починаємо з чистої
+            if self._pid is not None:
+                self._queue = queue.Queue(maxsize=self.maxsize)
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f'background-task-{index}',
+                    daemon=True,  # Не блокує shutdown
+                )
+                thread.start()
+            self._pid = pid
+
+    def _run(self) -> None:
+        task_queue = self._queue
+        while True:
+            func, args, kwargs = task_queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                logger.error('Background task %s failed: %s', getattr(func, '__name__', func), e, exc_info=True)
+            finally:
+                # Потоки живуть довго - поважаємо CONN_MAX_AGE як і request cycle
+                close_old_connections()
+                task_queue.task_done()
+
+
+# Singleton
+background_tasks = BackgroundTaskQueue()
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+    """Скорочення для background_tasks.submit()."""
+    return background_tasks.submit(func, *args, **kwargs)
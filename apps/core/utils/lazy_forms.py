@@ -0,0 +1,108 @@
+"""
+Ліниві unbound форми з кешованим HTML полів.
+
+forms_context віддає форму пробного уроку в КОЖЕН шаблон (включно з HTMX
+фрагментами та 404), а index - ще три. Unbound форми однакові для всіх
+запитів, тож:
+- об'єкт форми створюється лише тоді, коли шаблону справді потрібне щось,
+  крім HTML поля (або не створюється взагалі);
+- HTML віджетів рендериться один раз на мову і зберігається в пам'яті процесу.
+
+Шаблони працюють без змін: {{ form.name }}, {{ form.name.errors }},
+{{ form.prefers_messenger.id_for_label }}, {{ form.prefers_messenger.label }}.
+"""
+import threading
+from typing import Dict, Optional, Tuple, Type
+
+from django import forms
+from django.forms.utils import ErrorList
+from django.utils.functional import cached_property
+from django.utils.html import html_safe
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from ..instrumentation import record_cache
+
+# Атрибути BoundField, що не залежать від запиту (кешуються разом з HTML)
+CACHED_FIELD_ATTRS = frozenset({'label', 'id_for_label', 'html_name', 'auto_id', 'help_text', 'name'})
+
+_field_cache: Dict[Tuple, str] = {}
+_field_cache_lock = threading.Lock()
+
+
+def clear_form_cache() -> None:
+    """Скидає кеш HTML полів (тести, зміна віджетів без перезапуску)."""
+    with _field_cache_lock:
+        _field_cache.clear()
+
+
+class LazyForm:
+    """
+    Unbound форма, що створюється лише при потребі.
+
+    form[name] та form.<name> у шаблоні повертають CachedBoundField без створення форми.
+    Усе інше (form.errors, form.as_p, ...) делегується справжній формі.
+    """
+
+    def __init__(self, form_class: Type[forms.BaseForm], prefix: Optional[str] = None):
+        self.form_class = form_class
+        self.prefix = prefix
+
+    @cached_property
+    def form(self) -> forms.BaseForm:
+        return self.form_class(prefix=self.prefix)
+
+    def cached(self, name: str, attr: str, compute):
+        """Значення з кешу процесу (ключ - форма, prefix, поле, атрибут, мова)."""
+        key = (self.form_class, self.prefix, name, attr, get_language())
+        value = _field_cache.get(key)
+        record_cache('forms', value is not None)
+        if value is None:
+            value = compute()
+            with _field_cache_lock:
+                _field_cache[key] = value
+        return value
+
+    def __getitem__(self, name: str) -> 'CachedBoundField':
+        # Шаблон спершу пробує form['name']: KeyError → getattr (form.errors тощо)
+        if name not in self.form_class.base_fields:
+            raise KeyError(name)
+        return CachedBoundField(self, name)
+
+    def __getattr__(self, attr: str):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        return getattr(self.form, attr)
+
+    def __iter__(self):
+        return (CachedBoundField(self, name) for name in self.form.fields)
+
+    def __str__(self):
+        return self.cached('__all__', 'html', lambda: str(self.form))
+
+    def __html__(self):
+        return str(self)
+
+
+@html_safe
+class CachedBoundField:
+    """Поле unbound форми: HTML та статичні атрибути - з кешу процесу."""
+
+    def __init__(self, lazy_form: LazyForm, name: str):
+        self.lazy_form = lazy_form
+        self.name = name
+
+    @property
+    def errors(self) -> ErrorList:
+        # Unbound форма не має помилок
+        return ErrorList()
+
+    def __str__(self):
+        return mark_safe(self.lazy_form.cached(self.name, 'html', lambda: str(self.lazy_form.form[self.name])))
+
+    def __getattr__(self, attr: str):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        if attr in CACHED_FIELD_ATTRS:
+            return self.lazy_form.cached(self.name, attr, lambda: getattr(self.lazy_form.form[self.name], attr))
+        return getattr(self.lazy_form.form[self.name], attr)
@@ -1,13 +1,13 @@
 """
 Асинхронне логування редіректів без блокування HTTP відповіді.
-Використовує threading для запису в фоновому режимі.
+Використовує спільну чергу фонових задач для запису у файл.
 """
 import logging
-import threading
 import json
 from datetime import datetime
 from pathlib import Path
 from django.conf import settings
+from .background import background_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 class AsyncRedirectLogger:
     """
     Асинхронне логування редіректів БЕЗ блокування HTTP відповіді.
-    Використовує threading для запису в фоновому режимі.
+    Запис виконується потоками background_tasks.
     """
 
     def __init__(self):
@@ -25,7 +25,7 @@ class AsyncRedirectLogger:
 
     def log_redirect(self, request, old_url: str, new_url: str, redirect_type: str):
         """
-        Логує редірект асинхронно в окремому thread.
+        Логує редірект асинхронно через чергу фонових задач.
         НЕ блокує HTTP відповідь.
 
         Args:
@@ -48,17 +48,12 @@ class AsyncRedirectLogger:
             'ip': self._get_client_ip(request),
         }
 
-        # Записуємо в окремому thread (НЕ блокує)
-        thread = threading.Thread(
-            target=self._write_log,
-            args=(data,),
-            daemon=True  # Не блокує shutdown
-        )
-        thread.start()
+        # Записуємо у фоновому потоці (НЕ блокує)
+        background_tasks.submit(self._write_log, data)
         # Одразу повертаємось, не чекаємо завершення
 
     def _write_log(self, data: dict):
-        """Записує лог у файл (виконується в окремому thread)."""
+        """Записує лог у файл (виконується у фоновому потоці)."""
         try:
             with open(self.log_file, 'a', encoding='utf-8') as f:
                 f.write(json.dumps(data) + '\n')
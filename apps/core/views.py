@@ -8,16 +8,22 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.db import models
+from django.conf import settings
+from asgiref.sync import sync_to_async
+import hmac
 import logging
 from .seo_config import PROGRAMS, LOCATIONS, CITIES, LEVEL_PACKAGES, LEVEL_CONTENT, LEVEL_INFO
-
-logger = logging.getLogger(__name__)
 from .models import (
     NewsArticle, Achievement, Advantage, CourseCategory, Course,
     Testimonial, FAQ, ConsultationRequest, ContactInfo
 )
 from .forms import TestimonialForm, ConsultationForm, CorporateConsultationForm
-from apps.leads.forms import TrialLessonForm
+from . import metrics, news_search as news_search_index, related_news
+from .utils.async_views import require_http_methods_async
+from .utils.lazy_forms import LazyForm
+
+logger = logging.getLogger(__name__)
+arender = sync_to_async(render)
 
 def index(request):
     """Головна сторінка з усіма секціями."""
@@ -38,9 +44,9 @@ def index(request):
             'courses'
         ).filter(courses__is_active=True).distinct().order_by('order'),
         'testimonials': Testimonial.objects.filter(is_published=True).order_by('-created_at')[:10],
-        'trial_form': TrialLessonForm(),
-        'consultation_form': ConsultationForm(),
-        'testimonial_form': TestimonialForm(),
+        # trial_form - з forms_context
+        'consultation_form': LazyForm(ConsultationForm),
+        'testimonial_form': LazyForm(TestimonialForm),
         'current_language': lang,
     }
     return render(request, 'core/index.html', context)
@@ -241,11 +247,12 @@ def program_detail(request, slug):
         if experience_data:
             data['experience'] = experience_data.get(lang, experience_data.get('uk', ''))
 
-        # Форма консультації
-        data['consultation_form'] = CorporateConsultationForm()
-
         # Використовуємо спеціальний шаблон для корпоративної програми
-        return render(request, 'core/program_detail_corporate.html', {'program': data})
+        # (форма консультації - на верхньому рівні контексту, як її читає шаблон)
+        return render(request, 'core/program_detail_corporate.html', {
+            'program': data,
+            'consultation_form': LazyForm(CorporateConsultationForm),
+        })
 
     return render(request, 'core/program_detail.html', {'program': data})
 
@@ -325,6 +332,28 @@ def news_list(request):
     return render(request, 'core/news_list.html', context)
 
 
+def news_search(request):
+    """Пошук по статтях блогу (повнотекстовий індекс, за релевантністю)."""
+    lang = get_language()
+    query = request.GET.get('q', '').strip()[:200]
+
+    ids = news_search_index.search(query, lang=lang) if query else []
+    paginator = Paginator(ids, 10)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    # Порядок сторінки - як у результатах пошуку
+    articles = NewsArticle.objects.in_bulk(page_obj.object_list)
+    page_obj.object_list = [articles[pk] for pk in page_obj.object_list if pk in articles]
+
+    context = {
+        'query': query,
+        'articles': page_obj,
+        'page_obj': page_obj,
+        'total': paginator.count,
+    }
+
+    return render(request, 'core/news_search.html', context)
+
+
 def news_detail(request, slug):
     """Детальна сторінка статті."""
     lang = get_language()
@@ -350,6 +379,14 @@ def news_detail(request, slug):
         'title': article.title_ru if lang == 'ru' and article.title_ru else article.title_uk,
         'content': article.content_ru if lang == 'ru' and article.content_ru else article.content_uk,
         'meta_description': article.meta_description_ru if lang == 'ru' and article.meta_description_ru else article.meta_description_uk,
+        # Попередньо обчислений індекс (related_news) - один запит
+        'related_articles': [
+            {
+                'title': related.title_ru if lang == 'ru' and related.title_ru else related.title_uk,
+                'url': related.get_absolute_url(),
+            }
+            for related in related_news.related_articles(article, 'ru' if lang == 'ru' else 'uk')
+        ],
     }
 
     return render(request, 'core/news_detail.html', context)
@@ -621,15 +658,19 @@ def submit_testimonial(request):
 @require_http_methods(["GET"])
 def get_testimonial_form(request):
     """Отримати форму відгуку для модального вікна."""
-    form = TestimonialForm()
     return render(request, 'core/components/testimonial_form.html', {
-        'form': form
+        'form': LazyForm(TestimonialForm),
     })
 
 
-@require_http_methods(["POST"])
-def submit_consultation(request):
-    """Обробка форми консультації з HTMX."""
+@require_http_methods_async(["POST"])
+async def submit_consultation(request):
+    """
+    Обробка форми консультації з HTMX.
+
+    Async: лід зберігається через async ORM; шаблони з помилками рендеряться
+    в thread pool (context processors звертаються до БД синхронно).
+    """
     # Визначити тип форми на основі data-form-location
     form_location = request.POST.get('form_location', request.POST.get('data-form-location', ''))
 
@@ -665,7 +706,7 @@ def submit_consultation(request):
 
             # КРИТИЧНО: Обробка ValidationError при збереженні
             try:
-                consultation.save()
+                await consultation.asave()
             except ValidationError as e:
                 # ValidationError від model validators
                 if hasattr(e, 'error_dict'):
@@ -674,7 +715,7 @@ def submit_consultation(request):
                 else:
                     form.add_error(None, e)
 
-                return render(request, 'core/components/consultation_form.html', {
+                return await arender(request, 'core/components/consultation_form.html', {
                     'form': form
                 }, status=400)
 
@@ -687,16 +728,38 @@ def submit_consultation(request):
             # Інші несподівані помилки
             logger.error('[ConsultationForm] Unexpected error: %s', e, exc_info=True)
             form.add_error(None, 'Помилка сервера. Спробуйте ще раз.')
-            return render(request, 'core/components/consultation_form.html', {
+            return await arender(request, 'core/components/consultation_form.html', {
                 'form': form
             }, status=500)
 
     # Якщо форма невалідна, повертаємо помилки
-    return render(request, 'core/components/consultation_form.html', {
+    return await arender(request, 'core/components/consultation_form.html', {
         'form': form
     }, status=400)
 
 
+@require_http_methods(["GET"])
+def metrics_endpoint(request):
+    """
+    Метрики всіх workers у форматі Prometheus (apps.core.metrics).
+
+    Доступ лише з `Authorization: Bearer <METRICS_TOKEN>`; без METRICS_TOKEN - 404.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        raise Http404
+    provided = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    if not hmac.compare_digest(provided.encode('utf-8'), token.encode('utf-8')):
+        response = HttpResponse('Unauthorized', status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+
+    body = metrics.render(metrics.merge(metrics.collect()))
+    response = HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
 @require_http_methods(["GET"])
 def thank_you(request):
     """Thank you page після успішної відправки форми"""
@@ -755,8 +818,7 @@ def buy_stub(request):
     context = {
         'current_language': lang,
         'adult_programs': adult_programs[:6],  # Перші 6 програм
-        'consultation_form': ConsultationForm(),
-        'trial_form': TrialLessonForm(),
+        'consultation_form': LazyForm(ConsultationForm),
         'level_packages': level_packages,
         'level_content': LEVEL_CONTENT,
         'level_info': LEVEL_INFO,
@@ -793,7 +855,7 @@ def kids_learning_page(request):
             'url': '/programs/kids',
         },
         'other_kids_programs': kids_programs,
-        'consultation_form': ConsultationForm(),
+        'consultation_form': LazyForm(ConsultationForm),
     }
     return render(request, 'core/kids_learning.html', context)
 
@@ -816,7 +878,7 @@ def premium_learning_page(request):
             'duration': premium_program.get('duration', ''),
             'url': '/programs/premium',
         },
-        'consultation_form': ConsultationForm(),
+        'consultation_form': LazyForm(ConsultationForm),
     }
     return render(request, 'core/premium_learning.html', context)
 
@@ -843,7 +905,7 @@ def camp_landing_page(request):
         # Dynamic values that could be updated in admin
         'grant_amount': '5000 грн',
         'spots_left': '23',
-        'consultation_form': ConsultationForm(),
+        'consultation_form': LazyForm(ConsultationForm),
     }
 
     return render(request, 'core/camp_landing.html', context)
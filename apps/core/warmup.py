@@ -0,0 +1,167 @@
+"""
+Прогрів in-process кешів до того, як worker почне приймати трафік.
+
+Викликається з gunicorn hooks (gunicorn.conf.py). При preload_app прогрів
+у master-процесі робить ці структури спільними для всіх workers (copy-on-write).
+warm_process_caches() НЕ ходить у БД - з'єднання, відкриті до fork, не можна ділити
+між процесами.
+
+warm_urls() рендерить сторінки з sitemap через Django test client: наповнює кеш
+сторінок, кеші шаблонів та lookup кеші (seo_config, редиректи) реальними запитами.
+Ходить у БД, тому лише після fork (фоновий потік у post_worker_init) або з `manage.py warm_caches`.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.urls import get_resolver
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+# Шаблони, що рендеряться на більшості сторінок або на найпопулярніших URL
+WARM_TEMPLATES = [
+    'base.html',
+    'components/header.html',
+    'components/footer.html',
+    'components/navigation.html',
+    'components/trial-form.html',
+    'core/index.html',
+    'core/program_detail.html',
+    'core/news_list.html',
+    'core/news_detail.html',
+    'core/school_location.html',
+    'core/city_page.html',
+]
+
+
+def warm_url_resolver() -> None:
+    """Компілює regex усіх URL patterns для кожної мови (i18n_patterns)."""
+    for lang_code, _ in settings.LANGUAGES:
+        with translation.override(lang_code):
+            get_resolver()._populate()
+
+
+def warm_templates() -> None:
+    """Компілює шаблони (cached loader тримає скомпільоване дерево в пам'яті процесу)."""
+    for template_name in WARM_TEMPLATES:
+        try:
+            get_template(template_name)
+        except TemplateDoesNotExist:
+            continue
+
+
+def warm_translations() -> None:
+    """Завантажує каталоги перекладів для всіх мов."""
+    for lang_code, _ in settings.LANGUAGES:
+        with translation.override(lang_code):
+            translation.gettext('SpeakUp')
+
+
+def warm_process_caches() -> float:
+    """
+    Прогріває всі in-process кеші.
+
+    Returns:
+        Час прогріву в секундах
+    """
+    start = time.monotonic()
+    warm_translations()
+    warm_url_resolver()
+    warm_templates()
+    duration = time.monotonic() - start
+    logger.info('Process caches warmed in %.1f ms', duration * 1000)
+    return duration
+
+
+@dataclass
+class WarmResult:
+    """Результат рендеру однієї сторінки."""
+    url: str
+    status: int
+    duration_ms: float
+    page_cache: str = ''
+    error: str = ''
+
+
+def sitemap_urls(include_news: bool = True) -> List[str]:
+    """Шляхи з SpeakUpSitemap та NewsSitemap (обидві мови)."""
+    from .sitemaps import NewsSitemap, SpeakUpSitemap
+
+    sitemaps = [SpeakUpSitemap()]
+    if include_news:
+        sitemaps.append(NewsSitemap())
+    urls = []
+    # location() перемикає activate(), тож повертаємо мову процесу після обходу
+    with translation.override(settings.LANGUAGE_CODE):
+        for sitemap in sitemaps:
+            urls.extend(sitemap.location(item) for item in sitemap.items())
+    return list(dict.fromkeys(urls))
+
+
+def default_warm_host() -> str:
+    """Host для прогріву: той самий, що в реальних запитах (ключ кешу сторінок містить host)."""
+    canonical = urlparse(getattr(settings, 'CANONICAL_DOMAIN', '') or '').netloc
+    if canonical:
+        return canonical
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+    return hosts[0] if hosts else 'localhost'
+
+
+def _render(url: str, host: str, secure: bool) -> WarmResult:
+    from django.test import Client
+
+    # raise_request_exception=False: сигнал got_request_exception глобальний, тож при
+    # паралельних клієнтах виняток однієї сторінки "прилітав" би в інший потік
+    client = Client(HTTP_HOST=host, raise_request_exception=False)
+    start = time.monotonic()
+    try:
+        response = client.get(url, secure=secure)
+    except Exception as e:  # noqa: BLE001 - одна зламана сторінка не зупиняє прогрів
+        return WarmResult(url, 0, (time.monotonic() - start) * 1000, error=repr(e))
+    finally:
+        # З'єднання цього потоку не потрібні після прогріву
+        connections.close_all()
+    return WarmResult(
+        url, response.status_code, (time.monotonic() - start) * 1000,
+        page_cache=response.get('X-Page-Cache', ''),
+    )
+
+
+def warm_urls(urls: List[str], concurrency: int = 4, host: Optional[str] = None,
+              secure: Optional[bool] = None, budget: Optional[float] = None) -> List[WarmResult]:
+    """
+    Рендерить сторінки in-process з обмеженою кількістю паралельних потоків.
+
+    Args:
+        urls: Шляхи для рендеру
+        concurrency: Кількість потоків (кожен тримає власне з'єднання з БД)
+        host: Host заголовок; за замовчуванням - з CANONICAL_DOMAIN
+        secure: HTTPS запит; за замовчуванням - як CANONICAL_DOMAIN
+        budget: Ліміт часу в секундах - URL, до яких не дійшли, пропускаються
+
+    Returns:
+        Результати відрендерених сторінок в порядку urls
+    """
+    host = host or default_warm_host()
+    if secure is None:
+        secure = (getattr(settings, 'CANONICAL_DOMAIN', '') or '').startswith('https://')
+    deadline = time.monotonic() + budget if budget else None
+
+    def render(url: str) -> Optional[WarmResult]:
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return _render(url, host, secure)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = [result for result in executor.map(render, urls) if result is not None]
+    failed = sum(1 for result in results if result.status != 200)
+    logger.info('Warmed %d URLs, %d non-200, %d skipped by budget', len(results), failed, len(urls) - len(results))
+    return results
@@ -10,9 +10,14 @@ class Migration(migrations.Migration):
         ('core', '0007_add_runninglinetext_from_leads'),  # Залежність від міграції в core
     ]
 
+    # Таблицю тепер використовує core.RunningLineText - видаляємо лише стан моделі
     operations = [
-        migrations.DeleteModel(
-            name='RunningLineText',
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.DeleteModel(
+                    name='RunningLineText',
+                ),
+            ],
         ),
     ]
 
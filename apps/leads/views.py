@@ -2,18 +2,24 @@ import logging
 from django.http import JsonResponse
 from django.urls import reverse
 from django.core.exceptions import ValidationError
-from django.views.decorators.http import require_http_methods
-from django.views.decorators.csrf import csrf_protect
+from apps.core import metrics
+from apps.core.utils.async_views import require_http_methods_async
+from apps.core.utils.background import run_in_background
 from .forms import TrialLessonForm
 from .utils import send_trial_confirmation_email, get_client_ip
 
 logger = logging.getLogger(__name__)
 
 
-@require_http_methods(["POST"])
-@csrf_protect
-def submit_trial_form(request):
-    """API endpoint для відправки форми запису на пробний урок"""
+# CSRF перевіряє глобальний CsrfViewMiddleware (csrf_protect не підтримує async views у Django 4.2)
+@require_http_methods_async(["POST"])
+async def submit_trial_form(request):
+    """
+    API endpoint для відправки форми запису на пробний урок.
+
+    Async: збереження ліда через async ORM, нотифікації - у фоновій черзі,
+    тому повільний SMTP/Telegram не тримає worker.
+    """
     logger.info('[TrialForm] Received POST request')
     logger.debug('[TrialForm] POST data: %s', dict(request.POST))
     logger.debug('[TrialForm] CSRF token in headers: %s', request.headers.get('X-CSRFToken', 'not found'))
@@ -28,6 +34,7 @@ def submit_trial_form(request):
             honeypot_value[:50],
             request.META.get('HTTP_USER_AGENT', 'unknown')[:100]
         )
+        metrics.leads.inc('trial', 'honeypot')
         # Повертаємо SUCCESS щоб бот не знав що його виявили (silent reject)
         # Редірект на thank-you як для звичайного користувача
         return JsonResponse({
@@ -66,11 +73,13 @@ def submit_trial_form(request):
 
             # КРИТИЧНО: Обробка ValidationError при збереженні
             try:
-                lead.save()
+                await lead.asave()
                 logger.info('[TrialForm] Lead saved successfully: %s - %s', lead.name, lead.phone)
+                metrics.leads.inc('trial', 'created')
             except ValidationError as e:
                 # ValidationError від model validators
                 logger.warning('[TrialForm] Validation error on save: %s', e)
+                metrics.leads.inc('trial', 'invalid')
 
                 # Конвертуємо ValidationError в form errors
                 errors = {}
@@ -85,13 +94,9 @@ def submit_trial_form(request):
                     'errors': errors
                 }, status=400)
 
-            # Відправити email (не критично, якщо не вдасться):
-            try:
-                send_trial_confirmation_email(lead, request)
-                logger.info('[TrialForm] Email sent successfully')
-            except Exception as email_error:
-                logger.error('[TrialForm] Email sending failed: %s', email_error, exc_info=True)
-                # Не блокуємо успішну відправку форми
+            # Відправити email у фоні (не критично, якщо не вдасться - помилку залогує черга)
+            if run_in_background(send_trial_confirmation_email, lead, request):
+                logger.info('[TrialForm] Email notification queued')
 
             logger.info('[TrialForm] Request processed successfully')
             redirect_url = reverse('core:thank_you')
@@ -104,12 +109,14 @@ def submit_trial_form(request):
         except Exception as e:
             # Інші несподівані помилки (не ValidationError)
             logger.error('[TrialForm] Unexpected error during processing: %s', e, exc_info=True)
+            metrics.leads.inc('trial', 'error')
             return JsonResponse({
                 'success': False,
                 'errors': {'__all__': ['Помилка сервера. Спробуйте ще раз.']}
             }, status=500)
     else:
         logger.warning('[TrialForm] Form validation failed: %s', form.errors)
+        metrics.leads.inc('trial', 'invalid')
         return JsonResponse({
             'success': False,
             'errors': form.errors
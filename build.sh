@@ -7,11 +7,20 @@ set -e  # Exit on error
 echo "Installing Python dependencies..."
 pip install -r requirements.txt
 
+echo "Checking redirect graph..."
+python manage.py compile_redirects --strict
+
+echo "Building asset bundles..."
+python manage.py build_assets
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
 echo "Running migrations..."
 python manage.py migrate --noinput
 
+echo "Pre-rendering static pages..."
+python manage.py prerender_pages
+
 echo "Build completed successfully!"
 
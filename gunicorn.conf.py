@@ -0,0 +1,150 @@
+"""
+Gunicorn конфігурація для production (Render, Docker).
+
+Gunicorn автоматично підхоплює ./gunicorn.conf.py, але запускаємо явно:
+    gunicorn -c gunicorn.conf.py
+
+Застосунок (WSGI чи ASGI) обирається за GUNICORN_WORKER_CLASS - див. wsgi_app нижче.
+
+Всі параметри перевизначаються через env (див. нижче), значення за замовчуванням
+розраховані на Render starter (0.5 CPU / 512 MB).
+"""
+import multiprocessing
+import os
+import shutil
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, '').strip()
+    return int(value) if value else default
+
+
+# ===== WORKER MODEL =====
+# sync     - класичні процеси, один запит на worker
+# gthread  - потоки всередині процесу; краще для I/O (БД, SMTP, GTM)
+# gevent   - green threads (потрібен `pip install gevent`)
+# uvicorn  - ASGI worker для SpeakUp.asgi:application (потрібен `pip install uvicorn`)
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'gevent': 'gevent',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+worker_mode = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+worker_class = WORKER_CLASSES.get(worker_mode, worker_mode)
+# ASGI worker потребує ASGI callable; async views та middleware працюють без sync_to_async
+wsgi_app = 'SpeakUp.asgi:application' if worker_mode == 'uvicorn' else 'SpeakUp.wsgi:application'
+
+# ===== РОЗМІР ПУЛУ =====
+cpu_count = multiprocessing.cpu_count()
+if worker_mode == 'sync':
+    default_workers = cpu_count * 2 + 1
+else:
+    # Потоки/корутини вже дають конкурентність - процесів достатньо по ядрах
+    default_workers = cpu_count + 1
+# Обмеження по пам'яті: кожен worker - окрема копія Django (~60-80 MB)
+workers = _env_int('WEB_CONCURRENCY', min(default_workers, _env_int('GUNICORN_MAX_WORKERS', 4)))
+threads = _env_int('GUNICORN_THREADS', 4 if worker_mode == 'gthread' else 1)
+
+# ===== МЕРЕЖА =====
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+# Render load balancer тримає keep-alive з'єднання довше за дефолтні 2 секунди
+keepalive = _env_int('GUNICORN_KEEPALIVE', 75)
+forwarded_allow_ips = '*'
+
+# ===== ТАЙМАУТИ =====
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+# ===== ПЕРЕЗАПУСК WORKERS =====
+# Захист від повільних витоків пам'яті; jitter - щоб workers не рестартували одночасно
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+# ===== PRELOAD =====
+# Django, seo_config та скомпільовані кеші завантажуються один раз у master
+# і діляться з workers через copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# ===== ПРОГРІВ СТОРІНОК =====
+# Кожен worker рендерить сторінки з sitemap у фоновому потоці після ініціалізації
+# (apps.core.warmup.warm_urls), не затримуючи heartbeat і перший accept().
+# Обмежено кількістю URL та часом - прогрів не має конкурувати з трафіком довше за timeout.
+# Вимкнено за замовчуванням: зазвичай достатньо `manage.py warm_caches` після деплою,
+# бо production кеш сторінок файловий і спільний для workers
+warm_urls_on_fork = os.getenv('GUNICORN_WARM_URLS', 'False') == 'True'
+warm_urls_concurrency = _env_int('GUNICORN_WARM_URLS_CONCURRENCY', 2)
+warm_urls_limit = _env_int('GUNICORN_WARM_URLS_LIMIT', 50)
+warm_urls_budget = _env_int('GUNICORN_WARM_URLS_BUDGET', 20)  # секунд
+
+# ===== МЕТРИКИ =====
+# Workers скидають знімки метрик у спільну директорію, /metrics їх підсумовує (apps.core.metrics).
+# Env встановлюється ДО завантаження Django, тож settings.METRICS_DIR бачать і master, і workers
+metrics_dir = os.environ.setdefault('METRICS_DIR', '/tmp/speakup-metrics')
+
+# ===== ЛОГИ =====
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+# ===== HOOKS =====
+
+def on_starting(server):
+    """Master: знімки попереднього запуску (pid могли перевикористатись) видаляємо."""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    """Master: застосунок завантажено (preload) - прогріваємо кеші ДО fork."""
+    if not preload_app:
+        return
+    from apps.core.warmup import warm_process_caches
+
+    duration = warm_process_caches()
+    server.log.info('Caches warmed in master in %.1f ms', duration * 1000)
+
+
+def pre_fork(server, worker):
+    """Master: закриваємо з'єднання з БД перед fork, щоб workers не ділили один сокет."""
+    if not preload_app:
+        return
+    from django.db import connections
+
+    connections.close_all()
+
+
+def _warm_sitemap_urls(worker):
+    from apps.core.warmup import sitemap_urls, warm_urls
+
+    results = warm_urls(
+        sitemap_urls()[:warm_urls_limit], concurrency=warm_urls_concurrency, budget=warm_urls_budget,
+    )
+    duration = sum(result.duration_ms for result in results)
+    worker.log.info('Worker %s rendered %d sitemap URLs in %.1f ms', worker.pid, len(results), duration)
+
+
+def _start_sitemap_warmup(worker):
+    """Прогрів у daemon потоці: worker одразу переходить до accept() та heartbeat."""
+    import threading
+
+    threading.Thread(target=_warm_sitemap_urls, args=(worker,), name='warm-sitemap-urls', daemon=True).start()
+
+
+def post_worker_init(worker):
+    """Worker: без preload прогріваємо кеші тут, до першого accept(); сторінки з sitemap - у фоні."""
+    if not preload_app:
+        from apps.core.warmup import warm_process_caches
+
+        duration = warm_process_caches()
+        worker.log.info('Caches warmed in worker %s in %.1f ms', worker.pid, duration * 1000)
+    if warm_urls_on_fork:
+        _start_sitemap_warmup(worker)
+
+
+def worker_exit(server, worker):
+    """Worker: останній знімок метрик (max_requests, graceful shutdown)."""
+    from apps.core.metrics import registry
+
+    registry.flush()
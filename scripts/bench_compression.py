@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Бенчмарк стиснення HTML: CPU на запит та байти для головної, новини та програми.
+
+Порівнює стратегії з apps/core/compression.py на реальному HTML сторінок:
+    identity      - без стиснення
+    gzip-fly      - gzip -6 на кожен запит (як django GZipMiddleware)
+    br-fly        - brotli q4 на кожен запит (CompressionMiddleware)
+    gzip-cached   - кеш сторінок: склейка заздалегідь стиснутих частин + CSRF токен
+    br-cached     - кеш сторінок: готовий brotli (лише сторінки без CSRF токена)
+
+Сторінки завантажуються з запущеного сервера без стиснення, вимірюється
+лише CPU стиснення (time.process_time), мережа не враховується.
+
+Використання:
+    python scripts/bench_compression.py --base-url http://127.0.0.1:8000
+    python scripts/bench_compression.py --news-slug my-article --repeat 500 --json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SpeakUp.settings.develop')
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.core import compression  # noqa: E402
+
+CSRF_TOKEN_RE = re.compile(r'(?<![A-Za-z0-9])[A-Za-z0-9]{64}(?![A-Za-z0-9])')
+
+
+def fetch(session, base_url, path):
+    response = session.get(base_url + path, headers={'Accept-Encoding': 'identity'}, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def discover_news_slug(session, base_url):
+    """Перша новина зі списку /news/."""
+    try:
+        html = fetch(session, base_url, '/news/').decode('utf-8')
+    except requests.RequestException:
+        return None
+    match = re.search(r'href="/news/(?!page/)([^"/]+)/"', html)
+    return match.group(1) if match else None
+
+
+def cpu_per_call(func, repeat):
+    """Середній CPU час виклику в мікросекундах."""
+    start = time.process_time()
+    for _ in range(repeat):
+        result = func()
+    return (time.process_time() - start) / repeat * 1e6, len(result)
+
+
+def bench_page(body, repeat):
+    # Токени сторінки - місця, куди кеш сторінок вставляє CSRF токен відвідувача
+    tokens = set(CSRF_TOKEN_RE.findall(body.decode('utf-8')))
+    segments = [body]
+    token = b''
+    if tokens:
+        token = tokens.pop().encode('ascii')
+        segments = body.split(token)
+    deflated = compression.precompress_segments(segments)
+
+    results = {
+        'identity': (0.0, len(body)),
+        'gzip-fly': cpu_per_call(lambda: compression.compress_body(body, 'gzip'), repeat),
+        'br-fly': cpu_per_call(lambda: compression.compress_body(body, 'br'), repeat),
+        'gzip-cached': cpu_per_call(lambda: compression.assemble_gzip(segments, deflated, token), repeat),
+    }
+    if len(segments) == 1:
+        results['br-cached'] = (0.0, len(compression.precompress_brotli(body)))
+    return {name: {'cpu_us': round(cpu, 1), 'bytes': size} for name, (cpu, size) in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--news-slug', help='Slug новини (за замовчуванням - перша з /news/)')
+    parser.add_argument('--program-slug', default='individual')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--json', action='store_true', help='Вивести результат як JSON')
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    session = requests.Session()
+    pages = {'index': '/', 'program_detail': f'/programs/{args.program_slug}'}
+    news_slug = args.news_slug or discover_news_slug(session, base_url)
+    if news_slug:
+        pages['news_detail'] = f'/news/{news_slug}/'
+    else:
+        print('Новин не знайдено - news_detail пропущено', file=sys.stderr)
+
+    report = {}
+    for name, path in pages.items():
+        report[name] = {'path': path, 'results': bench_page(fetch(session, base_url, path), args.repeat)}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for name, data in report.items():
+        print(f"\n{name} ({data['path']})")
+        print(f"  {'strategy':<12} {'cpu, us':>10} {'bytes':>10}")
+        for strategy, values in data['results'].items():
+            print(f"  {strategy:<12} {values['cpu_us']:>10} {values['bytes']:>10}")
+
+
+if __name__ == '__main__':
+    main()
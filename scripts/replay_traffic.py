@@ -0,0 +1,515 @@
+#!/usr/bin/env python
+"""
+Навантажувальний тест реальним трафіком: replay logs/redirects.log та access логів.
+
+Джерела запитів:
+    --redirect-log   JSON рядки AsyncRedirectLogger (old_url, user_agent, referrer)
+                     - справжні та `manage.py seed_scale_data --redirect-log`
+    --access-log     access лог у форматі combined (gunicorn, nginx, Render log stream);
+                     рядок розбирається за `"GET /path HTTP/1.1" 200 123 "referer" "user agent"`,
+                     префікси (час, ім'я сервісу) ігноруються
+
+З логів будується зважена суміш (шлях, User-Agent, Referer) - частота у лозі
+є вагою. Реплеються лише GET/HEAD: POST форм створював би заявки.
+
+Режими навантаження:
+    --rate R     open loop: запити надходять з інтенсивністю R/с (Пуассон або рівномірно)
+                 незалежно від відповідей сервера; latency рахується від запланованого
+                 часу, тож черга на клієнті не ховає повільні відповіді
+    без --rate   closed loop: --concurrency потоків шлють запити один за одним
+
+Звіт: розподіл latency (перцентилі та гістограма), помилки (5xx та мережеві),
+статуси, розрізи crawler/browser та за джерелом, найповільніші шляхи і насичення:
+    - server_queue: latency мінус Server-Timing total (SERVER_TIMING_ENABLED) - час
+      очікування вільного worker/потоку та мережа;
+    - client_queue: запізнення відправки від плану (клієнт не встигає - ліміт --concurrency);
+    - з --start-gunicorn: завантаження CPU кожного worker (/proc, лише Linux).
+
+Сервер - вже запущений (--url) або gunicorn з gunicorn.conf.py (--start-gunicorn) на окремій
+БД, як у bench_hot_paths.py. Результат - JSON у bench_results/replay-<час>-<commit>.json.
+
+Використання:
+    python scripts/replay_traffic.py --redirect-log logs/redirects.log --url http://127.0.0.1:8000 --rate 50
+    DATABASE_URL=sqlite:////tmp/speakup-bench.sqlite3 python manage.py seed_scale_data \\
+        --news 50000 --redirect-log 200000
+    python scripts/replay_traffic.py --redirect-log logs/redirects-scale.log --access-log render.log \\
+        --start-gunicorn --workers 2 --rate 100 --duration 60
+"""
+import argparse
+import json
+import os
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from bench_db_connections import percentile
+from bench_hot_paths import BASE_DIR, DEFAULT_DATABASE_URL, HOST, configure_environment, git_commit, start_gunicorn
+
+ACCESS_LOG_RE = re.compile(
+    r'"(?P<method>[A-Z]+) (?P<path>\S+) HTTP/[\d.]+" (?P<status>\d{3}) \S+'
+    r'(?: "(?P<referrer>[^"]*)" "(?P<user_agent>[^"]*)")?'
+)
+CRAWLER_RE = re.compile(r'bot|crawl|spider|slurp|facebookexternalhit|bingpreview|ahrefs|semrush', re.IGNORECASE)
+SERVER_TIMING_TOTAL_RE = re.compile(r'total;dur=([\d.]+)')
+REPLAY_METHODS = ('GET', 'HEAD')
+
+# Межі гістограми latency, мс
+HISTOGRAM_BOUNDS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    method: str
+    path: str
+    user_agent: str
+    referrer: str
+    source: str
+
+    @property
+    def kind(self) -> str:
+        return 'crawler' if CRAWLER_RE.search(self.user_agent) else 'browser'
+
+
+@dataclass
+class Sample:
+    spec: RequestSpec
+    scheduled: float
+    sent: float
+    finished: float
+    status: int
+    error: Optional[str] = None
+    server_ms: Optional[float] = None
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.finished - self.scheduled) * 1000
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.status >= 500
+
+
+def load_redirect_log(path: Path) -> Counter:
+    """Зважені запити з JSON рядків AsyncRedirectLogger."""
+    mix: Counter = Counter()
+    with open(path, encoding='utf-8') as log_file:
+        for line in log_file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('old_url'):
+                mix[RequestSpec(
+                    'GET', entry['old_url'], entry.get('user_agent', ''), entry.get('referrer', ''), 'redirects',
+                )] += 1
+    return mix
+
+
+def load_access_log(path: Path) -> Counter:
+    """Зважені GET/HEAD запити з access логу (combined формат)."""
+    mix: Counter = Counter()
+    with open(path, encoding='utf-8', errors='replace') as log_file:
+        for line in log_file:
+            match = ACCESS_LOG_RE.search(line)
+            if not match or match['method'] not in REPLAY_METHODS:
+                continue
+            referrer = match['referrer'] or ''
+            mix[RequestSpec(
+                match['method'], match['path'], match['user_agent'] or '',
+                '' if referrer == '-' else referrer, 'access',
+            )] += 1
+    return mix
+
+
+class WorkerMonitor:
+    """
+    Завантаження CPU дочірніх процесів gunicorn (workers) з /proc.
+
+    Частка часу CPU за інтервал близька до 100% - worker насичений
+    (для gthread - GIL не дає потокам працювати паралельно).
+    """
+
+    def __init__(self, master_pid: int, interval: float = 1.0):
+        self.master_pid = master_pid
+        self.interval = interval
+        self.samples: Dict[int, List[float]] = defaultdict(list)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+    @staticmethod
+    def available() -> bool:
+        return Path('/proc/self/stat').exists()
+
+    def _children(self) -> List[int]:
+        path = Path(f'/proc/{self.master_pid}/task/{self.master_pid}/children')
+        try:
+            return [int(pid) for pid in path.read_text().split()]
+        except OSError:
+            pass
+        # Ядро без CONFIG_PROC_CHILDREN: шукаємо за ppid (поле 4 у /proc/<pid>/stat)
+        children = []
+        for stat in Path('/proc').glob('[0-9]*/stat'):
+            try:
+                if int(stat.read_text().rsplit(')', 1)[1].split()[1]) == self.master_pid:
+                    children.append(int(stat.parent.name))
+            except (OSError, IndexError, ValueError):
+                continue
+        return children
+
+    def _cpu_seconds(self, pid: int) -> Optional[float]:
+        try:
+            fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+        except OSError:
+            return None
+        # utime, stime - поля 14 та 15 (після "pid (comm) state")
+        return (int(fields[11]) + int(fields[12])) / self._ticks
+
+    def _run(self):
+        previous = {pid: self._cpu_seconds(pid) for pid in self._children()}
+        while not self._stop.wait(self.interval):
+            current = {pid: self._cpu_seconds(pid) for pid in self._children()}
+            for pid, cpu in current.items():
+                if cpu is not None and previous.get(pid) is not None:
+                    self.samples[pid].append((cpu - previous[pid]) / self.interval * 100)
+            previous = current
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Dict[str, dict]:
+        self._stop.set()
+        self._thread.join()
+        return {
+            str(pid): {'mean_cpu_pct': round(sum(values) / len(values), 1), 'max_cpu_pct': round(max(values), 1)}
+            for pid, values in self.samples.items() if values
+        }
+
+
+class Replayer:
+    """Відправляє запити з суміші keep-alive сесіями (по одній на потік)."""
+
+    def __init__(self, base_url: str, host: str, concurrency: int, timeout: float):
+        self.base_url = base_url.rstrip('/')
+        self.host = host
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.local = threading.local()
+        self.samples: List[Sample] = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.dropped = 0
+
+    def session(self) -> requests.Session:
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            self.local.session.headers['Host'] = self.host
+        return self.local.session
+
+    def send(self, spec: RequestSpec, scheduled: float) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        sent = time.perf_counter()
+        status, error, server_ms = 0, None, None
+        try:
+            response = self.session().request(
+                spec.method, self.base_url + spec.path, allow_redirects=False, timeout=self.timeout,
+                headers={'User-Agent': spec.user_agent, 'Referer': spec.referrer},
+            )
+            status = response.status_code
+            match = SERVER_TIMING_TOTAL_RE.search(response.headers.get('Server-Timing', ''))
+            server_ms = float(match.group(1)) if match else None
+        except requests.RequestException as exc:
+            error = type(exc).__name__
+        sample = Sample(spec, scheduled, sent, time.perf_counter(), status, error, server_ms)
+        with self.lock:
+            self.in_flight -= 1
+            self.samples.append(sample)
+
+    def run_open_loop(self, mix: List[RequestSpec], weights: List[int], rate: float, duration: float,
+                      arrival: str, rng: random.Random) -> float:
+        """
+        Запити за розкладом з інтенсивністю rate/с протягом duration с.
+
+        Черга клієнта обмежена (concurrency * 50): далі запити відкидаються
+        і рахуються в dropped - це ознака, що насичений сам клієнт.
+        """
+        max_pending = self.concurrency * 50
+        pending = threading.BoundedSemaphore(max_pending)
+        start = time.perf_counter()
+        next_at = 0.0
+
+        def task(spec, scheduled):
+            try:
+                self.send(spec, scheduled)
+            finally:
+                pending.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while next_at < duration:
+                delay = start + next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                spec = rng.choices(mix, weights)[0]
+                if pending.acquire(blocking=False):
+                    pool.submit(task, spec, start + next_at)
+                else:
+                    self.dropped += 1
+                next_at += rng.expovariate(rate) if arrival == 'poisson' else 1 / rate
+        return time.perf_counter() - start
+
+    def run_closed_loop(self, mix: List[RequestSpec], weights: List[int], duration: float,
+                        rng: random.Random) -> float:
+        """concurrency потоків, кожен шле наступний запит після відповіді."""
+        start = time.perf_counter()
+        deadline = start + duration
+        seeds = [rng.random() for _ in range(self.concurrency)]
+
+        def loop(seed):
+            local_rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                self.send(local_rng.choices(mix, weights)[0], time.perf_counter())
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(loop, seeds))
+        return time.perf_counter() - start
+
+
+def distribution(values: List[float]) -> dict:
+    if not values:
+        return {}
+    return {
+        'mean_ms': round(sum(values) / len(values), 3),
+        'p50_ms': round(percentile(values, 50), 3),
+        'p90_ms': round(percentile(values, 90), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'p999_ms': round(percentile(values, 99.9), 3),
+        'max_ms': round(max(values), 3),
+    }
+
+
+def histogram(values: List[float]) -> Dict[str, int]:
+    counts = Counter()
+    for value in values:
+        bound = next((bound for bound in HISTOGRAM_BOUNDS if value <= bound), None)
+        counts[f'<={bound}ms' if bound else f'>{HISTOGRAM_BOUNDS[-1]}ms'] += 1
+    labels = [f'<={bound}ms' for bound in HISTOGRAM_BOUNDS] + [f'>{HISTOGRAM_BOUNDS[-1]}ms']
+    return {label: counts[label] for label in labels if counts[label]}
+
+
+def group_summary(samples: List[Sample], wall: float) -> dict:
+    latencies = [sample.latency_ms for sample in samples]
+    failed = sum(sample.failed for sample in samples)
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / wall, 1) if wall else 0,
+        'error_rate': round(failed / len(samples), 4) if samples else 0,
+        **distribution(latencies),
+    }
+
+
+def build_report(replayer: Replayer, wall: float, slowest: int) -> dict:
+    samples = replayer.samples
+    by_kind, by_source, by_path = defaultdict(list), defaultdict(list), defaultdict(list)
+    for sample in samples:
+        by_kind[sample.spec.kind].append(sample)
+        by_source[sample.spec.source].append(sample)
+        by_path[sample.spec.path].append(sample)
+
+    with_server = [sample for sample in samples if sample.server_ms is not None and not sample.error]
+    paths = sorted(
+        ((path, [sample.latency_ms for sample in group]) for path, group in by_path.items()),
+        key=lambda item: percentile(item[1], 99), reverse=True,
+    )
+    return {
+        'summary': {
+            **group_summary(samples, wall),
+            'wall_seconds': round(wall, 3),
+            'dropped': replayer.dropped,
+        },
+        'histogram': histogram([sample.latency_ms for sample in samples]),
+        'status': dict(Counter(str(sample.status or sample.error) for sample in samples).most_common()),
+        'by_kind': {kind: group_summary(group, wall) for kind, group in by_kind.items()},
+        'by_source': {source: group_summary(group, wall) for source, group in by_source.items()},
+        'slowest_paths': [
+            {'path': path, 'requests': len(values), 'p99_ms': round(percentile(values, 99), 3)}
+            for path, values in paths[:slowest]
+        ],
+        'saturation': {
+            'max_in_flight': replayer.max_in_flight,
+            'concurrency': replayer.concurrency,
+            'client_queue': distribution([(sample.sent - sample.scheduled) * 1000 for sample in samples]),
+            'server_time': distribution([sample.server_ms for sample in with_server]),
+            'server_queue': distribution([
+                max(0.0, (sample.finished - sample.sent) * 1000 - sample.server_ms) for sample in with_server
+            ]),
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    summary = report['summary']
+    print(f"\n{summary['requests']} запитів за {summary['wall_seconds']} с: {summary.get('throughput_rps')} rps, "
+          f"помилок {summary['error_rate'] * 100:.2f}%, відкинуто {summary['dropped']}")
+    print(f"  latency p50 {summary.get('p50_ms')} / p90 {summary.get('p90_ms')} / p99 {summary.get('p99_ms')} / "
+          f"max {summary.get('max_ms')} ms")
+    print('  гістограма: ' + ', '.join(f'{label} {count}' for label, count in report['histogram'].items()))
+    print('  статуси: ' + ', '.join(f'{status} {count}' for status, count in report['status'].items()))
+    for title, groups in (('тип клієнта', report['by_kind']), ('джерело', report['by_source'])):
+        print(f'\n  {title}')
+        for name, stats in groups.items():
+            print(f"    {name:<12}{stats['requests']:>8}{stats.get('p50_ms', 0):>10}{stats.get('p99_ms', 0):>10}"
+                  f"{stats['error_rate'] * 100:>8.2f}%")
+    print('\n  найповільніші шляхи (p99)')
+    for item in report['slowest_paths']:
+        print(f"    {item['p99_ms']:>10} ms {item['requests']:>6}  {item['path']}")
+    saturation = report['saturation']
+    print(f"\n  насичення: in-flight max {saturation['max_in_flight']}/{saturation['concurrency']}, "
+          f"client queue p99 {saturation['client_queue'].get('p99_ms')} ms, "
+          f"server queue p99 {saturation['server_queue'].get('p99_ms', '-')} ms")
+    for pid, stats in report.get('workers', {}).items():
+        print(f"    worker {pid}: CPU mean {stats['mean_cpu_pct']}%, max {stats['max_cpu_pct']}%")
+
+
+def build_mix(args) -> Counter:
+    """Зважена суміш запитів з логів (без --exclude префіксів)."""
+    mix: Counter = Counter()
+    for path in args.redirect_log:
+        for spec, count in load_redirect_log(Path(path)).items():
+            mix[spec] += count * args.redirect_weight
+    for path in args.access_log:
+        for spec, count in load_access_log(Path(path)).items():
+            mix[spec] += count * args.access_weight
+    if args.exclude:
+        mix = Counter({spec: weight for spec, weight in mix.items() if not spec.path.startswith(tuple(args.exclude))})
+    return mix
+
+
+def start_server(args):
+    """Міграції та gunicorn (--start-gunicorn); повертає (process, monitor) - monitor може бути None."""
+    configure_environment(args)
+    # Server-Timing потрібен для server_queue у звіті
+    os.environ['SERVER_TIMING_ENABLED'] = 'True'
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command('migrate', verbosity=0)
+    connection.close()
+    process = start_gunicorn(args)
+    monitor = None
+    if WorkerMonitor.available():
+        monitor = WorkerMonitor(process.pid)
+        monitor.start()
+    return process, monitor
+
+
+def write_report(report: dict, output: Optional[str]) -> Path:
+    """JSON звіт у output або bench_results/replay-<час>-<commit>.json."""
+    path = Path(output) if output else (
+        BASE_DIR / 'bench_results' / f"replay-{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['commit']}.json"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--redirect-log', action='append', default=[], help='JSON лог AsyncRedirectLogger')
+    parser.add_argument('--access-log', action='append', default=[], help='Access лог (combined формат)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PREFIX',
+                        help='Не реплеїти шляхи з цим префіксом (напр. /static/)')
+    parser.add_argument('--redirect-weight', type=float, default=1.0, help='Множник ваги запитів з redirect логу')
+    parser.add_argument('--access-weight', type=float, default=1.0, help='Множник ваги запитів з access логу')
+    parser.add_argument('--url', help='Вже запущений сервер (http://127.0.0.1:8000)')
+    parser.add_argument('--host', default=HOST, help='Host заголовок')
+    parser.add_argument('--rate', type=float, help='Open loop: запитів за секунду')
+    parser.add_argument('--arrival', choices=['poisson', 'uniform'], default='poisson')
+    parser.add_argument('--duration', type=float, default=30, help='Тривалість, с')
+    parser.add_argument('--concurrency', type=int, default=16, help='Максимум одночасних запитів')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--slowest', type=int, default=10, help='Скільки найповільніших шляхів показати')
+    parser.add_argument('--output', help='Файл результату (за замовчуванням bench_results/replay-<час>-<commit>.json)')
+    # --start-gunicorn: як у bench_hot_paths.py
+    parser.add_argument('--start-gunicorn', action='store_true', help='Запустити gunicorn з gunicorn.conf.py')
+    parser.add_argument('--settings', default='SpeakUp.settings.develop')
+    parser.add_argument('--database-url', default=os.environ.get('BENCH_DATABASE_URL', DEFAULT_DATABASE_URL))
+    parser.add_argument('--workers', type=int, default=2, help='WEB_CONCURRENCY')
+    parser.add_argument('--worker-class', default='gthread', help='GUNICORN_WORKER_CLASS')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--page-cache', action='store_true', help='PAGE_CACHE_ENABLED=True')
+    args = parser.parse_args()
+
+    if not args.url and not args.start_gunicorn:
+        parser.error('вкажіть --url або --start-gunicorn')
+    mix = build_mix(args)
+    if not mix:
+        parser.error('суміш порожня: вкажіть --redirect-log та/або --access-log з GET запитами')
+    specs, weights = list(mix), list(mix.values())
+    print(f'Суміш: {len(specs)} унікальних запитів, {int(sum(weights))} у логах')
+
+    process = monitor = None
+    if args.start_gunicorn:
+        process, monitor = start_server(args)
+        base_url = f'http://127.0.0.1:{args.port}'
+    else:
+        base_url = args.url
+
+    replayer = Replayer(base_url, args.host, args.concurrency, args.timeout)
+    rng = random.Random(args.seed)
+    try:
+        if args.rate:
+            wall = replayer.run_open_loop(specs, weights, args.rate, args.duration, args.arrival, rng)
+        else:
+            wall = replayer.run_closed_loop(specs, weights, args.duration, rng)
+    finally:
+        workers = monitor.stop() if monitor else {}
+        if process:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'url': base_url,
+            'mode': 'open' if args.rate else 'closed',
+            'rate': args.rate,
+            'arrival': args.arrival if args.rate else None,
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'redirect_logs': args.redirect_log,
+            'access_logs': args.access_log,
+            'unique_requests': len(specs),
+            'workers': args.workers if args.start_gunicorn else None,
+            'worker_class': args.worker_class if args.start_gunicorn else None,
+            'page_cache': args.page_cache if args.start_gunicorn else None,
+        },
+        **build_report(replayer, wall, args.slowest),
+        'workers': workers,
+    }
+    print_report(report)
+    print(f'\nРезультат: {write_report(report, args.output)}')
+    if report['summary']['requests'] == 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,217 +1,314 @@
 #!/usr/bin/env python
 """
-Скрипт для автоматичної перевірки всіх URL зі старого sitemap.
-Перевіряє що всі URL або працюють, або мають правильні 301 редиректи.
+Скрипт для автоматичної перевірки всіх URL: старі адреси мають правильні 301
+редиректи, нові сторінки повертають 200.
+
+Що перевіряється (за замовчуванням - все):
+    --redirects   кожен ключ REDIRECTS (скомпільована таблиця з варіантами trailing slash)
+                  -> 301 на кінцевий target
+    --news        old_url_uk/old_url_ru кожної NewsArticle -> 301 на статтю мовою старого URL
+    --sitemap     кожен URL з sitemap (SpeakUpSitemap, NewsSitemap) -> 200
+    --url-file    довільний список (старий sitemap): очікуваний редирект визначається
+                  як вище, інакше - 200
+
+Режими:
+    --base-url URL   живий сервер: пул потоків (--concurrency), keep-alive сесія на потік
+    --in-process     Django test client без сервера (БД та settings цього процесу)
+
+Результат - текстовий звіт або JSON (--json, --output); exit code 1, якщо є проблеми.
+
+Використання:
+    python scripts/verify_all_urls.py --in-process
+    python scripts/verify_all_urls.py --base-url http://localhost:8000 --concurrency 16
+    python scripts/verify_all_urls.py --url-file /tmp/all_old_urls.txt --base-url https://speakup-zc5s.onrender.com \\
+        --output results.json
 """
+import argparse
+import json
+import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
 import django
 import requests
-from urllib.parse import urljoin, urlparse
 
 # Налаштування Django
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SpeakUp.settings.develop')
 django.setup()
 
-from apps.core.redirects import REDIRECTS
-from apps.core.models import NewsArticle
+from django.conf import settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import translation  # noqa: E402
+
+from apps.core.models import NewsArticle  # noqa: E402
+from apps.core.redirect_graph import get_compiled_redirects  # noqa: E402
+from apps.core.warmup import default_warm_host, sitemap_urls  # noqa: E402
 
 # Базовий URL для перевірки
 BASE_URL = os.environ.get('VERIFY_BASE_URL', 'http://localhost:8000')
 
-class URLVerifier:
-    def __init__(self, base_url=BASE_URL):
-        self.base_url = base_url.rstrip('/')
-        self.results = {
-            'success': [],
-            'redirect_ok': [],
-            'redirect_wrong': [],
-            'missing_redirect': [],
-            'errors': []
-        }
-
-    def check_url(self, old_path):
-        """Перевіряє один URL."""
-        full_url = urljoin(self.base_url, old_path)
+OUTCOMES = ('ok', 'redirect_wrong', 'missing_redirect', 'unexpected_redirect', 'error')
 
-        try:
-            response = requests.head(full_url, allow_redirects=False, timeout=10)
-
-            # Якщо 200 - все добре
-            if response.status_code == 200:
-                self.results['success'].append(old_path)
-                return True, 'OK'
-
-            # Якщо 301/302 - перевіряємо куди редиректить
-            elif response.status_code in [301, 302]:
-                redirect_to = response.headers.get('Location', '')
-
-                # Отримуємо шлях з редиректу
-                parsed = urlparse(redirect_to)
-                redirect_path = parsed.path
-
-                # Перевіряємо чи редирект правильний
-                expected = self.get_expected_redirect(old_path)
-
-                if expected and redirect_path == expected:
-                    self.results['redirect_ok'].append((old_path, redirect_path))
-                    return True, f'Redirect OK -> {redirect_path}'
-                elif expected:
-                    self.results['redirect_wrong'].append((old_path, redirect_path, expected))
-                    return False, f'Redirect WRONG: got {redirect_path}, expected {expected}'
-                else:
-                    self.results['redirect_ok'].append((old_path, redirect_path))
-                    return True, f'Redirect -> {redirect_path} (no expected)'
-
-            # 404 - помилка
-            elif response.status_code == 404:
-                expected = self.get_expected_redirect(old_path)
-                if expected:
-                    self.results['missing_redirect'].append((old_path, expected))
-                    return False, f'404 - should redirect to {expected}'
-                else:
-                    self.results['errors'].append((old_path, '404 - not found and no redirect'))
-                    return False, '404 - not found'
-
-            else:
-                self.results['errors'].append((old_path, f'Status {response.status_code}'))
-                return False, f'Status {response.status_code}'
-
-        except requests.exceptions.RequestException as e:
-            self.results['errors'].append((old_path, str(e)))
-            return False, f'Error: {str(e)}'
-
-    def get_expected_redirect(self, path):
-        """Отримує очікуваний редирект для шляху."""
-        # Перевірка статичних редиректів
-        if path in REDIRECTS:
-            return REDIRECTS[path]
-
-        # Перевірка без trailing slash
-        path_normalized = path.rstrip('/') if path != '/' else '/'
-        if path_normalized in REDIRECTS:
-            return REDIRECTS[path_normalized]
-
-        # Перевірка news статей
-        if path.startswith('/news/'):
-            article = NewsArticle.objects.filter(old_url_uk=path).first()
-            if not article:
-                article = NewsArticle.objects.filter(old_url_ru=path).first()
-
-            if article:
-                from django.urls import reverse
-                from django.utils.translation import activate
-                activate('uk')  # Перевіряємо UK версію
-                return article.get_absolute_url()
 
-        return None
+@dataclass
+class Check:
+    """URL та очікуваний результат: редирект на expected або 200, якщо expected None."""
+    path: str
+    source: str
+    expected: Optional[str] = None
 
-    def verify_all_urls(self, url_list):
-        """Перевіряє список URL."""
-        total = len(url_list)
-        print(f"Перевірка {total} URL...")
-        print(f"Base URL: {self.base_url}\n")
 
-        for i, url in enumerate(url_list, 1):
-            url = url.strip()
-            if not url:
-                continue
+@dataclass
+class CheckResult:
+    path: str
+    source: str
+    expected: Optional[str]
+    status: int
+    location: str
+    outcome: str
+    duration_ms: float
+    error: str = ''
 
-            ok, message = self.check_url(url)
-            status = "✓" if ok else "✗"
-            print(f"[{i}/{total}] {status} {url:50} {message}")
 
-        self.print_summary()
+def normalize_path(path: str) -> str:
+    return path.rstrip('/') if path != '/' else '/'
 
-    def print_summary(self):
-        """Виводить підсумок перевірки."""
-        print("\n" + "="*80)
-        print("ПІДСУМОК ПЕРЕВІРКИ")
-        print("="*80)
-
-        total = (
-            len(self.results['success']) +
-            len(self.results['redirect_ok']) +
-            len(self.results['redirect_wrong']) +
-            len(self.results['missing_redirect']) +
-            len(self.results['errors'])
-        )
 
-        print(f"\nВсього перевірено: {total}")
-        print(f"✓ Успішних (200): {len(self.results['success'])}")
-        print(f"✓ Редиректів OK (301): {len(self.results['redirect_ok'])}")
-        print(f"✗ Редиректів невірних: {len(self.results['redirect_wrong'])}")
-        print(f"✗ Відсутніх редиректів: {len(self.results['missing_redirect'])}")
-        print(f"✗ Помилок: {len(self.results['errors'])}")
-
-        success_rate = ((len(self.results['success']) + len(self.results['redirect_ok'])) / total * 100) if total > 0 else 0
-        print(f"\nУспішність: {success_rate:.1f}%")
-
-        if self.results['redirect_wrong']:
-            print("\nНЕВІРНІ РЕДИРЕКТИ:")
-            for old, got, expected in self.results['redirect_wrong']:
-                print(f"  {old}")
-                print(f"    Отримано: {got}")
-                print(f"    Очікувалось: {expected}")
-
-        if self.results['missing_redirect']:
-            print("\nВІДСУТНІ РЕДИРЕКТИ:")
-            for old, expected in self.results['missing_redirect']:
-                print(f"  {old} -> має бути {expected}")
-
-        if self.results['errors']:
-            print("\nПОМИЛКИ:")
-            for url, error in self.results['errors']:
-                print(f"  {url}: {error}")
-
-        print("\n" + "="*80)
-
-        if self.results['redirect_wrong'] or self.results['missing_redirect'] or self.results['errors']:
-            print("❌ ЗНАЙДЕНО ПРОБЛЕМИ! Потрібно виправити перед міграцією.")
-            return False
-        else:
-            print("✅ ВСІ URL ПРАЦЮЮТЬ КОРЕКТНО!")
-            return True
+def news_redirects() -> Dict[str, str]:
+    """old_url статей -> новий URL тією ж мовою, що й старий (/ru/... -> RU версія)."""
+    prefix = f'/{settings.LANGUAGE_CODE}/'
+    expected = {}
+    articles = NewsArticle.objects.values_list('old_url_uk', 'old_url_ru', 'slug_uk', 'slug_ru')
+    for old_url_uk, old_url_ru, slug_uk, slug_ru in articles.iterator():
+        for old_url in (old_url_uk, old_url_ru):
+            if not old_url:
+                continue
+            language = 'ru' if old_url.startswith('/ru/') else settings.LANGUAGE_CODE
+            slug = slug_ru if language == 'ru' and slug_ru else slug_uk
+            with translation.override(language):
+                expected.setdefault(old_url, reverse('core:news_detail', kwargs={'slug': slug}))
+    # Мова за замовчуванням без префікса - відкидаємо можливий /uk/ з reverse()
+    return {old: new.replace(prefix, '/', 1) if new.startswith(prefix) else new for old, new in expected.items()}
+
+
+class ExpectedRedirects:
+    """Очікуваний редирект для довільного шляху (статичні REDIRECTS, потім news)."""
+
+    def __init__(self):
+        self.static = get_compiled_redirects().table
+        self.news = news_redirects()
+
+    def get(self, path: str) -> Optional[str]:
+        for candidate in (path, normalize_path(path)):
+            if candidate in self.static:
+                return self.static[candidate]
+            if candidate in self.news:
+                return self.news[candidate]
+        return None
 
 
-def load_urls_from_file(filepath):
-    """Завантажує URL з файлу."""
-    with open(filepath, 'r') as f:
-        return [line.strip() for line in f if line.strip()]
+def collect_checks(redirects: bool, news: bool, sitemap: bool, url_file: Optional[str]) -> List[Check]:
+    """Матриця перевірок без дублікатів шляхів (перше джерело перемагає)."""
+    expected = ExpectedRedirects()
+    checks: Dict[str, Check] = {}
+    if redirects:
+        for source, target in expected.static.items():
+            checks.setdefault(source, Check(source, 'redirects', target))
+    if news:
+        for old_url, target in expected.news.items():
+            # Старий URL, що збігається з новим, - сторінка, а не редирект
+            checks.setdefault(old_url, Check(old_url, 'news', None if old_url == target else target))
+    if sitemap:
+        for path in sitemap_urls():
+            checks.setdefault(path, Check(path, 'sitemap'))
+    if url_file:
+        for path in load_urls_from_file(url_file):
+            target = expected.get(path)
+            checks.setdefault(path, Check(path, 'url_file', None if target == path else target))
+    return list(checks.values())
+
+
+def classify(check: Check, status: int, location: str) -> str:
+    if check.expected is None:
+        if status == 200:
+            return 'ok'
+        return 'unexpected_redirect' if status in (301, 302, 307, 308) else 'error'
+    if status in (301, 302, 307, 308):
+        parsed = urlparse(location)
+        got = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        return 'ok' if got == check.expected else 'redirect_wrong'
+    return 'missing_redirect' if status in (200, 404) else 'error'
+
+
+class LiveFetcher:
+    """HEAD запити до сервера; keep-alive сесія на потік пулу."""
+
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.local = threading.local()
 
+    def __call__(self, path: str) -> Tuple[int, str]:
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        response = self.local.session.head(urljoin(self.base_url, path), allow_redirects=False, timeout=self.timeout)
+        return response.status_code, response.headers.get('Location', '')
 
-def main():
-    import argparse
 
-    parser = argparse.ArgumentParser(description='Перевірка URL зі старого sitemap')
-    parser.add_argument('--url-file', help='Файл з URL (один на рядок)', required=True)
-    parser.add_argument('--base-url', default=BASE_URL, help='Базовий URL для перевірки')
-    parser.add_argument('--save-results', help='Зберегти результати в файл')
+class InProcessFetcher:
+    """Django test client (свій на потік) - без сервера та мережі."""
 
-    args = parser.parse_args()
+    def __init__(self, host: str):
+        self.host = host
+        self.secure = (getattr(settings, 'CANONICAL_DOMAIN', '') or '').startswith('https://')
+        self.local = threading.local()
+        # django.request пише кожну 404 у консоль
+        logging.getLogger('django.request').setLevel(logging.ERROR)
 
-    # Завантажуємо URL
-    urls = load_urls_from_file(args.url_file)
-    print(f"Завантажено {len(urls)} URL з {args.url_file}")
+    def __call__(self, path: str) -> Tuple[int, str]:
+        from django.test import Client
 
-    # Перевіряємо
-    verifier = URLVerifier(args.base_url)
-    success = verifier.verify_all_urls(urls)
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(HTTP_HOST=self.host, raise_request_exception=False)
+        response = self.local.client.head(path, secure=self.secure)
+        return response.status_code, response.get('Location', '')
 
-    # Зберігаємо результати якщо потрібно
-    if args.save_results:
-        import json
-        with open(args.save_results, 'w') as f:
-            json.dump(verifier.results, f, indent=2, ensure_ascii=False)
-        print(f"\nРезультати збережено в {args.save_results}")
 
-    sys.exit(0 if success else 1)
+class URLVerifier:
+    def __init__(self, fetch, concurrency: int = 8):
+        self.fetch = fetch
+        self.concurrency = max(1, concurrency)
+        self.results: List[CheckResult] = []
 
+    def check_url(self, check: Check) -> CheckResult:
+        """Перевіряє один URL."""
+        start = time.perf_counter()
+        status, location, error = 0, '', ''
+        try:
+            status, location = self.fetch(check.path)
+            outcome = classify(check, status, location)
+        except Exception as e:  # noqa: BLE001 - одна помилка не зупиняє перевірку
+            outcome, error = 'error', repr(e)
+        return CheckResult(
+            check.path, check.source, check.expected, status, location, outcome,
+            round((time.perf_counter() - start) * 1000, 3), error,
+        )
 
-if __name__ == '__main__':
-    main()
+    def verify_all_urls(self, checks: List[Check]) -> List[CheckResult]:
+        """Перевіряє список URL пулом потоків (порядок результатів - як у checks)."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self.results = list(executor.map(self.check_url, checks))
+        return self.results
+
+    def summary(self) -> dict:
+        counts = {outcome: 0 for outcome in OUTCOMES}
+        by_source: Dict[str, Dict[str, int]] = {}
+        for result in self.results:
+            counts[result.outcome] += 1
+            source = by_source.setdefault(result.source, {'total': 0, 'failed': 0})
+            source['total'] += 1
+            source['failed'] += result.outcome != 'ok'
+        return {'total': len(self.results), **counts, 'by_source': by_source}
+
+    def problems(self) -> List[CheckResult]:
+        return [result for result in self.results if result.outcome != 'ok']
+
+    def print_summary(self, duration: float) -> None:
+        """Виводить підсумок перевірки."""
+        summary = self.summary()
+        print('\n' + '=' * 80)
+        print('ПІДСУМОК ПЕРЕВІРКИ')
+        print('=' * 80)
+        print(f"\nВсього перевірено: {summary['total']} за {duration:.1f} с")
+        print(f"✓ OK: {summary['ok']}")
+        print(f"✗ Редиректів невірних: {summary['redirect_wrong']}")
+        print(f"✗ Відсутніх редиректів: {summary['missing_redirect']}")
+        print(f"✗ Неочікуваних редиректів: {summary['unexpected_redirect']}")
+        print(f"✗ Помилок: {summary['error']}")
+        for source, stats in summary['by_source'].items():
+            print(f"  {source:<10} {stats['total']:>6} перевірено, {stats['failed']} проблем")
+
+        for result in self.problems():
+            line = f'  [{result.outcome}] {result.path} -> {result.status}'
+            if result.location:
+                line += f' {result.location}'
+            if result.expected:
+                line += f' (очікувалось {result.expected})'
+            if result.error:
+                line += f' {result.error}'
+            print(line)
+
+        print('\n' + '=' * 80)
+        if self.problems():
+            print('❌ ЗНАЙДЕНО ПРОБЛЕМИ! Потрібно виправити.')
+        else:
+            print('✅ ВСІ URL ПРАЦЮЮТЬ КОРЕКТНО!')
 
 
+def load_urls_from_file(filepath):
+    """Завантажує URL з файлу (повні URL зводяться до шляху)."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [urlparse(line.strip()).path or '/' for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--redirects', action='store_true', help='Ключі REDIRECTS')
+    parser.add_argument('--news', action='store_true', help='old_url новин')
+    parser.add_argument('--sitemap', action='store_true', help='URL з sitemap')
+    parser.add_argument('--url-file', help='Файл з URL (один на рядок)')
+    parser.add_argument('--base-url', default=BASE_URL, help='Базовий URL живого сервера')
+    parser.add_argument('--in-process', action='store_true', help='Django test client замість сервера')
+    parser.add_argument('--host', help='Host для --in-process (за замовчуванням - з CANONICAL_DOMAIN)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Паралельні перевірки')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--json', action='store_true', help='JSON звіт у stdout')
+    parser.add_argument('--output', '--save-results', dest='output', help='Зберегти JSON звіт у файл')
+    args = parser.parse_args()
+
+    everything = not (args.redirects or args.news or args.sitemap or args.url_file)
+    checks = collect_checks(
+        args.redirects or everything, args.news or everything, args.sitemap or everything, args.url_file,
+    )
+
+    if args.in_process:
+        fetch = InProcessFetcher(args.host or default_warm_host())
+        target = 'in-process'
+    else:
+        fetch = LiveFetcher(args.base_url, args.timeout)
+        target = args.base_url
+
+    verifier = URLVerifier(fetch, args.concurrency)
+    if not args.json:
+        print(f'Перевірка {len(checks)} URL ({target}, {verifier.concurrency} потоків)...')
+    start = time.perf_counter()
+    verifier.verify_all_urls(checks)
+    duration = time.perf_counter() - start
+
+    report = {
+        'meta': {'target': target, 'concurrency': verifier.concurrency, 'duration_seconds': round(duration, 3)},
+        'summary': verifier.summary(),
+        'results': [asdict(result) for result in verifier.results],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        verifier.print_summary(duration)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        if not args.json:
+            print(f'\nРезультати збережено в {args.output}')
+
+    sys.exit(1 if verifier.problems() else 0)
 
 
+if __name__ == '__main__':
+    main()